@@ -1,2 +1,36 @@
 # This file redirects to a specific LPI version module for easy change between versions 
-from shared.LPI_22_0 import *
\ No newline at end of file
+#
+# The LPI version module (e.g. LPI_22_0.py) documents every LPI class for editors (code completion and documentation on mouse over)
+# but it is very large and slow to import. Since the LPI classes are only used for type hints, the version module is only
+# imported by editors and type checkers. When a script runs, "from shared.LPI import *" only imports the connection function.
+# Scripts and modules that use LPI classes in type hints evaluated at run time (e.g. module level variable annotations or
+# unquoted function annotations) import them explicitly, e.g. "from shared.LPI import IFNode". Each LPI class is then
+# created as an empty stub the first time it is accessed (PEP 562 module __getattr__).
+TYPE_CHECKING = False # Set by editors and type checkers (avoids importing the typing module)
+
+if TYPE_CHECKING:
+    from shared.LPI_22_0 import *
+else:
+    from shared.LPI_22_0_runtime import get_lusas_modeller
+
+    __all__ = ["get_lusas_modeller"]
+    _class_names = None
+
+    def _get_class_names() -> frozenset:
+        # Names of the classes of the version module, read from its source rather than importing it
+        global _class_names
+        if _class_names is None:
+            import os
+            with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "LPI_22_0.py"), "r", encoding="utf-8") as f:
+                _class_names = frozenset(line[6:].split("(", 1)[0].split(":", 1)[0].strip() for line in f if line.startswith("class "))
+        return _class_names
+
+    def __getattr__(name:str):
+        if name.startswith("__") or name not in _get_class_names():
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        stub = type(name, (), {"__module__": __name__, "__doc__": f"Type hint stub of {name}, see LPI_22_0.py for the documentation"})
+        globals()[name] = stub
+        return stub
+
+    def __dir__() -> list[str]:
+        return __all__ + sorted(_get_class_names())
@@ -48997,6 +48997,5 @@ All other objects in the LPI are accessed through these global variables and fun
 
 
 
-def get_lusas_modeller() -> IFModeller:
-	import win32com.client as win32
-	return win32.dynamic.Dispatch('Lusas.Modeller.22.0')
+# Connection function (defined in a separate module so that it can be imported without this module, see LPI.py)
+from shared.LPI_22_0_runtime import get_lusas_modeller
@@ -0,0 +1,32 @@
+# LUSAS API (LPI) EXAMPLES
+# (https://github.com/LUSAS-Software/LUSAS-API-Examples/)
+#
+# Description:
+# This file contains the part of the LPI v22.0 module (LPI_22_0.py) that is needed when a script runs: the connection function.
+# The LPI classes are only needed as type hints, see LPI.py for how they are provided without importing LPI_22_0.py.
+
+import os
+TYPE_CHECKING = False # Set by editors and type checkers (avoids importing the typing module)
+if TYPE_CHECKING:
+    from shared.LPI_22_0 import IFModeller
+
+# COM ProgID of LUSAS Modeller
+PROGID = "Lusas.Modeller.22.0"
+
+def get_lusas_modeller(profile:bool=None) -> 'IFModeller':
+    """Connects to LUSAS Modeller v22.0
+
+    Args:
+        profile (bool, optional): Return a proxy recording the time of every LPI call (see shared/Profiler.py). Defaults to True if the LUSAS_LPI_PROFILE environment variable is set.
+
+    Returns:
+        IFModeller: Reference to LUSAS Modeller
+    """
+    import win32com.client as win32
+    modeller = win32.dynamic.Dispatch(PROGID)
+    if profile is None:
+        profile = os.environ.get("LUSAS_LPI_PROFILE", "").strip().lower() not in ("", "0", "false")
+    if profile:
+        from shared import Profiler
+        return Profiler.profile_modeller(modeller)
+    return modeller
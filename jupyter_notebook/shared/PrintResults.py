@@ -0,0 +1,524 @@
+# LUSAS API (LPI) EXAMPLES
+# (https://github.com/LUSAS-Software/LUSAS-API-Examples/)
+#
+# Description:
+# This file contains a streaming reader for the text files written by the Print Results Wizard (PRW) grid windows
+# (IFGridWindow.saveAs(filename, "Text")) with the "Tabular" results content.
+# The file is read line by line and returned in chunks of a fixed number of rows with one typed NumPy array per column,
+# so that exports of several GB can be processed, converted to pandas DataFrames or written to Parquet in bounded memory.
+# The coordinate columns added by showCoordinates(True) are read as floats, N/A results are read as NaN, and
+# each table of a multi-loadcase export (a title followed by a header row) is returned as a separate block.
+# The kind of each column (integer ID, number or text) is taken from the first row of a table and every following row is
+# checked against it: a cell that does not match (e.g. text in a numeric column, or a blank ID) raises an exception giving
+# its line number, rather than being read as another value. Blank and N/A cells are only accepted in numeric columns.
+# NOTE: the title and header detection follows the text written by the fake LPI (shared/FakeLPI.py); it has not been
+# checked against a grid saved by LUSAS Modeller, so check the chunks of a real export before relying on this reader.
+#
+# It also contains a batch exporter that creates the PRW tables of a declarative list of entities and loadsets as temporary
+# attributes, saves all loadcase tabs of each table with a single saveAllAs call, and writes all tables to a single
+# columnar file (Parquet or NumPy .npz) in long form, one row per location, loadset and component.
+# The LPI has no way to save a PRW table without its grid window, so one window per table is still opened (with the UI disabled).
+#
+# Example:
+#   for chunk in iter_prw_chunks("Displacements_results.txt"):
+#       print(chunk.loadset, len(chunk), np.nanmax(chunk.columns["DZ"]))
+#   prw_to_parquet("Displacements_results.txt", "Displacements_results.parquet")
+#
+#   tables = [{"entity": "Displacement", "components": ["DX", "DY", "DZ"], "location": "Nodal", "loadsets": uls},
+#             {"entity": "Force/Moment - Thick Shell", "components": ["Mx", "My"], "location": "ElementNodal", "loadsets": uls}]
+#   timings = export_prw_tables(lusas, tables, "results.parquet", loadsetsPerTable=50)
+
+import os
+import json
+import re
+import tempfile
+import time
+import numpy as np
+from shared.LPI import *
+from shared.Results import get_loadset_id
+
+# Text cells read as missing results
+_MISSING = {"", "N/A", "NA", "-"}
+
+# Columns holding IDs, read as integers when their values are integers
+_ID_COLUMN = re.compile(r"(node|element|elem|gauss|point|loadcase|loadset|number|id)\b", re.IGNORECASE)
+
+# Loadset ID in a table title, e.g. "Loadcase: 2:Dead load" or "2:Dead load"
+_TITLE_LOADSET = re.compile(r"(?:loadcase|loadset|combination|envelope)\s*[:=]?\s*(\d+)|^\s*(\d+)\s*:", re.IGNORECASE)
+
+class PRWChunk:
+    """Rows of one table of a PRW text export
+
+    Attributes:
+        block (int): Index of the table in the file
+        title (str): Title lines of the table joined by " | " (e.g. the loadcase and entity)
+        loadset (int): Loadset ID found in the title, -1 if none
+        columns (dict[str, np.ndarray]): Values of each column (int64 IDs, float64 results with NaN for N/A, or strings)
+    """
+
+    def __init__(self, block:int, title:str, loadset:int, columns:dict):
+        self.block = block
+        self.title = title
+        self.loadset = loadset
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    @property
+    def coords(self) -> np.ndarray:
+        """Coordinates of shape (rows, 3) from the X, Y and Z columns written by showCoordinates(True), None if not shown"""
+        names = [name for name in ("X", "Y", "Z") if name in self.columns]
+        if not names:
+            return None
+        coords = np.zeros((len(self), 3))
+        for i, name in enumerate(("X", "Y", "Z")):
+            if name in self.columns:
+                coords[:, i] = self.columns[name]
+        return coords
+
+    def to_dataframe(self, addBlock:bool=True):
+        """Convert to a pandas DataFrame
+
+        Args:
+            addBlock (bool, optional): Add "Block" and "Loadset" columns so that rows of different tables can be combined. Defaults to True.
+
+        Returns:
+            pandas.DataFrame: Rows of the chunk
+        """
+        import pandas as pd
+        columns = dict(self.columns)
+        if addBlock:
+            columns["Block"] = np.full(len(self), self.block, dtype=np.int32)
+            columns["Loadset"] = np.full(len(self), self.loadset, dtype=np.int32)
+        return pd.DataFrame(columns)
+
+# Rows of results start with the ID of the node or element, followed by a separator
+_ROW = re.compile(r"\s*\d+(\t| {2,}|\s*$)")
+
+def _cells(line:str) -> list[str]:
+    # Cells are tab separated, or separated by two or more spaces in files saved with padded columns
+    line = line.strip()
+    if "\t" in line:
+        return [cell.strip() for cell in line.split("\t")]
+    return re.split(r" {2,}", line)
+
+def _unique_names(header:list[str]) -> list[str]:
+    names = []
+    for i, name in enumerate(header):
+        name = name or f"Column {i+1}"
+        unique, n = name, 1
+        while unique in names:
+            n += 1
+            unique = f"{name} ({n})"
+        names.append(unique)
+    return names
+
+def _column_kinds(names:list[str], row:list[str]) -> list[str]:
+    # "int" for IDs, "float" for numbers and results, "str" otherwise, decided from the first row of a table
+    kinds = []
+    for i, (name, cell) in enumerate(zip(names, row)):
+        if re.fullmatch(r"[-+]?\d+", cell) and (i == 0 or _ID_COLUMN.search(name)):
+            kinds.append("int")
+        elif cell in _MISSING:
+            kinds.append("float")
+        else:
+            try:
+                float(cell)
+                kinds.append("float")
+            except ValueError:
+                kinds.append("str")
+    return kinds
+
+def _column_array(cells:tuple, kind:str, name:str, lines:list[int], filename:str) -> np.ndarray:
+    # Convert a whole column at once, finding the first offending cell only when the conversion fails
+    if kind == "str":
+        return np.char.strip(np.array(cells, dtype=str))
+    try:
+        return np.array(cells, dtype=np.int64 if kind == "int" else np.float64)
+    except ValueError:
+        pass
+    values = np.empty(len(cells), dtype=np.int64 if kind == "int" else np.float64)
+    for i, cell in enumerate(cells):
+        cell = cell.strip()
+        try:
+            values[i] = int(cell) if kind == "int" else np.nan if cell in _MISSING else float(cell)
+        except ValueError:
+            expected = "an integer" if kind == "int" else "a number or N/A"
+            raise Exception(f"Line {lines[i]} of {filename}: the value '{cell}' of column '{name}' is not {expected} as in the first row of its table")
+    return values
+
+def _title_loadset(title:str) -> int:
+    match = _TITLE_LOADSET.search(title)
+    if match is None:
+        return -1
+    return int(match.group(1) or match.group(2))
+
+def _detect_encoding(filename:str) -> str:
+    with open(filename, "rb") as f:
+        start = f.read(4)
+    if start.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "utf-16"
+    if start.startswith(b"\xef\xbb\xbf"):
+        return "utf-8-sig"
+    return "cp1252"
+
+def iter_prw_chunks(filename:str, chunkSize:int=100000, encoding:str=None):
+    """Read a PRW text export in chunks. A chunk holds rows of a single table, so a new chunk is started at each table.
+
+    Args:
+        filename (str): Path of the text file written by IFGridWindow.saveAs(filename, "Text")
+        chunkSize (int, optional): Maximum number of rows per chunk. Defaults to 100000.
+        encoding (str, optional): Text encoding. Defaults to None (UTF-16 or UTF-8 if the file starts with a byte order mark, Windows-1252 otherwise).
+
+    Yields:
+        PRWChunk: Rows of a table
+    """
+    block, title, names, kinds = -1, "", None, None
+    texts = []          # Lines that are not rows since the last row (titles and header)
+    rows = []           # Lines of the rows of the current chunk
+    lines = []          # Line number of each row of the current chunk
+
+    def chunk():
+        width = len(names)
+        # All rows are usually complete and tab separated, so the cells of the chunk are split at once
+        if all(row.count("\t") == width - 1 for row in rows):
+            cells = "\t".join(rows).split("\t")
+            table = [cells[i::width] for i in range(width)]
+        else:
+            split = []
+            for i, row in enumerate(rows):
+                rowCells = _cells(row)
+                if len(rowCells) > width:
+                    raise Exception(f"Line {lines[i]} of {filename} has {len(rowCells)} values but the header has {width} columns")
+                split.append(rowCells + [""] * (width - len(rowCells)))
+            table = list(zip(*split))
+        columns = {name: _column_array(values, kind, name, lines, filename) for name, kind, values in zip(names, kinds, table)}
+        return PRWChunk(block, title, _title_loadset(title), columns)
+
+    with open(filename, "r", encoding=encoding or _detect_encoding(filename), errors="replace") as f:
+        for lineNumber, line in enumerate(f, 1):
+            if not _ROW.match(line):
+                if line.strip():
+                    texts.append(_cells(line))
+                continue
+
+            if texts:
+                # A header row, preceded by the title of the table if it has changed
+                header = _unique_names(texts[-1])
+                newTitle = " | ".join(" ".join(cell for cell in t if cell) for t in texts[:-1]) or title
+                if rows:
+                    yield chunk()
+                    rows, lines = [], []
+                if header != names or newTitle != title:
+                    block += 1
+                names, title, kinds = header, newTitle, None
+                texts = []
+            elif names is None:
+                raise Exception(f"Line {lineNumber} of {filename} is a row of results before any header row")
+
+            if kinds is None:
+                kinds = _column_kinds(names, _cells(line) + [""] * len(names))
+            rows.append(line.strip())
+            lines.append(lineNumber)
+            if len(rows) == chunkSize:
+                yield chunk()
+                rows, lines = [], []
+    if rows:
+        yield chunk()
+
+def iter_prw_frames(filename:str, chunkSize:int=100000, encoding:str=None):
+    """Read a PRW text export as pandas DataFrames with "Block" and "Loadset" columns, see iter_prw_chunks
+
+    Yields:
+        pandas.DataFrame: Rows of a table
+    """
+    for chunk in iter_prw_chunks(filename, chunkSize, encoding):
+        yield chunk.to_dataframe()
+
+def prw_to_parquet(filename:str, parquetFile:str, chunkSize:int=100000, encoding:str=None) -> int:
+    """Convert a PRW text export to a Parquet file chunk by chunk (requires pyarrow).
+    All tables must have the same columns; "Block" and "Loadset" columns identify the table of each row.
+
+    Args:
+        filename (str): Path of the text file written by IFGridWindow.saveAs(filename, "Text")
+        parquetFile (str): Path of the Parquet file to write
+        chunkSize (int, optional): Number of rows per chunk, which is also the size of the Parquet row groups. Defaults to 100000.
+        encoding (str, optional): Text encoding, see iter_prw_chunks. Defaults to None.
+
+    Returns:
+        int: Number of rows written
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise Exception("Writing Parquet files requires pyarrow (pip install pyarrow)")
+
+    writer, count = None, 0
+    try:
+        for chunk in iter_prw_chunks(filename, chunkSize, encoding):
+            columns = dict(chunk.columns)
+            columns["Block"] = np.full(len(chunk), chunk.block, dtype=np.int32)
+            columns["Loadset"] = np.full(len(chunk), chunk.loadset, dtype=np.int32)
+            table = pa.table(columns)
+            if writer is None:
+                writer = pq.ParquetWriter(parquetFile, table.schema)
+            elif table.schema.names != writer.schema.names:
+                raise Exception(f"The columns of table {chunk.block} ({chunk.title}) differ from the columns of the first table")
+            writer.write_table(table.cast(writer.schema))
+            count += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+######################################################
+## Batch export
+
+class PRWTable:
+    """Definition of a PRW table exported by export_prw_tables
+
+    Attributes:
+        entity (str): Results entity (e.g. "Displacement")
+        components (list[str]): Results components (e.g. ["DX", "DY", "DZ"])
+        location (str): Results location ("Nodal", "ElementNodal", "Gauss" or "Internal")
+        loadsets (str | list): "Active", "All", or the loadsets (objects or IDs)
+        extent (str): Extent of the table (e.g. "Full Model")
+        transform (str): "Global", "Element" or "None"
+        showCoordinates (bool): Add the X, Y and Z coordinates of each location
+        sigFig (int): Number of significant figures written
+        allowDerived (bool): Allow derived components
+    """
+
+    def __init__(self, entity:str, components:list[str], location:str="Nodal", loadsets="Active", extent:str="Full Model",
+                 transform:str="Global", showCoordinates:bool=True, sigFig:int=8, allowDerived:bool=False):
+        self.entity = entity
+        self.components = list(components)
+        self.location = location
+        self.loadsets = loadsets
+        self.extent = extent
+        self.transform = transform
+        self.showCoordinates = showCoordinates
+        self.sigFig = sigFig
+        self.allowDerived = allowDerived
+
+def _loadset_groups(loadsets, loadsetsPerTable:int=None) -> list:
+    # The loadsets of each grid window, "Active"/"All" or lists of at most loadsetsPerTable loadset IDs
+    if isinstance(loadsets, str):
+        return [loadsets]
+    size = loadsetsPerTable or max(len(loadsets), 1)
+    return [loadsets[i:i+size] for i in range(0, len(loadsets), size)]
+
+def _create_prw(db:'IFDatabase', name:str, table:PRWTable, loadsets) -> 'IFPrintResultsWizard':
+    attr = db.createPrintResultsWizard(name)
+    try:
+        attr.setResultsType("Components")
+        attr.setResultsOrder("Mesh")
+        attr.setResultsContent("Tabular")
+        attr.setResultsEntity(table.entity)
+        attr.setExtent(table.extent, "")
+        attr.setResultsLocation(table.location)
+        if isinstance(loadsets, str):
+            attr.setLoadcasesOption(loadsets)
+        else:
+            attr.setLoadcasesOption("Specified")
+            attr.setLoadcases(loadsets, [0] * len(loadsets), [-1] * len(loadsets), [-1] * len(loadsets))
+        attr.setComponents(table.components)
+        if table.transform == "Global":
+            attr.setResultsTransformGlobal()
+        elif table.transform == "Element":
+            attr.setResultsTransformElement()
+        else:
+            attr.setResultsTransformNone()
+        attr.showCoordinates(table.showCoordinates)
+        attr.showExtremeResults(False)
+        attr.setSlice(False)
+        attr.setAllowDerived(table.allowDerived)
+        attr.setSigFig(table.sigFig)
+        # The table is shown only when requested by showResults
+        attr.setDisplayNow(False)
+    except Exception:
+        # Do not leave a partly defined wizard in the model
+        db.deleteAttribute(attr)
+        raise
+    return attr
+
+def _long_columns(chunk:PRWChunk, table:int) -> dict:
+    # One row per location and component: the first column is the ID of the node or element and a second
+    # integer column (element node, Gauss point or point number) is the location within the element
+    names = list(chunk.columns)
+    ids = chunk.columns[names[0]]
+    points = next((values for name, values in list(chunk.columns.items())[1:] if values.dtype == np.int64), np.full(len(chunk), -1, dtype=np.int64))
+    coords = chunk.coords if chunk.coords is not None else np.full((len(chunk), 3), np.nan)
+    components = [name for name, values in chunk.columns.items() if values.dtype == np.float64 and name not in ("X", "Y", "Z")]
+    n, m = len(chunk), len(components)
+    return {
+        "Table": np.full(n * m, table, dtype=np.int32),
+        "Loadset": np.full(n * m, chunk.loadset, dtype=np.int32),
+        "ID": np.tile(ids, m),
+        "Point": np.tile(points, m),
+        "X": np.tile(coords[:, 0], m),
+        "Y": np.tile(coords[:, 1], m),
+        "Z": np.tile(coords[:, 2], m),
+        "Component": np.repeat(np.array(components, dtype=str), n),
+        "Value": np.concatenate([chunk.columns[name] for name in components]) if m else np.empty(0),
+    }
+
+# Columns of the long form output and their types
+_LONG_COLUMNS = {"Table": np.int32, "Loadset": np.int32, "ID": np.int64, "Point": np.int64,
+                 "X": np.float64, "Y": np.float64, "Z": np.float64, "Component": str, "Value": np.float64}
+
+class _ColumnarWriter:
+    # Writes the long columns to Parquet row groups as they are read, or to one temporary file per column that is
+    # copied into the .npz file block by block when closed (the components are written as codes until then).
+    # The output is written to a ".partial" file that only replaces the output file when closed after a complete export,
+    # so that a failed export never leaves a truncated file that looks valid.
+    def __init__(self, filename:str, definitions:list[dict]):
+        self.filename = filename
+        root, extension = os.path.splitext(filename)
+        self.partial = f"{root}.partial{extension}"
+        self.definitions = definitions
+        self.parquet = os.path.splitext(filename)[1].lower() == ".parquet"
+        self.writer = None
+        if self.parquet:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise Exception("Writing Parquet files requires pyarrow (pip install pyarrow), or use a .npz output file")
+            self.pa = pa
+            schema = pa.schema([("Table", pa.int32()), ("Loadset", pa.int32()), ("ID", pa.int64()), ("Point", pa.int64()),
+                                ("X", pa.float64()), ("Y", pa.float64()), ("Z", pa.float64()), ("Component", pa.string()), ("Value", pa.float64())],
+                               metadata={"prw_tables": json.dumps(definitions)})
+            self.writer = pq.ParquetWriter(self.partial, schema)
+        else:
+            self.folder = tempfile.TemporaryDirectory()
+            self.files = {name: open(os.path.join(self.folder.name, name), "wb") for name in _LONG_COLUMNS}
+            self.components = {}      # component name -> code
+            self.rows = 0
+
+    def write(self, columns:dict):
+        if self.parquet:
+            self.writer.write_table(self.pa.table(columns, schema=self.writer.schema))
+            return
+        for name, dtype in _LONG_COLUMNS.items():
+            if dtype is str:
+                names, inverse = np.unique(columns[name], return_inverse=True)
+                codes = np.array([self.components.setdefault(str(n), len(self.components)) for n in names], dtype=np.int32)
+                codes[inverse].tofile(self.files[name])
+            else:
+                np.asarray(columns[name], dtype=dtype).tofile(self.files[name])
+        self.rows += len(columns["Value"])
+
+    def close(self, complete:bool=True, blockSize:int=1000000):
+        try:
+            if self.parquet:
+                self.writer.close()
+            else:
+                for f in self.files.values():
+                    f.close()
+                if complete:
+                    self._write_npz(blockSize)
+        except Exception:
+            complete = False
+            raise
+        finally:
+            if not self.parquet:
+                self.folder.cleanup()
+            if complete:
+                os.replace(self.partial, self.filename)
+            elif os.path.exists(self.partial):
+                os.remove(self.partial)
+
+    def _write_npz(self, blockSize:int):
+        import zipfile
+        names = np.array(sorted(self.components, key=self.components.get) or [""], dtype=str)
+        with zipfile.ZipFile(self.partial, "w", allowZip64=True) as npz:
+            with npz.open("tables.npy", "w", force_zip64=True) as f:
+                np.lib.format.write_array(f, np.array(json.dumps(self.definitions)))
+            for name, dtype in _LONG_COLUMNS.items():
+                stored = np.int32 if dtype is str else dtype
+                values = np.memmap(self.files[name].name, dtype=stored, mode="r") if self.rows else np.empty(0, dtype=stored)
+                header = {"descr": np.lib.format.dtype_to_descr(names.dtype if dtype is str else np.dtype(dtype)), "fortran_order": False, "shape": (self.rows,)}
+                with npz.open(f"{name}.npy", "w", force_zip64=True) as f:
+                    np.lib.format.write_array_header_2_0(f, header)
+                    for i in range(0, self.rows, blockSize):
+                        block = values[i:i+blockSize]
+                        f.write((names[block] if dtype is str else block).tobytes())
+                values = None
+
+def export_prw_tables(modeller:'IFModeller', tables:list, outputFile:str, loadsetsPerTable:int=None, textFolder:str=None, chunkSize:int=100000) -> list[dict]:
+    """Export PRW tables of several entities and loadsets to a single columnar file.
+    Each table is a temporary PRW attribute whose loadcase tabs are saved with one saveAllAs call and read back in chunks.
+    The LPI can only save a PRW table from its grid window (IFPrintResultsWizard.showResults), so one window is opened and
+    closed per table. The user interface and view refresh are disabled during the export to limit the cost of each window.
+    The output has the columns Table (index of the table definition), Loadset, ID (node or element), Point (location
+    within the element, -1 for nodal results), X, Y, Z (NaN if not shown), Component and Value (NaN for N/A).
+    The table definitions are stored with the output (Parquet schema metadata "prw_tables", or the "tables" array of the .npz).
+
+    Args:
+        modeller (IFModeller): Reference to LUSAS Modeller
+        tables (list[PRWTable | dict]): Table definitions, as PRWTable objects or dictionaries of PRWTable arguments
+        outputFile (str): Path of the output file, ".parquet" (requires pyarrow) or ".npz". Both are written as the tables are read,
+                          without holding all the tables in memory.
+        loadsetsPerTable (int, optional): Maximum number of loadsets per grid window, to limit the size of each text file. Defaults to None (all in one).
+        textFolder (str, optional): Folder in which the text files are kept. Defaults to None (temporary files deleted once read).
+        chunkSize (int, optional): Number of rows read at a time from each text file. Defaults to 100000.
+
+    Returns:
+        list[dict]: For each grid window, the table index, entity, number of loadsets, number of values written,
+                    and the time in seconds to create and show the table ("show"), save it ("save") and read and write it ("read")
+    """
+    db = modeller.db()
+    tables = [table if isinstance(table, PRWTable) else PRWTable(**table) for table in tables]
+    definitions = [dict(vars(table), loadsets=table.loadsets if isinstance(table.loadsets, str) else [get_loadset_id(ls) for ls in table.loadsets]) for table in tables]
+    writer = _ColumnarWriter(outputFile, definitions)
+    timings = []
+    temporary = tempfile.TemporaryDirectory() if textFolder is None else None
+    folder = textFolder if textFolder is not None else temporary.name
+    # The UI and refresh switches are only available from v22.0
+    restoreUI = modeller.getMajorVersionNumber() >= 22
+    if restoreUI:
+        uiEnabled, manualRefresh = modeller.isUIEnabled(), modeller.isManualRefresh()
+        modeller.enableUI(False)
+        modeller.setManualRefresh(True)
+    complete = False
+    try:
+        for i, table in enumerate(tables):
+            for j, loadsets in enumerate(_loadset_groups(definitions[i]["loadsets"], loadsetsPerTable)):
+                start = time.perf_counter()
+                attr = _create_prw(db, f"PRW Export {i+1}.{j+1}", table, loadsets)
+                # A temporary attribute is deleted when its window is closed
+                try:
+                    window = attr.showResults(True)
+                except Exception:
+                    db.deleteAttribute(attr)
+                    raise
+                shown = time.perf_counter()
+                textFile = os.path.join(folder, f"PRW Export {i+1}.{j+1}.txt")
+                try:
+                    window.saveAllAs(textFile, "Text")
+                finally:
+                    window.close()
+                saved = time.perf_counter()
+                count = 0
+                for chunk in iter_prw_chunks(textFile, chunkSize):
+                    columns = _long_columns(chunk, i)
+                    writer.write(columns)
+                    count += len(columns["Value"])
+                if textFolder is None:
+                    os.remove(textFile)
+                end = time.perf_counter()
+                timings.append({"table": i, "entity": table.entity, "loadsets": 1 if isinstance(loadsets, str) else len(loadsets),
+                                "values": count, "show": shown - start, "save": saved - shown, "read": end - saved})
+        complete = True
+    finally:
+        if restoreUI:
+            modeller.setManualRefresh(manualRefresh)
+            modeller.enableUI(uiEnabled)
+        # The output file is only written if every table was exported
+        writer.close(complete)
+        if temporary is not None:
+            temporary.cleanup()
+    return timings
@@ -0,0 +1,187 @@
+# LUSAS API (LPI) EXAMPLES
+# (https://github.com/LUSAS-Software/LUSAS-API-Examples/)
+#
+# Description:
+# This file contains a results cache for scripts that query the same results repeatedly (e.g. different sections of a report).
+# Results are read through results component sets and kept as NumPy arrays keyed by (entity, component, location, loadset, element/node).
+# The cache has a memory budget in bytes and evicts the least recently used results when the budget is exceeded.
+# Results component sets are released once none of their results are held in the cache.
+# The cache is cleared when the results change through its solve() and openAllResults() methods.
+#
+# Example:
+#   cache = ResultsCache(lusas, maxBytes=64*1024**2)
+#   my = cache.get("Force/Moment - Thick 3D Beam", "My", "Internal", 1, element)
+#   print(cache.hits, cache.misses)
+
+from collections import OrderedDict
+import numpy as np
+from shared.LPI import *
+from shared.Results import get_loadset_id, na_to_nan
+
+class ResultsCache:
+    """Least recently used cache of results extracted through results component sets
+
+    Attributes:
+        maxBytes (int): Memory budget of the cached results
+        nbytes (int): Memory used by the cached results
+        hits (int): Number of requests answered by the cache
+        misses (int): Number of requests read from LUSAS Modeller
+        evictions (int): Number of results evicted to keep within the memory budget
+    """
+
+    # Overhead of a cache entry (key, array header and dictionary slot) added to the size of the results
+    ENTRY_OVERHEAD = 256
+
+    def __init__(self, modeller:'IFModeller', maxBytes:int=256*1024**2, objSet:'IFObjectSet'=None, units:'IFUnitSet'=None):
+        """
+        Args:
+            modeller (IFModeller): Reference to LUSAS Modeller
+            maxBytes (int, optional): Memory budget of the cached results. Defaults to 256MB.
+            objSet (IFObjectSet, optional): Elements/nodes for which results are calculated. Defaults to all elements and nodes.
+            units (IFUnitSet, optional): Units of the results. Defaults to None (database units).
+        """
+        self.lusas = modeller
+        self.maxBytes = maxBytes
+        self.objSet = objSet
+        self.units = units
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()     # (entity, component, location, loadset, id) -> results
+        self._componentSets = {}          # (entity, component, location, loadset) -> [IFResultsComponentSet, componentNumber, entries]
+        self._contexts = {}               # loadset -> IFResultsContext
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, entity:str, component:str, location:str, loadset, feature) -> np.ndarray:
+        """Get the results of a component at an element or node
+
+        Args:
+            entity (str): Results entity (e.g. "Force/Moment - Thick 3D Beam")
+            component (str): Results component (e.g. "My")
+            location (str): "Nodal", "ElementNodal", "Gauss", "Internal" or "Averaged"
+            loadset (IFLoadset | int): Loadset object or ID
+            feature (IFElement | IFNode | int): Element, or node for "Nodal" results, as an object or ID
+
+        Returns:
+            np.ndarray: Results at each location of the element (a single value for nodal results), NaN where not available.
+                        The array is shared with the cache and must not be modified.
+        """
+        loadsetID = get_loadset_id(loadset)
+        id = int(feature) if isinstance(feature, (int, np.integer)) else feature.getID()
+        key = (entity, component, location.lower(), loadsetID, id)
+
+        values = self._entries.get(key)
+        if values is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return values
+
+        self.misses += 1
+        if isinstance(feature, (int, np.integer)):
+            feature = self.lusas.db().getObject("Node" if key[2] == "nodal" else "Element", id)
+        try:
+            values = self._read(key, feature)
+        except Exception:
+            # Do not keep a results component set or context that holds no results (e.g. a location the element does not have)
+            self._drop_unused(key[:4])
+            raise
+        values.flags.writeable = False
+
+        self._entries[key] = values
+        self._componentSets[key[:4]][2] += 1
+        self.nbytes += values.nbytes + self.ENTRY_OVERHEAD
+        self._evict()
+        return values
+
+    def _component_set(self, setKey:tuple) -> list:
+        entry = self._componentSets.get(setKey)
+        if entry is None:
+            entity, component, location, loadsetID = setKey
+            context = self._contexts.get(loadsetID)
+            if context is None:
+                context = self.lusas.newResultsContext(None)
+                objSet = self.objSet if self.objSet is not None else self.lusas.newObjectSet().add("Element").addLOF("Node")
+                context.getCalcResultsSet().add(objSet)
+                context.setActiveLoadset(loadsetID)
+                self._contexts[loadsetID] = context
+            locn = "Nodal" if location in ("nodal", "averaged") else location
+            rcs = self.lusas.db().getResultsComponentSet(entity, component, locn, context)
+            entry = [rcs, rcs.getComponentNumber(component), 0]
+            self._componentSets[setKey] = entry
+        return entry
+
+    def _read(self, key:tuple, feature) -> np.ndarray:
+        rcs, componentNumber, _ = self._component_set(key[:4])
+        location = key[2]
+        if location == "nodal":
+            values = [rcs.getContinuousResults(componentNumber, feature, self.units, None)]
+        elif location == "elementnodal":
+            values = rcs.getElementNodalResultsArray(componentNumber, feature, self.units)
+        elif location == "gauss":
+            values = rcs.getGaussResultsArray(componentNumber, feature, self.units)
+        elif location == "internal":
+            values = rcs.getInternalResultsArray(componentNumber, feature, self.units)
+        elif location == "averaged":
+            values = rcs.getAveragedResultsArray(componentNumber, feature, self.units)
+        else:
+            raise Exception(f"Unknown results location '{key[2]}'")
+        return na_to_nan(np.array(values, dtype=np.float64))
+
+    def _evict(self):
+        # Always keep the most recent entry, even if it exceeds the budget on its own
+        while self.nbytes > self.maxBytes and len(self._entries) > 1:
+            key, values = self._entries.popitem(last=False)
+            self.nbytes -= values.nbytes + self.ENTRY_OVERHEAD
+            self.evictions += 1
+            self._release(key[:4])
+
+    def _release(self, setKey:tuple):
+        self._componentSets[setKey][2] -= 1
+        self._drop_unused(setKey)
+
+    def _drop_unused(self, setKey:tuple):
+        entry = self._componentSets.get(setKey)
+        if entry is None or entry[2] == 0:
+            # Dereference the results component set so that LUSAS can free its results
+            self._componentSets.pop(setKey, None)
+            if not any(other[3] == setKey[3] for other in self._componentSets):
+                self._contexts.pop(setKey[3], None)
+
+    def clear(self):
+        """Remove all results and release all results component sets and contexts (the counters are retained)"""
+        self._entries.clear()
+        self._componentSets.clear()
+        self._contexts.clear()
+        self.nbytes = 0
+
+    def solve(self, analysis:'IFAnalysis', ignoreModified:bool=None) -> int:
+        """Solve an analysis and clear the cache
+
+        Args:
+            analysis (IFAnalysis): Analysis to solve
+            ignoreModified (bool, optional): Ignore the modification state of the analysis. Defaults to None (LUSAS default).
+
+        Returns:
+            int: Return code of IFAnalysis.solve
+        """
+        returnCode = analysis.solve() if ignoreModified is None else analysis.solve(ignoreModified)
+        self.clear()
+        return returnCode
+
+    def openAllResults(self, scanOutputFiles:bool=None, skipOutOfDate:bool=None):
+        """Open all results of all analyses and clear the cache
+
+        Args:
+            scanOutputFiles (bool, optional): Parse the output files for errors and warnings. Defaults to None (LUSAS default).
+            skipOutOfDate (bool, optional): Skip results LUSAS considers out of date. Defaults to None (LUSAS default).
+        """
+        if skipOutOfDate is not None:
+            self.lusas.db().openAllResults(True if scanOutputFiles is None else scanOutputFiles, skipOutOfDate)
+        elif scanOutputFiles is not None:
+            self.lusas.db().openAllResults(scanOutputFiles)
+        else:
+            self.lusas.db().openAllResults()
+        self.clear()
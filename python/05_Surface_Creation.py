@@ -9,6 +9,7 @@
 # Libraries:
 # LUSAS LPI module (easier connection and autocomplete)
 from shared.LPI import *
+from shared.LPI import IFSurface
 
 # Connect to LUSAS and check if a model is open
 lusas = get_lusas_modeller()
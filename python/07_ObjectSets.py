@@ -9,6 +9,7 @@
 # Libraries:
 # LUSAS LPI module (easier connection and autocomplete)
 from shared.LPI import *
+from shared.LPI import IFPoint
 
 # Import Helpers module (which contains some useful functions)
 import shared.Helpers as Helpers
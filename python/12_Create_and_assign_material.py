@@ -9,6 +9,7 @@
 # Libraries:
 # LUSAS LPI module (easier connection and autocomplete)
 from shared.LPI import *
+from shared.LPI import IFMaterialIsotropic
 # Helpers module (easier geometry creation)
 import shared.Helpers as Helpers
 
@@ -11,6 +11,7 @@
 # Libraries:
 # LUSAS LPI module (easier connection and autocomplete)
 from shared.LPI import *
+from shared.LPI import IFNode, IFElement
 # Time module to measure execution time
 import time
 
@@ -190,3 +191,39 @@ beamsObjSet = None
 
 
 # The general principle laid out above can be used for all elements, nodes and inspection location results.
+
+
+######################################################
+## Nodal Results as NumPy Arrays
+# The Results helper module wraps the principles above (object set, results context and results component sets) and returns all requested components as a NumPy array.
+# This is not a bulk extraction: each result is still one call per node and component (plus one getID call per node).
+# The LUSAS N/A value (2.2250738585072014e-308) is replaced by NaN so that totals can be calculated with the NaN aware NumPy functions.
+import numpy as np
+import shared.Results as Results
+Results.initialise(lusas)
+start = time.time()
+
+reactions, nodeIDs = Results.get_nodal_results(lusas.selection(), "Reaction", ["FX", "FY", "FZ"], 1)
+print(f"Total reactions of selected nodes (loadset 1) : {np.nansum(reactions, axis=0)}")
+print(f"Execution time for reaction results as an array: {time.time() - start} seconds")
+
+
+######################################################
+## Element Results by Stress Type
+# Rather than checking the type of each element, the selection is partitioned once per stress type using keep() and the results of
+# each type are read with one results context and one results component set per component: internal points for beams, Gauss points for shells and solids.
+# Each type is returned as a ragged array, the rows of element elementIDs[i] being values[offsets[i]:offsets[i+1]].
+start = time.time()
+
+elementResults = Results.get_element_results(lusas.selection(), 1)
+for stressType, res in elementResults.items():
+    print(f"{stressType}: {len(res)} elements, {res.location} results {res.components}")
+    # Largest value of each component per element
+    print(np.fmax.reduceat(res.values, res.offsets[:-1], axis=0))
+
+# Beam results can also be read element by element
+if "Thick 3D Beam" in elementResults:
+    beams = elementResults["Thick 3D Beam"]
+    for id in beams.elementIDs:
+        print(id, beams.get(id)[:, beams.components.index("My")])
+print(f"Execution time for element results by stress type: {time.time() - start} seconds")
@@ -8,8 +8,11 @@
 
 # Libraries:
 import os
+import numpy as np
 # LUSAS LPI module (easier connection and autocomplete)
 from shared.LPI import *
+# Streaming reader of PRW text exports
+from shared.PrintResults import iter_prw_chunks
 
 # Connect to LUSAS and check if a model is open
 lusas = get_lusas_modeller()
@@ -73,3 +76,16 @@ print(f"Results saved to {export_dir}\\{prw_name}_results.xls")
 table.saveAs(f"{export_dir}\\{prw_name}_results.txt", "Text")
 print(f"Results saved to {export_dir}\\{prw_name}_results.txt")
 table.close()
+
+
+######################################################
+# Read the text export back as NumPy arrays
+
+# The file is read in chunks of rows, so memory use depends on the chunk size rather than the size of the export
+maxNode, maxRSLT = None, -np.inf
+for chunk in iter_prw_chunks(f"{export_dir}\\{prw_name}_results.txt", chunkSize=100000):
+    rslt = chunk.columns["RSLT"]
+    if np.any(rslt > maxRSLT):
+        i = np.nanargmax(rslt)
+        maxNode, maxRSLT = chunk.columns["Node"][i], rslt[i]
+print(f"Maximum resultant displacement {maxRSLT} at node {maxNode}")
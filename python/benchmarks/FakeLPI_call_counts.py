@@ -0,0 +1,145 @@
+# LUSAS API (LPI) EXAMPLES
+# (https://github.com/LUSAS-Software/LUSAS-API-Examples/)
+#
+# Benchmark:    FakeLPI_call_counts.py
+# Description:  Counts the LPI calls and measures the time of the batched helpers of shared/Helpers.py against the
+#               one-call-per-object loops they replace, on the in-memory fake modeller (shared/FakeLPI.py):
+#                - create_points against create_point in a loop
+#                - create_lines against create_line_by_coordinates in a loop
+#                - create_surfaces against create_surface_by_coordinates in a loop
+#                - AssignmentPlanner against IFAttribute.assignTo in a loop
+#               The objects created are checked against the inputs (coordinates, order and assignments), and an
+#               exception is raised if a batched helper does not make fewer calls than its loop or if the number of
+#               calls reported by AssignmentPlanner differs from the number counted.
+#               Only call counts and the in-memory model are checked. The file formats written by the fake modeller
+#               (solver datafile, results dump, grid window text) are its own assumptions and are not exercised here.
+#               LUSAS Modeller is not required.
+# Author:       Finite Element Analysis Ltd
+#
+# Usage:        python benchmarks/FakeLPI_call_counts.py [latency in ms per LPI call]
+
+import os
+import sys
+import time
+import numpy as np
+
+# Folder containing the shared modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.FakeLPI import get_fake_modeller
+import shared.Helpers as Helpers
+
+latency = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.0
+
+def check(condition:bool, message:str):
+    if not condition:
+        raise Exception(message)
+
+def measure(setup, run) -> tuple:
+    """Run a case on a new fake model, returning the result, the number of LPI calls and the time of run() only"""
+    lusas = get_fake_modeller(latency)
+    Helpers.initialise(lusas)
+    inputs = setup(lusas)
+    lusas.resetCalls()
+    start = time.perf_counter()
+    result = run(lusas, inputs)
+    seconds = time.perf_counter() - start
+    return result, lusas.callCount(), seconds
+
+def report(name:str, naive:tuple, batched:tuple):
+    print(f"{name:<22} loop {naive[1]:7d} calls {naive[2]:8.3f} s   batched {batched[1]:6d} calls {batched[2]:8.3f} s")
+    check(batched[1] < naive[1], f"{name}: the batched helper made {batched[1]} calls, the loop {naive[1]}")
+
+
+######################################################
+## Points (create_points)
+coords = np.random.default_rng(1).uniform(0, 100, size=(2000, 3))
+
+def points_loop(lusas, _):
+    return [Helpers.create_point(x, y, z) for x, y, z in coords.tolist()]
+
+def points_batched(lusas, _):
+    return Helpers.create_points(coords)
+
+naive = measure(lambda lusas: None, points_loop)
+batched = measure(lambda lusas: None, points_batched)
+check(np.allclose([[p.getX(), p.getY(), p.getZ()] for p in batched[0]], coords), "create_points: the points are not in the order of the coordinates")
+report("create_points", naive, batched)
+
+
+######################################################
+## Lines (create_lines): a grid of 20 x 20 bays, horizontal and vertical members
+n = 20
+segments = [((i, j, 0), (i + 1, j, 0)) for j in range(n + 1) for i in range(n)] + [((i, j, 0), (i, j + 1, 0)) for i in range(n + 1) for j in range(n)]
+segments = np.array(segments, dtype=np.float64)
+
+def lines_loop(lusas, _):
+    return [Helpers.create_line_by_coordinates(*s[0], *s[1]) for s in segments.tolist()]
+
+def lines_batched(lusas, _):
+    return Helpers.create_lines(segments)
+
+naive = measure(lambda lusas: None, lines_loop)
+batched = measure(lambda lusas: None, lines_batched)
+ends = np.array([[line.getStartPosition(), line.getEndPosition()] for line in batched[0]])
+check(np.allclose(ends, segments), "create_lines: the lines are not in the order of the segments")
+report("create_lines", naive, batched)
+
+
+######################################################
+## Surfaces (create_surfaces): a deck of 10 x 30 quads
+ny, nx = 11, 31
+x, y = np.meshgrid(np.arange(nx, dtype=np.float64), np.arange(ny, dtype=np.float64))
+grid = np.stack([x, y, np.zeros_like(x)], axis=-1)
+
+def surfaces_loop(lusas, _):
+    surfaces = np.empty((ny - 1, nx - 1), dtype=object)
+    for j in range(ny - 1):
+        for i in range(nx - 1):
+            corners = grid[[j, j, j + 1, j + 1], [i, i + 1, i + 1, i]]
+            surfaces[j, i] = Helpers.create_surface_by_coordinates(*corners.T.tolist())
+    return surfaces
+
+def surfaces_batched(lusas, _):
+    return Helpers.create_surfaces(grid)
+
+naive = measure(lambda lusas: None, surfaces_loop)
+batched = measure(lambda lusas: None, surfaces_batched)
+for (j, i), surface in np.ndenumerate(batched[0]):
+    corners = {tuple(position) for line in surface.getLOFs() for position in (line.getStartPosition(), line.getEndPosition())}
+    check(corners == {tuple(grid[j + dj, i + di]) for dj in (0, 1) for di in (0, 1)}, f"create_surfaces: surface {j}, {i} is not on its grid cell")
+report("create_surfaces", naive, batched)
+
+
+######################################################
+## Assignments (AssignmentPlanner): 4 thicknesses and a material on 500 points
+def assignment_setup(lusas):
+    db = lusas.db()
+    pnts = Helpers.create_points(np.column_stack([np.arange(500.0), np.zeros(500), np.zeros(500)]))
+    geometric = [db.createGeometricSurface(f"T{i}").setSurface(10.0 * (i + 1), 0.0) for i in range(4)]
+    material = db.createIsotropicMaterial("Steel", 200e3, 0.3, 7.85e-9)
+    return pnts, geometric, material
+
+def assign_loop(lusas, inputs):
+    pnts, geometric, material = inputs
+    for i, pnt in enumerate(pnts):
+        geometric[i % 4].assignTo(pnt)
+        material.assignTo(pnt)
+
+def assign_planned(lusas, inputs):
+    pnts, geometric, material = inputs
+    with Helpers.AssignmentPlanner() as planner:
+        for i, pnt in enumerate(pnts):
+            planner.add(geometric[i % 4], pnt)
+            planner.add(material, pnt)
+    return planner, pnts, geometric[0], material
+
+def assigned(pnt, attributeType) -> str:
+    return [assignment.getAttribute().getName() for assignment in pnt.getAssignments(attributeType)][-1]
+
+naive = measure(assignment_setup, assign_loop)
+batched = measure(assignment_setup, assign_planned)
+planner, pnts, geometric, material = batched[0]
+check(planner.calls == batched[1], f"AssignmentPlanner: reported {planner.calls} calls but {batched[1]} were made")
+types = (geometric.getAttributeType(), material.getAttributeType())
+check(all(assigned(pnt, types[0]) == f"T{i % 4}" and assigned(pnt, types[1]) == "Steel" for i, pnt in enumerate(pnts)), "AssignmentPlanner: wrong attributes assigned")
+report("AssignmentPlanner", naive, batched)
@@ -0,0 +1,31 @@
+# LUSAS API (LPI) EXAMPLES
+# (https://github.com/LUSAS-Software/LUSAS-API-Examples/)
+#
+# Benchmark:    LPI_import_time.py
+# Description:  Measures the time taken to import the LPI module in a new Python process, as paid by every script launch.
+#               The lazy LPI module (shared.LPI) is compared with the full LPI documentation module (shared.LPI_22_0).
+#               LUSAS Modeller is not required.
+# Author:       Finite Element Analysis Ltd
+# 
+# Usage:        python benchmarks/LPI_import_time.py [repeats]
+
+import os
+import statistics
+import subprocess
+import sys
+
+# Folder containing the shared modules
+python_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+def import_time(statement:str) -> float:
+    """Time in seconds taken by the import statement in a new Python process (measured within the process)"""
+    code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    output = subprocess.run([sys.executable, "-c", code], cwd=python_dir, capture_output=True, text=True, check=True).stdout
+    return float(output)
+
+for statement in ["from shared.LPI import *", "from shared.LPI_22_0 import *"]:
+    # The first import compiles the module, which is not included in the statistics
+    import_time(statement)
+    times = [import_time(statement) for _ in range(repeats)]
+    print(f"{statement:<35} median {statistics.median(times)*1e3:8.2f} ms   min {min(times)*1e3:8.2f} ms   ({repeats} runs)")
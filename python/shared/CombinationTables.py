@@ -0,0 +1,211 @@
+# LUSAS API (LPI) EXAMPLES
+# (https://github.com/LUSAS-Software/LUSAS-API-Examples/)
+#
+# Description:
+# This file contains functions for exporting the definitions of basic combinations, smart combinations and envelopes as tables
+# (one row per combination, one column per loadset) for checking and reviewing them.
+# The IDs and factors of each combination are read once and kept as sparse coordinate (COO) arrays, and the name of each
+# loadset used is read once, so reading the tables scales with the number of combination entries rather than rows x columns.
+# The tables are written row by row to CSV files or to openpyxl write-only workbooks, without creating a dense table in memory.
+# The "wide" layout (one column per loadset, as in the Combinations View sheets) is dense: writing it still scales with
+# rows x columns cells. Only the "long" layout (one row per combination entry) is written in time proportional to the entries.
+#
+# Example:
+#   names = {}
+#   table = read_basic_combinations(db, names)
+#   write_csv(table, "Basic Combinations.csv")
+
+import csv
+import numpy as np
+from shared.LPI import *
+
+class CombinationTable:
+    """Sparse table of combination factors
+
+    Attributes:
+        title (str): Header of the first column (e.g. "Combination")
+        rowLabels (list[str]): ID, name and description of each combination
+        columnIDs (np.ndarray): Loadset ID of each column
+        columnLabels (list[str]): ID and name of the loadset of each column
+        columnKinds (list[str]): Kind of each column (e.g. "Inf"/"Sup" for smart combinations), empty strings otherwise
+        rows (np.ndarray): Row of each entry
+        cols (np.ndarray): Column of each entry
+        data (np.ndarray): Factor of each entry
+    """
+
+    def __init__(self, title:str, rowLabels:list[str], columnIDs, columnLabels:list[str], columnKinds:list[str], rows, cols, data):
+        self.title = title
+        self.rowLabels = rowLabels
+        self.columnIDs = np.asarray(columnIDs, dtype=np.int64)
+        self.columnLabels = columnLabels
+        self.columnKinds = columnKinds
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.cols = np.asarray(cols, dtype=np.int64)
+        self.data = np.asarray(data, dtype=np.float64)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (len(self.rowLabels), len(self.columnLabels))
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    def iter_rows(self):
+        """Iterate over the rows of the table
+
+        Yields:
+            tuple[str, np.ndarray, np.ndarray]: Row label, columns and factors of the entries of the row (factors of repeated loadsets are summed)
+        """
+        order = np.argsort(self.rows, kind="stable")
+        rows, cols, data = self.rows[order], self.cols[order], self.data[order]
+        bounds = np.searchsorted(rows, np.arange(len(self.rowLabels) + 1))
+        for i, label in enumerate(self.rowLabels):
+            c, d = cols[bounds[i]:bounds[i+1]], data[bounds[i]:bounds[i+1]]
+            columns, inverse = np.unique(c, return_inverse=True)
+            factors = np.zeros(len(columns))
+            np.add.at(factors, inverse, d)
+            yield label, columns, factors
+
+    def to_dense(self) -> np.ndarray:
+        """Dense factors of shape (rows, columns), NaN where a loadset is not in a combination"""
+        dense = np.full(self.shape, np.nan)
+        for i, (_, columns, factors) in enumerate(self.iter_rows()):
+            dense[i, columns] = factors
+        return dense
+
+def _loadset_labels(db:'IFDatabase', ids, names:dict) -> list[str]:
+    # ID and name of each loadset, read once and kept in names
+    labels = []
+    for id in ids:
+        label = names.get(int(id))
+        if label is None:
+            label = names[int(id)] = db.getLoadset(int(id)).getIDAndName()
+        labels.append(label)
+    return labels
+
+def _read_table(db:'IFDatabase', title:str, loadsets:list['IFLoadset'], entries, kinds:list[str], names:dict) -> CombinationTable:
+    # entries(loadset) returns the loadset IDs and a factor array per kind
+    rowLabels = []
+    rows, ids, data = [], [], []
+    for i, loadset in enumerate(loadsets):
+        rowLabels.append(loadset.getIDAndNameAndDescription())
+        loadsetIDs, factors = entries(loadset)
+        for k, kindFactors in enumerate(factors):
+            rows.append(np.full(len(loadsetIDs), i))
+            ids.append(np.asarray(loadsetIDs, dtype=np.int64) * len(kinds) + k)
+            data.append(np.asarray(kindFactors, dtype=np.float64))
+
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    keys = np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+    data = np.concatenate(data) if data else np.empty(0)
+    # Columns of the loadsets used, in ID order
+    columnKeys, cols = np.unique(keys, return_inverse=True)
+    columnIDs = columnKeys // len(kinds)
+    columnLabels = _loadset_labels(db, columnIDs, names)
+    columnKinds = [kinds[k] for k in columnKeys % len(kinds)]
+    return CombinationTable(title, rowLabels, columnIDs, columnLabels, columnKinds, rows, cols, data)
+
+def read_basic_combinations(db:'IFDatabase', names:dict=None) -> CombinationTable:
+    """Read the factors of all basic combinations
+
+    Args:
+        db (IFDatabase): Reference to the database
+        names (dict, optional): Loadset "ID:name" labels by ID, read as needed and shared between tables. Defaults to None.
+
+    Returns:
+        CombinationTable: Factors of each loadset in each combination
+    """
+    names = {} if names is None else names
+    return _read_table(db, "Combination", db.getLoadsets("Basic Combinations"),
+                       lambda c: (c.getLoadcaseIDs(), [c.getFactors()]), [""], names)
+
+def read_smart_combinations(db:'IFDatabase', names:dict=None) -> CombinationTable:
+    """Read the factors of all smart combinations. Each loadset has an "Inf" column with the permanent factor
+    and a "Sup" column with the adverse factor (permanent + variable).
+
+    Args:
+        db (IFDatabase): Reference to the database
+        names (dict, optional): Loadset "ID:name" labels by ID, read as needed and shared between tables. Defaults to None.
+
+    Returns:
+        CombinationTable: Factors of each loadset in each combination
+    """
+    names = {} if names is None else names
+    def entries(c):
+        permanent = np.asarray(c.getPermanentFactors(), dtype=np.float64)
+        variable = np.asarray(c.getVariableFactors(), dtype=np.float64)
+        return c.getLoadcaseIDs(), [permanent, permanent + variable]
+    return _read_table(db, "Combination", db.getLoadsets("Smart Combinations"), entries, ["Inf", "Sup"], names)
+
+def read_envelopes(db:'IFDatabase', names:dict=None) -> CombinationTable:
+    """Read the loadsets of all envelopes (factor 1 for each loadset included)
+
+    Args:
+        db (IFDatabase): Reference to the database
+        names (dict, optional): Loadset "ID:name" labels by ID, read as needed and shared between tables. Defaults to None.
+
+    Returns:
+        CombinationTable: Loadsets included in each envelope
+    """
+    names = {} if names is None else names
+    def entries(e):
+        ids = e.getLoadcaseIDs()
+        return ids, [np.ones(len(ids))]
+    return _read_table(db, "Envelope", db.getLoadsets("Envelopes"), entries, [""], names)
+
+def _header_rows(table:CombinationTable) -> list[list[str]]:
+    if any(table.columnKinds):
+        return [[table.title] + table.columnLabels, [""] + table.columnKinds]
+    return [[table.title] + table.columnLabels]
+
+def _wide_rows(table:CombinationTable):
+    for label, columns, factors in table.iter_rows():
+        row = [None] * table.shape[1]
+        for c, f in zip(columns.tolist(), factors.tolist()):
+            row[c] = f
+        yield [label] + row
+
+def _long_rows(table:CombinationTable):
+    for label, columns, factors in table.iter_rows():
+        for c, f in zip(columns.tolist(), factors.tolist()):
+            yield [label, table.columnLabels[c], table.columnKinds[c], f]
+
+def _rows(table:CombinationTable, layout:str):
+    if layout == "wide":
+        return _header_rows(table), _wide_rows(table)
+    elif layout == "long":
+        return [[table.title, "Loadset", "Kind", "Factor"]], _long_rows(table)
+    raise Exception(f"Unknown layout '{layout}', expected 'wide' or 'long'")
+
+def write_csv(table:CombinationTable, filename:str, layout:str="wide"):
+    """Write a table to a CSV file row by row
+
+    Args:
+        table (CombinationTable): Table to write
+        filename (str): Path of the CSV file
+        layout (str, optional): "wide" for one column per loadset (dense, rows x columns cells are written), or "long" for one row
+                                per combination entry (combination, loadset, kind, factor), whose size is proportional to the number of entries. Defaults to "wide".
+    """
+    header, rows = _rows(table, layout)
+    with open(filename, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerows(header)
+        writer.writerows(rows)
+
+def write_sheet(workbook, table:CombinationTable, sheetName:str, layout:str="wide"):
+    """Write a table to a new sheet of an openpyxl workbook row by row.
+    Create the workbook with openpyxl.Workbook(write_only=True) so that the rows are streamed to the file when it is saved.
+
+    Args:
+        workbook (openpyxl.Workbook): Workbook
+        table (CombinationTable): Table to write
+        sheetName (str): Name of the sheet
+        layout (str, optional): "wide" (dense) or "long" (one row per entry), see write_csv. Defaults to "wide".
+    """
+    sheet = workbook.create_sheet(sheetName)
+    header, rows = _rows(table, layout)
+    for row in header:
+        sheet.append(row)
+    for row in rows:
+        sheet.append(row)
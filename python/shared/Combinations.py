@@ -0,0 +1,194 @@
+# LUSAS API (LPI) EXAMPLES
+# (https://github.com/LUSAS-Software/LUSAS-API-Examples/)
+#
+# Description:
+# This file contains helper functions for evaluating combinations and envelopes in Python from extracted results
+# The factors of basic combinations, smart combinations and envelopes are read once from the LUSAS model
+# and then applied to per loadcase results arrays (e.g. from the Results module) using NumPy.
+# This avoids creating combination loadsets in the model and extracting the results of each one of them.
+#
+# The results arrays are expected with the loadcases along the first axis, in the order of the given loadcase IDs,
+# e.g. the (loadset x node x component) cube created by Results.extract_results_cube.
+# NaN values (N/A results) are ignored, a combined value is NaN only if all its contributing results are NaN.
+# The library must be initialised with a reference to LUSAS Modeller before reading factors from the model.
+
+import numpy as np
+from shared.LPI import *
+
+def initialise(modeller:'IFModeller'):
+    global lusas
+    lusas = modeller
+
+def _loadcase_columns(ids:list[int], loadcaseIDs:list[int], name:str) -> list[int]:
+    columns = {int(id): i for i, id in enumerate(loadcaseIDs)}
+    missing = [id for id in ids if int(id) not in columns]
+    if missing:
+        raise Exception(f"{name} refers to loadsets {missing} which are not in the results")
+    return [columns[int(id)] for id in ids]
+
+def get_basic_combination_factors(combinations:list['IFBasicCombination'], loadcaseIDs:list[int]) -> np.ndarray:
+    """Read the factor table of basic combinations (one row per combination, one column per loadcase)
+
+    Args:
+        combinations (list[IFBasicCombination]): Basic combinations (e.g. db.getLoadsets("Basic Combinations"))
+        loadcaseIDs (list[int]): Loadcase IDs in the order of the results arrays
+
+    Returns:
+        np.ndarray: Factors of shape (n_combinations, n_loadcases)
+    """
+    factors = np.zeros((len(combinations), len(loadcaseIDs)))
+    for i, combination in enumerate(combinations):
+        columns = _loadcase_columns(combination.getLoadcaseIDs(), loadcaseIDs, combination.getName())
+        # The same loadcase may be added more than once, factors are summed
+        np.add.at(factors[i], columns, combination.getFactors())
+    return factors
+
+def get_smart_combination_factors(combinations:list['IFSmartCombination'], loadcaseIDs:list[int]) -> tuple[np.ndarray, np.ndarray]:
+    """Read the permanent and variable factor tables of smart combinations
+
+    A limit on the number of loadcases or variable effects (IFSmartCombination.setEffects) changes which loadcases are
+    combined and is not reproduced by smart_combinations, so an exception is raised for any combination whose limits are
+    lower than its number of loadcases.
+
+    Args:
+        combinations (list[IFSmartCombination]): Smart combinations (e.g. db.getLoadsets("Smart Combinations"))
+        loadcaseIDs (list[int]): Loadcase IDs in the order of the results arrays
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Permanent and variable factors, each of shape (n_combinations, n_loadcases)
+    """
+    permanent = np.zeros((len(combinations), len(loadcaseIDs)))
+    variable = np.zeros((len(combinations), len(loadcaseIDs)))
+    for i, combination in enumerate(combinations):
+        ids = combination.getLoadcaseIDs()
+        limits = (combination.getNumberToConsider(), combination.getNumberVariable())
+        if any(0 < limit < len(ids) for limit in limits):
+            raise Exception(f"Smart combination {combination.getName()} limits the number of effects (setEffects{limits}), "
+                            "which smart_combinations does not apply; combine it in LUSAS Modeller instead")
+        columns = _loadcase_columns(ids, loadcaseIDs, combination.getName())
+        np.add.at(permanent[i], columns, combination.getPermanentFactors())
+        np.add.at(variable[i], columns, combination.getVariableFactors())
+    return permanent, variable
+
+def get_envelope_members(envelopes:list['IFEnvelope'], loadsetIDs:list[int]) -> np.ndarray:
+    """Read the loadsets included in each envelope
+
+    Args:
+        envelopes (list[IFEnvelope]): Envelopes (e.g. db.getLoadsets("Envelopes"))
+        loadsetIDs (list[int]): Loadset IDs in the order of the results arrays
+
+    Returns:
+        np.ndarray: Boolean membership of shape (n_envelopes, n_loadsets)
+    """
+    members = np.zeros((len(envelopes), len(loadsetIDs)), dtype=bool)
+    for i, envelope in enumerate(envelopes):
+        members[i, _loadcase_columns(envelope.getLoadcaseIDs(), loadsetIDs, envelope.getName())] = True
+    return members
+
+def _apply_factors(factors:np.ndarray, results:np.ndarray) -> np.ndarray:
+    # Matrix product of the factors with the results flattened beyond the loadcase axis
+    return (factors @ results.reshape(results.shape[0], -1)).reshape((factors.shape[0],) + results.shape[1:])
+
+def basic_combinations(results:np.ndarray, factors:np.ndarray) -> np.ndarray:
+    """Evaluate basic combinations, sum of factor x loadcase results
+
+    Args:
+        results (np.ndarray): Loadcase results of shape (n_loadcases, ...)
+        factors (np.ndarray): Factors of shape (n_combinations, n_loadcases)
+
+    Returns:
+        np.ndarray: Combination results of shape (n_combinations, ...)
+    """
+    valid = ~np.isnan(results)
+    combined = _apply_factors(factors, np.where(valid, results, 0.0))
+    # NaN where none of the loadcases of the combination has a result
+    contributing = _apply_factors((factors != 0).astype(np.float64), valid.astype(np.float64))
+    combined[contributing == 0] = np.nan
+    return combined
+
+def smart_combinations(results:np.ndarray, permanent:np.ndarray, variable:np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Evaluate the maximum and minimum of smart combinations
+
+    The permanent part of every loadcase is always included, while the variable part is only included when it is adverse
+    (positive for the maximum, negative for the minimum). All variable loadcases are considered, i.e. a limit on the number
+    of variable effects (IFSmartCombination.setEffects) is not applied; get_smart_combination_factors raises an exception
+    for combinations that set one.
+
+    Args:
+        results (np.ndarray): Loadcase results of shape (n_loadcases, ...)
+        permanent (np.ndarray): Permanent factors of shape (n_combinations, n_loadcases)
+        variable (np.ndarray): Variable factors of shape (n_combinations, n_loadcases)
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Maximum and minimum combination results, each of shape (n_combinations, ...)
+    """
+    valid = ~np.isnan(results)
+    r = np.where(valid, results, 0.0)
+    rPos = np.maximum(r, 0.0)
+    rNeg = np.minimum(r, 0.0)
+    vPos = np.maximum(variable, 0.0)
+    vNeg = np.minimum(variable, 0.0)
+
+    # max(v*r, 0) = max(v,0)*max(r,0) + min(v,0)*min(r,0) and similarly for the minimum,
+    # so the adverse variable parts reduce to matrix products
+    base = _apply_factors(permanent, r)
+    maxValues = base + _apply_factors(vPos, rPos) + _apply_factors(vNeg, rNeg)
+    minValues = base + _apply_factors(vPos, rNeg) + _apply_factors(vNeg, rPos)
+
+    contributing = _apply_factors(((permanent != 0) | (variable != 0)).astype(np.float64), valid.astype(np.float64))
+    maxValues[contributing == 0] = np.nan
+    minValues[contributing == 0] = np.nan
+    return maxValues, minValues
+
+def envelope(results:np.ndarray, loadsetIDs:list[int], members:np.ndarray=None) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Evaluate the maximum and minimum envelope of loadset results and the loadset governing each value
+
+    Args:
+        results (np.ndarray): Loadset results of shape (n_loadsets, ...), e.g. loadcase or combination results
+        loadsetIDs (list[int]): Loadset IDs of the results
+        members (np.ndarray, optional): Boolean mask of shape (n_loadsets,) of the loadsets to include. Defaults to None (all loadsets).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Maximum values, minimum values, maximum loadset IDs and minimum loadset IDs, each of shape (...). The governing ID is -1 where no loadset has a result (values are NaN), including when no loadset is included.
+    """
+    loadsetIDs = np.asarray(loadsetIDs, dtype=np.int64)
+    if len(loadsetIDs) != len(results):
+        raise Exception(f"{len(loadsetIDs)} loadset IDs were given for the results of {len(results)} loadsets")
+    if members is not None:
+        members = np.asarray(members, dtype=bool)
+        if members.shape != (len(results),):
+            raise Exception(f"The envelope members must be a boolean mask of shape ({len(results)},), not {members.shape}")
+        results = results[members]
+        loadsetIDs = loadsetIDs[members]
+    if len(results) == 0:
+        # Empty envelope, nothing governs
+        shape = results.shape[1:]
+        return np.full(shape, np.nan), np.full(shape, np.nan), np.full(shape, -1, dtype=np.int64), np.full(shape, -1, dtype=np.int64)
+
+    valid = ~np.isnan(results)
+    anyValid = valid.any(axis=0)
+    iMax = np.where(valid, results, -np.inf).argmax(axis=0)
+    iMin = np.where(valid, results, np.inf).argmin(axis=0)
+
+    maxValues = np.take_along_axis(results, iMax[np.newaxis], axis=0)[0]
+    minValues = np.take_along_axis(results, iMin[np.newaxis], axis=0)[0]
+    maxIDs = np.where(anyValid, loadsetIDs[iMax], -1)
+    minIDs = np.where(anyValid, loadsetIDs[iMin], -1)
+    return maxValues, minValues, maxIDs, minIDs
+
+def envelopes(results:np.ndarray, loadsetIDs:list[int], members:np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Evaluate several envelopes of the same loadset results
+
+    Args:
+        results (np.ndarray): Loadset results of shape (n_loadsets, ...)
+        loadsetIDs (list[int]): Loadset IDs of the results
+        members (np.ndarray): Boolean membership of shape (n_envelopes, n_loadsets), see get_envelope_members
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Maximum values, minimum values, maximum loadset IDs and minimum loadset IDs, each of shape (n_envelopes, ...)
+    """
+    envs = [envelope(results, loadsetIDs, mask) for mask in members]
+    shape = (len(envs),) + results.shape[1:]
+    if len(envs) == 0:
+        return np.empty(shape), np.empty(shape), np.empty(shape, dtype=np.int64), np.empty(shape, dtype=np.int64)
+    return tuple(np.stack(values) for values in zip(*envs))
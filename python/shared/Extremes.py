@@ -0,0 +1,301 @@
+# LUSAS API (LPI) EXAMPLES
+# (https://github.com/LUSAS-Software/LUSAS-API-Examples/)
+#
+# Description:
+# This file contains a query engine for the largest (or smallest) results of a component over many loadsets,
+# e.g. "the 10 nodes with the largest DZ across all ULS combinations", without extracting all results.
+# The maximum and minimum of a results context are returned by LUSAS Modeller with a single call
+# (IFResultsContext.getNodalResultsMaxMin, getGaussResultsMaxMin, getInternalResultsMaxMin or getElementNodalResultsMaxMin),
+# together with the node or element at which they occur.
+# The engine keeps, for each loadset, a queue of partitions of the nodes/elements (contiguous ranges in ID order)
+# ordered by their extreme value. The best partition is popped, its extreme location is reported, and the partition
+# is split at that location into two smaller partitions that are queried in turn, so that only the partitions that
+# can contain the next largest value are narrowed down. Detailed results are read only for the winning locations.
+# The results sets of the contexts are narrowed to a partition by adding cached object sets of a binary tree of ID ranges
+# (built when first needed), so that each node/element object is passed to LUSAS Modeller once rather than once per query.
+#
+# Example:
+#   engine = ExtremesEngine(lusas, "Displacement", "Nodal")
+#   top = engine.top_k(["DZ"], db.getLoadsets("Smart Combinations"), k=10, mode="abs", details=["DX", "DY", "DZ"])
+#   print(top["DZ"].ids, top["DZ"].values, top["DZ"].loadsetIDs)
+
+import heapq
+import itertools
+import numpy as np
+from shared.LPI import *
+from shared.Helpers import parse_id_string
+from shared.Results import NA_VALUE, get_loadset_id
+
+# MaxMin method of IFResultsContext and results array method of IFElement for each location
+_MAX_MIN = {"nodal": "getNodalResultsMaxMin", "gauss": "getGaussResultsMaxMin",
+            "internal": "getInternalResultsMaxMin", "elementnodal": "getElementNodalResultsMaxMin"}
+_ELEMENT_ARRAY = {"gauss": "getGaussResultsArray", "internal": "getInternalResultsArray", "elementnodal": "getNodeResultsArray"}
+
+# Largest number of nodes/elements in an object set of the tree of ID ranges that is created from a list of objects
+LEAF_SIZE = 256
+
+class _Output:
+    # Output argument when pywin32 is not available (e.g. the fake LPI), the LPI sets its value attribute
+    value = None
+
+def _output(kind:str):
+    # Output arguments of the MaxMin methods, passed by reference through pywin32
+    try:
+        import pythoncom
+        import win32com.client
+    except ImportError:
+        return _Output()
+    vt = {"float": pythoncom.VT_R8, "int": pythoncom.VT_I4, "object": pythoncom.VT_DISPATCH}[kind]
+    return win32com.client.VARIANT(pythoncom.VT_BYREF | vt, None if kind == "object" else 0)
+
+def _dispatch(obj):
+    # Objects returned through output arguments are raw IDispatch pointers with pywin32
+    if obj is None or hasattr(obj, "getID"):
+        return obj
+    import win32com.client
+    return win32com.client.Dispatch(obj)
+
+class TopK:
+    """Extreme results of a component over a set of loadsets, in descending order of importance
+
+    Attributes:
+        component (str): Results component
+        mode (str): "max", "min" or "abs"
+        values (np.ndarray): Value at each location
+        loadsetIDs (np.ndarray): Loadset giving the value at each location
+        ids (np.ndarray): Node or element ID of each location
+        points (np.ndarray): 0-based index of the Gauss point, internal point or element node within the results array of the element (-1 for nodal results)
+        details (dict[str, np.ndarray]): Values of the detail components at each location for its loadset
+    """
+
+    def __init__(self, component:str, mode:str, values, loadsetIDs, ids, points, details:dict=None):
+        self.component = component
+        self.mode = mode
+        self.values = np.asarray(values, dtype=np.float64)
+        self.loadsetIDs = np.asarray(loadsetIDs, dtype=np.int64)
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.points = np.asarray(points, dtype=np.int64)
+        self.details = details if details is not None else {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+class ExtremesEngine:
+    """Top-k query engine based on the MaxMin methods of results contexts
+
+    Attributes:
+        entity (str): Results entity (e.g. "Displacement")
+        location (str): "Nodal", "Gauss", "Internal" or "ElementNodal"
+        queries (int): Number of MaxMin calls made
+        arrays (int): Number of element results arrays read for winning elements
+    """
+
+    def __init__(self, modeller:'IFModeller', entity:str, location:str="Nodal", objSet:'IFObjectSet'=None):
+        """
+        Args:
+            modeller (IFModeller): Reference to LUSAS Modeller
+            entity (str): Results entity (e.g. "Displacement", "Force/Moment - Thick Shell")
+            location (str, optional): "Nodal", "Gauss", "Internal" or "ElementNodal". Defaults to "Nodal".
+            objSet (IFObjectSet, optional): Objects to search (the nodes of the elements are used for nodal results). Defaults to None (whole model).
+        """
+        if location.lower() not in _MAX_MIN:
+            raise Exception(f"Unknown results location '{location}', expected 'Nodal', 'Gauss', 'Internal' or 'ElementNodal'")
+        self.lusas = modeller
+        self.entity = entity
+        self.location = location
+        self.objSet = objSet
+        self.queries = 0
+        self.arrays = 0
+        self._nodal = location.lower() == "nodal"
+        self._features = None        # Nodes or elements in ID order
+        self._ids = None
+        self._sets = {}              # (lo, hi) -> IFObjectSet of the features lo:hi (tree of ID ranges)
+        self._contexts = {}          # loadset ID -> [IFResultsContext, calc set, show set, (lo, hi) of the sets]
+        self._pointBase = None       # Number of the first point returned by the MaxMin methods (0 or 1), checked against the results arrays
+
+    def _load_features(self):
+        if self._features is not None:
+            return
+        kind = "Node" if self._nodal else "Element"
+        objSet = self.lusas.newObjectSet()
+        if self.objSet is None:
+            objSet.add(kind)
+        else:
+            objSet.add(self.objSet)
+            if self._nodal:
+                objSet.addLOF("Node")
+        self._ids = np.array(parse_id_string(objSet.getAsString(kind)), dtype=np.int64)
+        self._features = objSet.getObjects(kind)
+        if len(self._features) != len(self._ids):
+            raise Exception(f"The number of {kind.lower()}s does not match their IDs")
+        # The root of the tree of ID ranges (only the nodes or elements)
+        self._sets[(0, len(self._features))] = objSet.keep(kind)
+
+    def _range_set(self, lo:int, hi:int) -> 'IFObjectSet':
+        # Object set of a range of the tree, created from its two halves or, for small ranges, from the objects
+        objSet = self._sets.get((lo, hi))
+        if objSet is None:
+            objSet = self.lusas.newObjectSet()
+            if hi - lo <= LEAF_SIZE:
+                objSet.add(self._features[lo:hi])
+            else:
+                mid = (lo + hi) // 2
+                objSet.add(self._range_set(lo, mid)).add(self._range_set(mid, hi))
+            self._sets[(lo, hi)] = objSet
+        return objSet
+
+    def _cover(self, lo:int, hi:int, nodeLo:int, nodeHi:int, sets:list, objects:list):
+        # Tree ranges within lo:hi, and the objects of the parts of small ranges that are only partly within lo:hi
+        if hi <= nodeLo or nodeHi <= lo:
+            return
+        if lo <= nodeLo and nodeHi <= hi:
+            sets.append(self._range_set(nodeLo, nodeHi))
+        elif nodeHi - nodeLo <= LEAF_SIZE:
+            objects.extend(self._features[max(lo, nodeLo):min(hi, nodeHi)])
+        else:
+            mid = (nodeLo + nodeHi) // 2
+            self._cover(lo, hi, nodeLo, mid, sets, objects)
+            self._cover(lo, hi, mid, nodeHi, sets, objects)
+
+    def _context(self, loadsetID:int) -> list:
+        entry = self._contexts.get(loadsetID)
+        if entry is None:
+            context = self.lusas.newResultsContext(None)
+            context.setActiveLoadset(loadsetID)
+            entry = [context, context.getCalcResultsSet(), context.getShowResultsSet(), None]
+            self._contexts[loadsetID] = entry
+        return entry
+
+    def _query(self, loadsetID:int, component:str, lo:int, hi:int) -> tuple:
+        # Maximum and minimum over the features lo:hi as (value, node or element, point), None where there are no results
+        entry = self._context(loadsetID)
+        context, calcSet, showSet, current = entry
+        if current != (lo, hi):
+            sets, objects = [], []
+            self._cover(lo, hi, 0, len(self._features), sets, objects)
+            for objSet in (calcSet, showSet):
+                objSet.remove("All")
+                for rangeSet in sets:
+                    objSet.add(rangeSet)
+                if objects:
+                    objSet.add(objects)
+            entry[3] = (lo, hi)
+
+        kinds = ["float", "float", "object", "object"] + ([] if self._nodal else ["int", "int"])
+        outputs = [_output(kind) for kind in kinds]
+        getattr(context, _MAX_MIN[self.location.lower()])(self.entity, component, *outputs)
+        self.queries += 1
+
+        values = [outputs[0].value, outputs[1].value]
+        points = [-1, -1] if self._nodal else [outputs[4].value, outputs[5].value]
+        extremes = []
+        for value, feature, point in zip(values, (outputs[2].value, outputs[3].value), points):
+            if feature is None or value is None or value == NA_VALUE:
+                extremes.append(None)
+            else:
+                extremes.append((float(value), feature, int(point)))
+        return tuple(extremes)
+
+    def _row(self, feature) -> int:
+        return int(np.searchsorted(self._ids, _dispatch(feature).getID()))
+
+    def _element_values(self, loadsetID:int, component:str, row:int) -> np.ndarray:
+        # All results of a winning element for its loadset
+        context = self._context(loadsetID)[0]
+        values = getattr(self._features[row], _ELEMENT_ARRAY[self.location.lower()])(self.entity, component, None, context)
+        self.arrays += 1
+        values = np.array(values, dtype=np.float64)
+        values[values == NA_VALUE] = np.nan
+        return values
+
+    def _check_point(self, values:np.ndarray, point:int, value:float):
+        # The points of the results arrays are numbered from 0, the numbering of the MaxMin points is not documented:
+        # find it from the first extreme that identifies it and check that all other extremes agree with it
+        matches = [base for base in (0, 1) if 0 <= point - base < len(values) and np.isclose(values[point - base], value, rtol=1e-12, atol=0.0)]
+        if self._pointBase is None and len(matches) == 1:
+            self._pointBase = matches[0]
+        if self._pointBase is not None and self._pointBase not in matches:
+            raise Exception(f"The {self.location} point {point} returned by the MaxMin method does not match the results array of the element")
+
+    def _top_k(self, component:str, loadsetIDs:list[int], k:int, mode:str, unique:bool) -> list[tuple]:
+        def key(value):
+            return value if mode == "max" else -value if mode == "min" else abs(value)
+
+        heap = []       # (-key, order, loadset, value, row, point, range or None for exact values)
+        order = itertools.count()
+        def push_query(loadsetID, lo, hi):
+            if lo >= hi:
+                return
+            maximum, minimum = self._query(loadsetID, component, lo, hi)
+            candidates = [c for c in ((maximum,) if mode == "max" else (minimum,) if mode == "min" else (maximum, minimum)) if c is not None]
+            if candidates:
+                value, feature, point = max(candidates, key=lambda c: key(c[0]))
+                row = self._row(feature)
+                heapq.heappush(heap, (-key(value), next(order), loadsetID, value, row, point, (lo, hi)))
+
+        for loadsetID in loadsetIDs:
+            push_query(loadsetID, 0, len(self._features))
+
+        results, seen = [], set()
+        while heap and len(results) < k:
+            _, _, loadsetID, value, row, point, bounds = heapq.heappop(heap)
+            if bounds is not None:
+                # The extreme of a partition: split it at its extreme location and narrow down both sides
+                lo, hi = bounds
+                push_query(loadsetID, lo, row)
+                push_query(loadsetID, row + 1, hi)
+                if not self._nodal:
+                    # The other points of the element may also be among the extremes, read them all at once
+                    values = self._element_values(loadsetID, component, row)
+                    self._check_point(values, point, value)
+                    for i, v in enumerate(values):
+                        if not np.isnan(v):
+                            heapq.heappush(heap, (-key(v), next(order), loadsetID, float(v), row, i, None))
+                    continue
+            location = (row, point)
+            if unique and location in seen:
+                continue
+            seen.add(location)
+            results.append((value, loadsetID, row, point))
+        return results
+
+    def top_k(self, components:list[str], loadsets, k:int=10, mode:str="max", unique:bool=True, details:list[str]=None) -> dict[str, TopK]:
+        """Find the locations with the largest (or smallest) results of each component over a set of loadsets
+
+        Args:
+            components (list[str]): Results components to rank (e.g. ["DZ"])
+            loadsets (list): Loadsets (objects or IDs) to search
+            k (int, optional): Number of locations to return per component. Defaults to 10.
+            mode (str, optional): "max" for the largest values, "min" for the smallest values, or "abs" for the largest absolute values. Defaults to "max".
+            unique (bool, optional): Return each location once, with the loadset giving its extreme value. Defaults to True.
+            details (list[str], optional): Components to read at the returned locations for their loadsets. Defaults to None.
+
+        Returns:
+            dict[str, TopK]: Extreme results of each component
+        """
+        if mode not in ("max", "min", "abs"):
+            raise Exception(f"Unknown mode '{mode}', expected 'max', 'min' or 'abs'")
+        self._load_features()
+        loadsetIDs = [get_loadset_id(loadset) for loadset in loadsets]
+
+        top = {}
+        for component in components:
+            results = self._top_k(component, loadsetIDs, k, mode, unique)
+            values = [r[0] for r in results]
+            ids = self._ids[[r[2] for r in results]] if results else []
+            top[component] = TopK(component, mode, values, [r[1] for r in results], ids, [r[3] for r in results],
+                                  self._details(results, details or []))
+        return top
+
+    def _details(self, results:list[tuple], components:list[str]) -> dict[str, np.ndarray]:
+        details = {}
+        for component in components:
+            values = np.full(len(results), np.nan)
+            for i, (_, loadsetID, row, point) in enumerate(results):
+                if self._nodal:
+                    value = self._features[row].getResults(self.entity, component, None, None, self._context(loadsetID)[0])
+                    values[i] = np.nan if value == NA_VALUE else value
+                else:
+                    values[i] = self._element_values(loadsetID, component, row)[point]
+            details[component] = values
+        return details
@@ -0,0 +1,1454 @@
+# LUSAS API (LPI) EXAMPLES
+# (https://github.com/LUSAS-Software/LUSAS-API-Examples/)
+#
+# Description:
+# This file contains an in-process stand-in for a core subset of the LUSAS Modeller LPI, for running and benchmarking
+# scripts and shared helpers without LUSAS (e.g. on Linux or continuous integration machines).
+# The model is held in memory. Every LPI method call is counted and may be delayed by a configurable latency
+# to emulate the round trip of a COM call, so that changes to the number of calls can be measured in call counts and wall time.
+#
+# The following parts of the LPI are represented:
+#  - IFModeller, IFDatabase, IFGeometryData, IFObjectSet, IFSelection
+#  - IFPoint, IFLine, IFSurface, IFVolume (straight lines, coons surfaces, translational and rotational sweeps)
+#  - IFNode, IFElement (created with IFDatabase.createNode / createElement)
+#  - IFDatabase.exportSolver (the node coordinates and element topology sections of the solver datafile only)
+#  - IFLoadcase, IFBasicCombination, IFSmartCombination, IFEnvelope
+#  - IFResultsContext, IFResultsComponentSet (results are generated by a function of the location, see setFakeResults)
+#  - IFPrintResultsWizard, IFGridWindow (tabular text exports of nodal and element results)
+#  - Attributes (assignments are recorded but have no effect on the model)
+# Calls to anything else raise an AttributeError so that missing coverage is obvious.
+#
+# The files written by the fake (IFDatabase.exportSolver, IFResultsComponentSet.dumpToFile and IFGridWindow.saveAllAs)
+# follow the layouts assumed by the readers of Mesh.py, Results.py and PrintResults.py, not files written by LUSAS
+# Modeller. Reading them back only shows that reader and writer agree, not that the readers handle real LUSAS files.
+# See benchmarks/FakeLPI_call_counts.py for the call counts of the batched helpers measured with the fake.
+#
+# Example:
+#   from shared.FakeLPI import get_fake_modeller
+#   lusas = get_fake_modeller(latency=0.0005)
+#   Helpers.initialise(lusas)
+#   ...
+#   print(lusas.callCount(), lusas.calls.most_common(5))
+
+import math
+import os
+import time
+from collections import Counter
+import numpy as np
+
+# Value returned by LUSAS Modeller when a result is not available
+NA_VALUE = 2.2250738585072014e-308
+
+# Element types known to the fake database: (stress type, domain dimension, number of Gauss points, number of internal points)
+ELEMENT_TYPES = {
+    "BMI21": ("Thick 3D Beam", 1, 2, 3),
+    "BMI31": ("Thick 3D Beam", 1, 2, 3),
+    "BTS3": ("Thick 3D Beam", 1, 2, 3),
+    "BM3": ("3D Beam", 1, 2, 3),
+    "QTS4": ("Thick Shell", 2, 4, 0),
+    "QTS8": ("Thick Shell", 2, 4, 0),
+    "TTS3": ("Thick Shell", 2, 1, 0),
+    "QSI4": ("Thin Shell", 2, 4, 0),
+    "HX8": ("Solid", 3, 8, 0),
+    "HX20": ("Solid", 3, 8, 0),
+    "TH4": ("Solid", 3, 1, 0),
+}
+
+# Object type names accepted by IFObjectSet methods and their LPI type codes
+TYPE_CODES = {"point": 1, "line": 2, "surface": 4, "volume": 5, "node": 6, "element": 9}
+
+def _type_name(name:str) -> str:
+    name = str(name).strip().lower()
+    if name.endswith("s") and name[:-1] in TYPE_CODES:
+        name = name[:-1]
+    return name
+
+def default_results(entity:str, component:str, loadsetID:int, location:str, id:int, index:int) -> float:
+    """Default results of the fake database, a simple function of the location that can be checked in tests
+
+    Reactions are only available (not N/A) at nodes with IDs that are multiples of 5.
+    """
+    if entity == "Reaction" and id % 5 != 0:
+        return NA_VALUE
+    return loadsetID * 1000.0 + id + 0.01 * index + 0.001 * (sum(map(ord, component)) % 100)
+
+
+# Methods of the fake objects that are not part of the LPI and therefore not counted as calls
+_UNCOUNTED = {"callCount", "resetCalls", "setFakeResults", "setFakeFilename"}
+
+class FakeDispatch:
+    """Base class of all fake LPI objects. Public method calls are counted and delayed by the modeller latency."""
+
+    _interface = "IFDispatch"
+
+    def __init__(self, modeller:'FakeModeller'):
+        object.__setattr__(self, "_modeller", modeller)
+
+    def __getattribute__(self, name):
+        attr = object.__getattribute__(self, name)
+        if name[0] == "_" or name in _UNCOUNTED or not callable(attr):
+            return attr
+        modeller = object.__getattribute__(self, "_modeller")
+        if modeller is None:
+            return attr
+        interface = object.__getattribute__(self, "_interface")
+        def call(*args, **kwargs):
+            modeller._record(interface, name)
+            return attr(*args, **kwargs)
+        return call
+
+    def __repr__(self):
+        id = self.__dict__.get("_id")
+        return f"<{self._interface}{'' if id is None else ' ' + str(id)}>"
+
+
+######################################################
+## Geometry and mesh
+
+class FakeDatabaseMember(FakeDispatch):
+    _interface = "IFDatabaseMember"
+    _typeName = ""
+
+    def __init__(self, modeller, id:int, name:str=None):
+        super().__init__(modeller)
+        self._id = id
+        self._name = name if name is not None else str(id)
+
+    def getID(self) -> int:
+        return self._id
+
+    def getName(self) -> str:
+        return self._name
+
+    def setName(self, name:str):
+        self._name = name
+        return self
+
+    def getTypeCode(self) -> int:
+        return TYPE_CODES[self._typeName]
+
+    def getAssignments(self, attributeType=None, loadset=None, andAssignedObjects=None, singleLoadcase=None) -> list:
+        return [a for a in self._modeller._db._assignments if self in a._objects and (attributeType is None or a._attribute._type == attributeType)]
+
+class FakePoint(FakeDatabaseMember):
+    _interface = "IFPoint"
+    _typeName = "point"
+
+    def __init__(self, modeller, id:int, xyz):
+        super().__init__(modeller, id)
+        self._xyz = np.array(xyz, dtype=np.float64)
+
+    def getX(self, pDoTrans=None) -> float:
+        return float(self._xyz[0])
+
+    def getY(self, pDoTrans=None) -> float:
+        return float(self._xyz[1])
+
+    def getZ(self, pDoTrans=None) -> float:
+        return float(self._xyz[2])
+
+    def getLOFs(self) -> list:
+        return []
+
+    def getHOFs(self) -> list:
+        return [line for line in self._modeller._db._objects["line"].values() if self in line._points]
+
+class FakeLine(FakeDatabaseMember):
+    _interface = "IFLine"
+    _typeName = "line"
+
+    def __init__(self, modeller, id:int, p1:FakePoint, p2:FakePoint):
+        super().__init__(modeller, id)
+        self._points = [p1, p2]
+
+    def getStartPoint(self) -> FakePoint:
+        return self._points[0]
+
+    def getEndPoint(self) -> FakePoint:
+        return self._points[1]
+
+    def getStartPosition(self) -> list[float]:
+        return self._points[0]._xyz.tolist()
+
+    def getEndPosition(self) -> list[float]:
+        return self._points[1]._xyz.tolist()
+
+    def getLineLength(self) -> float:
+        return float(np.linalg.norm(self._points[1]._xyz - self._points[0]._xyz))
+
+    def getLOFs(self) -> list:
+        return list(self._points)
+
+class FakeSurface(FakeDatabaseMember):
+    _interface = "IFSurface"
+    _typeName = "surface"
+
+    def __init__(self, modeller, id:int, lines:list):
+        super().__init__(modeller, id)
+        self._lines = list(lines)
+
+    def getLOFs(self) -> list:
+        return list(self._lines)
+
+    def _points(self) -> list:
+        points = []
+        for line in self._lines:
+            for p in line._points:
+                if p not in points:
+                    points.append(p)
+        return points
+
+class FakeVolume(FakeDatabaseMember):
+    _interface = "IFVolume"
+    _typeName = "volume"
+
+    def __init__(self, modeller, id:int, surfaces:list):
+        super().__init__(modeller, id)
+        self._surfaces = list(surfaces)
+
+    def getLOFs(self) -> list:
+        return list(self._surfaces)
+
+class FakeNode(FakeDatabaseMember):
+    _interface = "IFNode"
+    _typeName = "node"
+
+    def __init__(self, modeller, id:int, xyz):
+        super().__init__(modeller, id)
+        self._xyz = np.array(xyz, dtype=np.float64)
+
+    def getX(self) -> float:
+        return float(self._xyz[0])
+
+    def getY(self) -> float:
+        return float(self._xyz[1])
+
+    def getZ(self) -> float:
+        return float(self._xyz[2])
+
+    def getElements(self) -> list:
+        return [e for e in self._modeller._db._objects["element"].values() if self in e._nodes]
+
+    def getResults(self, entity, component, units=None, loadcase=None, context=None) -> float:
+        db = self._modeller._db
+        loadsetID = context._loadsetID if context is not None else db._activeLoadsetID
+        return db._results(entity, component, loadsetID, "Nodal", self._id, 0)
+
+class FakeElement(FakeDatabaseMember):
+    _interface = "IFElement"
+    _typeName = "element"
+
+    def __init__(self, modeller, id:int, elementType:str, nodes:list):
+        super().__init__(modeller, id)
+        self._elementType = elementType
+        self._nodes = list(nodes)
+        if elementType in ELEMENT_TYPES:
+            self._stressType, self._dimension, self._nGauss, self._nInternal = ELEMENT_TYPES[elementType]
+        elif len(nodes) == 2:
+            self._stressType, self._dimension, self._nGauss, self._nInternal = ELEMENT_TYPES["BMI21"]
+        elif len(nodes) in (3, 4):
+            self._stressType, self._dimension, self._nGauss, self._nInternal = ELEMENT_TYPES["QTS4"]
+        else:
+            self._stressType, self._dimension, self._nGauss, self._nInternal = ELEMENT_TYPES["HX8"]
+
+    def getNodes(self) -> list:
+        return list(self._nodes)
+
+    def getElementType(self) -> str:
+        return self._elementType
+
+    def getStressType(self) -> str:
+        return self._stressType
+
+    def getDomainDimension(self) -> int:
+        return self._dimension
+
+    def countGaussPoints(self) -> int:
+        return self._nGauss
+
+    def countInternalPoints(self) -> int:
+        return self._nInternal
+
+    def _context_loadset(self, context) -> int:
+        return context._loadsetID if context is not None else self._modeller._db._activeLoadsetID
+
+    def getInternalResults(self, iPoint, entity, component, units=None, loadcase=None, context=None) -> float:
+        return self._modeller._db._results(entity, component, self._context_loadset(context), "Internal", self._id, iPoint)
+
+    def getInternalResultsArray(self, entity, component, units=None, context=None) -> list[float]:
+        db = self._modeller._db
+        return [db._results(entity, component, self._context_loadset(context), "Internal", self._id, i) for i in range(self._nInternal)]
+
+    def getGaussResultsArray(self, entity, component, units=None, context=None) -> list[float]:
+        db = self._modeller._db
+        return [db._results(entity, component, self._context_loadset(context), "Gauss", self._id, i) for i in range(self._nGauss)]
+
+    def getNodeResultsArray(self, entity, component, units=None, context=None) -> list[float]:
+        db = self._modeller._db
+        return [db._results(entity, component, self._context_loadset(context), "ElementNodal", self._id, i) for i in range(len(self._nodes))]
+
+
+######################################################
+## Object sets
+
+class FakeObjectSet(FakeDispatch):
+    _interface = "IFObjectSet"
+
+    def __init__(self, modeller, objects=None):
+        super().__init__(modeller)
+        self._objects = {}    # insertion ordered set of objects
+        if objects:
+            self._add(objects)
+
+    def _add(self, arg):
+        if isinstance(arg, FakeObjectSet):
+            self._objects.update(arg._objects)
+        elif isinstance(arg, FakeDatabaseMember):
+            self._objects[arg] = None
+        elif isinstance(arg, (list, tuple)):
+            for obj in arg:
+                self._add(obj)
+        elif isinstance(arg, str):
+            self._objects.update(dict.fromkeys(self._modeller._db._by_type(arg)))
+        else:
+            raise TypeError(f"Cannot add {arg!r} to an object set")
+
+    def _matches(self, obj, arg, id=None) -> bool:
+        if isinstance(arg, str):
+            name = _type_name(arg)
+            if name == "all":
+                return True
+            if name in TYPE_CODES:
+                matches = obj._typeName == name
+            else:
+                matches = isinstance(obj, FakeElement) and arg in (obj._stressType, obj._elementType)
+            return matches and (id is None or obj._id == id or obj._name == id)
+        if isinstance(arg, (list, tuple)):
+            return any(self._matches(obj, a) for a in arg)
+        if isinstance(arg, FakeObjectSet):
+            return obj in arg._objects
+        return obj is arg
+
+    def _filtered(self, arg1=None, arg2=None) -> list:
+        objects = [obj for obj in self._objects if arg1 is None or str(arg1).lower() == "all" or self._matches(obj, arg1, arg2)]
+        # The LPI returns objects sorted by type and ID
+        return sorted(objects, key=lambda obj: (TYPE_CODES[obj._typeName], obj._id))
+
+    def add(self, arg1, arg2=None, arg3=None, arg4=None, arg5=None) -> 'FakeObjectSet':
+        if isinstance(arg1, str) and arg2 is not None:
+            self._add([obj for obj in self._modeller._db._by_type(arg1) if obj._id == arg2 or obj._name == arg2])
+        else:
+            self._add(arg1)
+        return self
+
+    def remove(self, arg1, arg2=None, arg3=None, arg4=None, arg5=None) -> 'FakeObjectSet':
+        for obj in [obj for obj in self._objects if self._matches(obj, arg1, arg2)]:
+            del self._objects[obj]
+        return self
+
+    def keep(self, arg1, arg2=None, arg3=None, arg4=None, arg5=None) -> 'FakeObjectSet':
+        for obj in [obj for obj in self._objects if not self._matches(obj, arg1, arg2)]:
+            del self._objects[obj]
+        return self
+
+    def exists(self, arg1, arg2=None, arg3=None, arg4=None, arg5=None) -> bool:
+        return len(self._filtered(arg1, arg2)) > 0
+
+    def count(self, arg1=None, arg2=None, arg3=None, arg4=None, arg5=None) -> int:
+        return len(self._filtered(arg1, arg2))
+
+    def getObjects(self, arg1=None, arg2=None, arg3=None, arg4=None, arg5=None) -> list:
+        return self._filtered(arg1, arg2)
+
+    def getObject(self, arg1, arg2=None, arg3=None, arg4=None, arg5=None):
+        objects = self._filtered(arg1, arg2)
+        if len(objects) != 1:
+            raise Exception(f"getObject found {len(objects)} objects of type {arg1}")
+        return objects[0]
+
+    def getAsString(self, type) -> str:
+        # Consecutive IDs are compressed into ranges, e.g. "1T3;7"
+        ids = [obj._id for obj in self._filtered(type)]
+        runs = []
+        for id in ids:
+            if runs and id == runs[-1][1] + 1:
+                runs[-1][1] = id
+            else:
+                runs.append([id, id])
+        return ";".join(str(first) if first == last else f"{first}T{last}" for first, last in runs)
+
+    def addLOF(self, arg1=None, arg2=None) -> 'FakeObjectSet':
+        db = self._modeller._db
+        name = _type_name(arg1) if arg1 is not None else None
+        if name == "element":
+            # Elements of the features in the set
+            for obj in list(self._objects):
+                self._add(db._feature_elements.get(obj, []))
+        elif name == "node":
+            for obj in list(self._objects):
+                if isinstance(obj, FakeElement):
+                    self._add(obj._nodes)
+        else:
+            stack = list(self._objects)
+            while stack:
+                obj = stack.pop()
+                for lof in obj.__class__.getLOFs(obj) if hasattr(obj, "getLOFs") else []:
+                    if lof not in self._objects and (name is None or lof._typeName == name or name not in TYPE_CODES):
+                        self._objects[lof] = None
+                    stack.append(lof)
+        return self
+
+    def addHOF(self, arg1=None, arg2=None) -> 'FakeObjectSet':
+        db = self._modeller._db
+        for hof in [o for t in ("line", "surface", "volume") for o in db._objects[t].values()]:
+            if any(lof in self._objects for lof in hof.__class__.getLOFs(hof)):
+                self._objects[hof] = None
+        return self
+
+    def createLine(self, geomData:'FakeGeometryData') -> 'FakeObjectSet':
+        points = [obj for obj in self._objects if isinstance(obj, FakePoint)]
+        return self._modeller._db._create_lines(points)
+
+    def createSurface(self, geomData:'FakeGeometryData') -> 'FakeObjectSet':
+        db = self._modeller._db
+        lines = [obj for obj in self._objects if isinstance(obj, FakeLine)]
+        if lines:
+            return FakeObjectSet(self._modeller, [db._new("surface", lines)])
+        points = [obj for obj in self._objects if isinstance(obj, FakePoint)]
+        return db._create_surface_from_points(points)
+
+    def createVolume(self, geomData:'FakeGeometryData') -> 'FakeObjectSet':
+        surfaces = [obj for obj in self._objects if isinstance(obj, FakeSurface)]
+        return FakeObjectSet(self._modeller, [self._modeller._db._new("volume", surfaces)])
+
+    def sweep(self, geomData:'FakeGeometryData') -> 'FakeObjectSet':
+        return self._modeller._db._sweep(list(self._objects), geomData._transformation)
+
+    def assignTo(self, *args):
+        raise AttributeError("IFObjectSet.assignTo is not available, assign attributes with IFAttribute.assignTo")
+
+class FakeSelection(FakeObjectSet):
+    _interface = "IFSelection"
+
+
+######################################################
+## Geometry data and attributes
+
+class FakeGeometryData(FakeDispatch):
+    _interface = "IFGeometryData"
+
+    def __init__(self, modeller):
+        super().__init__(modeller)
+        self._coords = []
+        self._options = {}
+        self._transformation = None
+
+    def setAllDefaults(self) -> 'FakeGeometryData':
+        self._coords = []
+        self._options = {}
+        self._transformation = None
+        return self
+
+    def addCoords(self, X, Y=None, Z=None, isGlobal=None) -> 'FakeGeometryData':
+        self._coords.append((float(X), float(Y or 0.0), float(Z or 0.0)))
+        return self
+
+    def setTransformation(self, transAttr=None) -> 'FakeGeometryData':
+        self._transformation = transAttr
+        return self
+
+    def _option(self, name:str):
+        def set_option(*args):
+            self._options[name] = args[0] if len(args) == 1 else args
+            return self
+        set_option.__name__ = name
+        return set_option
+
+    def setCreateMethod(self, method) -> 'FakeGeometryData':
+        return self._option("setCreateMethod")(method)
+
+    def setLowerOrderGeometryType(self, type) -> 'FakeGeometryData':
+        return self._option("setLowerOrderGeometryType")(type)
+
+    def setMaximumDimension(self, dimension) -> 'FakeGeometryData':
+        return self._option("setMaximumDimension")(dimension)
+
+    def sweptArcType(self, bMethod) -> 'FakeGeometryData':
+        return self._option("sweptArcType")(bMethod)
+
+    def setExtractAllVolumes(self) -> 'FakeGeometryData':
+        return self._option("setExtractAllVolumes")(True)
+
+    def useSelectionOrder(self, logical) -> 'FakeGeometryData':
+        return self._option("useSelectionOrder")(logical)
+
+class FakeAttribute(FakeDispatch):
+    _interface = "IFAttribute"
+
+    def __init__(self, modeller, type:str, name:str, id:int, values:dict=None):
+        super().__init__(modeller)
+        self._type = type
+        self._name = name
+        self._id = id
+        self._values = dict(values or {})
+
+    def getName(self) -> str:
+        return self._name
+
+    def getID(self) -> int:
+        return self._id
+
+    def getAttributeType(self) -> str:
+        return self._type
+
+    def setValue(self, name, value, *args):
+        self._values[name] = value
+        return self
+
+    def getValue(self, name, *args):
+        return self._values[name]
+
+    def setSweepType(self, sweepType):
+        self._values["sweepType"] = sweepType
+        return self
+
+    def setHofType(self, hofType):
+        self._values["hofType"] = hofType
+        return self
+
+    def setType(self, type):
+        self._values["type"] = type
+        return self
+
+    def setDimensions(self, names, values):
+        self._values.update(zip(names, values))
+        return self
+
+    def setFromLibrary(self, *args):
+        self._values["library"] = args
+        return self
+
+    def setSurface(self, t, ez=None):
+        self._values["t"] = t
+        self._values["ez"] = ez
+        return self
+
+    def setSpacing(self, *args):
+        self._values["spacing"] = args
+        return self
+
+    def assignTo(self, objects, assignment=None):
+        db = self._modeller._db
+        objSet = objects if isinstance(objects, FakeObjectSet) else FakeObjectSet(None, objects) if isinstance(objects, (list, tuple)) else FakeObjectSet(None, [objects])
+        db._assignments.append(FakeAssignment(self._modeller, self, list(objSet._objects), assignment))
+        return self
+
+class FakeAssignment(FakeDispatch):
+    _interface = "IFAssignment"
+
+    def __init__(self, modeller, attribute=None, objects=None, assignment=None):
+        super().__init__(modeller)
+        self._attribute = attribute
+        self._objects = objects or []
+        self._loadset = assignment._loadset if isinstance(assignment, FakeAssignment) else None
+        self._factor = assignment._factor if isinstance(assignment, FakeAssignment) else 1.0
+
+    def setAllDefaults(self) -> 'FakeAssignment':
+        self._loadset, self._factor = None, 1.0
+        return self
+
+    def setLoadset(self, loadset) -> 'FakeAssignment':
+        self._loadset = loadset
+        return self
+
+    def setLoadFactor(self, factor) -> 'FakeAssignment':
+        self._factor = factor
+        return self
+
+    def getAttribute(self):
+        return self._attribute
+
+
+######################################################
+## Loadsets
+
+class FakeLoadset(FakeDispatch):
+    _interface = "IFLoadset"
+    _typeCode = -1
+
+    def __init__(self, modeller, id:int, name:str, analysis:'FakeAnalysis'=None):
+        super().__init__(modeller)
+        self._id = id
+        self._name = name
+        self._analysis = analysis
+        self._entries = []      # (ID, factor, variable factor)
+        self._assoc = None
+        self._description = ""
+
+    def getID(self) -> int:
+        return self._id
+
+    def getName(self) -> str:
+        return self._name
+
+    def setName(self, name):
+        self._name = name
+        return self
+
+    def getTypeCode(self) -> int:
+        return self._typeCode
+
+    def getIDAndName(self) -> str:
+        return f"{self._id}:{self._name}"
+
+    def getIDAndNameAndDescription(self) -> str:
+        return f"{self._id}:{self._name}" + (f" ({self._description})" if self._description else "")
+
+    def setDescription(self, description=None):
+        self._description = description or ""
+        return self
+
+    def getDescription(self) -> str:
+        return self._description
+
+    def getAnalysis(self):
+        return self._analysis
+
+    def getAssocLoadset(self):
+        return self._assoc
+
+    def setTreeLocation(self, name, initiallyExpanded=None):
+        self._treeLocation = name
+
+    def addGravity(self, gravity):
+        self._gravity = gravity
+        return self
+
+    def _entry_id(self, ID) -> int:
+        return ID.getID() if isinstance(ID, FakeLoadset) else int(ID)
+
+    def getLoadcaseIDs(self) -> list[int]:
+        return [e[0] for e in self._entries]
+
+    def removeEntries(self):
+        self._entries.clear()
+        return self
+
+class FakeLoadcase(FakeLoadset):
+    _interface = "IFLoadcase"
+    _typeCode = 0
+
+class FakeBasicCombination(FakeLoadset):
+    _interface = "IFBasicCombination"
+    _typeCode = 2
+
+    def addEntry(self, factor, ID, resFile=None, eigen=None, harm=None):
+        self._entries.append((self._entry_id(ID), float(factor), 0.0))
+        return self
+
+    def addEntries(self, factors, IDs, resFiles=None, eigens=None, harms=None):
+        for factor, ID in zip(factors, IDs):
+            self._entries.append((self._entry_id(ID), float(factor), 0.0))
+        return self
+
+    def getFactors(self) -> list[float]:
+        return [e[1] for e in self._entries]
+
+class FakeSmartCombination(FakeLoadset):
+    _interface = "IFSmartCombination"
+    _typeCode = 6
+
+    def addEntry(self, factor, variableFactor, ID, resFile=None, eigen=None, harm=None):
+        self._entries.append((self._entry_id(ID), float(factor), float(variableFactor)))
+        return self
+
+    def addEntries(self, factors, variableFactors, IDs, resFiles=None, eigens=None, harms=None):
+        for factor, variableFactor, ID in zip(factors, variableFactors, IDs):
+            self._entries.append((self._entry_id(ID), float(factor), float(variableFactor)))
+        return self
+
+    def getPermanentFactors(self) -> list[float]:
+        return [e[1] for e in self._entries]
+
+    def getVariableFactors(self) -> list[float]:
+        return [e[2] for e in self._entries]
+
+    def setEffects(self, nToConsider, nVariable):
+        self._effects = (int(nToConsider), int(nVariable))
+        return self
+
+    def getNumberToConsider(self) -> int:
+        return getattr(self, "_effects", (0, 0))[0]
+
+    def getNumberVariable(self) -> int:
+        return getattr(self, "_effects", (0, 0))[1]
+
+class FakeEnvelope(FakeLoadset):
+    _interface = "IFEnvelope"
+    _typeCode = 3
+
+    def addEntry(self, ID, resFile=None, eigen=None, harm=None):
+        self._entries.append((self._entry_id(ID), 1.0, 0.0))
+        return self
+
+    def addEntries(self, IDs, resFiles=None, eigens=None, harms=None):
+        for ID in IDs:
+            self._entries.append((self._entry_id(ID), 1.0, 0.0))
+        return self
+
+class FakeAnalysis(FakeDispatch):
+    _interface = "IFAnalysis"
+
+    def __init__(self, modeller, name:str):
+        super().__init__(modeller)
+        self._name = name
+
+    def getName(self) -> str:
+        return self._name
+
+    def isBase(self) -> bool:
+        return self is next(iter(self._modeller._db._analyses.values()))
+
+    def getLoadcases(self) -> list:
+        return [ls for ls in self._modeller._db._loadsets.values() if ls._analysis is self]
+
+    def solve(self, ignoreModified=None) -> int:
+        self._modeller._db._solved = True
+        return 0
+
+
+######################################################
+## Results
+
+class FakeResultsContext(FakeDispatch):
+    _interface = "IFResultsContext"
+
+    def __init__(self, modeller, context:'FakeResultsContext'=None):
+        super().__init__(modeller)
+        self._calcSet = FakeObjectSet(modeller)
+        self._loadsetID = context._loadsetID if context is not None else modeller._db._activeLoadsetID
+        if context is not None:
+            self._calcSet._add(context._calcSet)
+
+    def getCalcResultsSet(self) -> FakeObjectSet:
+        return self._calcSet
+
+    def getShowResultsSet(self) -> FakeObjectSet:
+        return self._calcSet
+
+    def setActiveLoadset(self, ID, resFile=None, eigen=None, harm=None):
+        self._loadsetID = ID.getID() if isinstance(ID, FakeLoadset) else int(ID)
+
+    def getActiveLoadset(self):
+        return self._modeller._db._loadsets.get(self._loadsetID)
+
+    def setResultsTransformGlobal(self):
+        pass
+
+    def _max_min(self, entity, component, location:str, outputs:list):
+        # Sets the value of the output arguments (objects with a value attribute, as the pywin32 by-reference VARIANTs)
+        db = self._modeller._db
+        best = []
+        if location == "Nodal":
+            nodes = self._calcSet.getObjects("Node") if self._calcSet._objects else sorted(db._objects["node"].values(), key=lambda o: o._id)
+            candidates = [(node, 0, db._results(entity, component, self._loadsetID, "Nodal", node._id, 0)) for node in nodes]
+        else:
+            elements = self._calcSet.getObjects("Element") if self._calcSet._objects else sorted(db._objects["element"].values(), key=lambda o: o._id)
+            candidates = []
+            for element in elements:
+                count = {"ElementNodal": len(element._nodes), "Gauss": element._nGauss, "Internal": element._nInternal}[location]
+                candidates.extend((element, i, db._results(entity, component, self._loadsetID, location, element._id, i)) for i in range(count))
+        candidates = [c for c in candidates if c[2] != NA_VALUE]
+        if not candidates:
+            for output in outputs:
+                output.value = None
+            outputs[0].value = outputs[1].value = NA_VALUE
+            return
+        maximum = max(candidates, key=lambda c: c[2])
+        minimum = min(candidates, key=lambda c: c[2])
+        values = [maximum[2], minimum[2], maximum[0], minimum[0], maximum[1], minimum[1]]
+        for output, value in zip(outputs, values):
+            output.value = value
+
+    def getNodalResultsMaxMin(self, entity, component, maxValue, minValue, maxNode, minNode):
+        self._max_min(entity, component, "Nodal", [maxValue, minValue, maxNode, minNode])
+
+    def getGaussResultsMaxMin(self, entity, component, maxValue, minValue, maxElement, minElement, maxGaussPoint, minGaussPoint):
+        self._max_min(entity, component, "Gauss", [maxValue, minValue, maxElement, minElement, maxGaussPoint, minGaussPoint])
+
+    def getInternalResultsMaxMin(self, entity, component, maxValue, minValue, maxElement, minElement, maxInternalPoint, minInternalPoint):
+        self._max_min(entity, component, "Internal", [maxValue, minValue, maxElement, minElement, maxInternalPoint, minInternalPoint])
+
+    def getElementNodalResultsMaxMin(self, entity, component, maxValue, minValue, maxElement, minElement, maxNode, minNode):
+        self._max_min(entity, component, "ElementNodal", [maxValue, minValue, maxElement, minElement, maxNode, minNode])
+
+class FakeResultsComponentSet(FakeDispatch):
+    _interface = "IFResultsComponentSet"
+
+    def __init__(self, modeller, entity:str, component:str, location:str, context:FakeResultsContext=None):
+        super().__init__(modeller)
+        self._entity = entity
+        self._components = [component]
+        self._location = location
+        self._loadsetID = context._loadsetID if context is not None else modeller._db._activeLoadsetID
+        # Results are captured for the objects of the context when the set is created
+        self._calcSet = FakeObjectSet(None, context._calcSet) if context is not None and len(context._calcSet._objects) > 0 else None
+        self._calcIDs = None if self._calcSet is None else {(o._typeName, o._id) for o in self._calcSet._objects}
+
+    def _value(self, componentNumber, location, id, index) -> float:
+        if self._calcIDs is not None and ("node" if location == "Nodal" else "element", id) not in self._calcIDs:
+            return NA_VALUE
+        return self._modeller._db._results(self._entity, self._components[componentNumber], self._loadsetID, location, id, index)
+
+    def getComponentNumber(self, component) -> int:
+        if component not in self._components:
+            self._components.append(component)
+        return self._components.index(component)
+
+    def getFirstComponentNumber(self) -> int:
+        return 0
+
+    def countComponents(self) -> int:
+        return len(self._components)
+
+    def getEntityName(self) -> str:
+        return self._entity
+
+    def getComponentName(self, componentNumber) -> str:
+        return self._components[componentNumber]
+
+    def getContinuousResults(self, componentNumber, node, units, loadcase) -> float:
+        return self._value(componentNumber, "Nodal", node._id, 0)
+
+    def getElementNodalResultsArray(self, componentNumber, element, units) -> list[float]:
+        return [self._value(componentNumber, "ElementNodal", element._id, i) for i in range(len(element._nodes))]
+
+    def getAveragedResultsArray(self, componentNumber, element, units) -> list[float]:
+        return [self._value(componentNumber, "Nodal", node._id, 0) for node in element._nodes]
+
+    def getGaussResultsArray(self, componentNumber, element, units) -> list[float]:
+        return [self._value(componentNumber, "Gauss", element._id, i) for i in range(element._nGauss)]
+
+    def getInternalResultsArray(self, componentNumber, element, units) -> list[float]:
+        return [self._value(componentNumber, "Internal", element._id, i) for i in range(element._nInternal)]
+
+    def dumpToFile(self, filename1, filename2, filename3, locationType, fileType=None):
+        # Same layout as read by Results.read_results_dump
+        db = self._modeller._db
+        location = locationType
+        records = []
+        if location.lower() == "nodal":
+            nodes = self._calcSet.getObjects("Node") if self._calcSet is not None else sorted(db._objects["node"].values(), key=lambda o: o._id)
+            for node in nodes:
+                records.append((node._id, 0, [self._value(c, "Nodal", node._id, 0) for c in range(len(self._components))]))
+        else:
+            elements = self._calcSet.getObjects("Element") if self._calcSet is not None else sorted(db._objects["element"].values(), key=lambda o: o._id)
+            for element in elements:
+                count = {"elementnodal": len(element._nodes), "gauss": element._nGauss, "internal": element._nInternal}[location.lower()]
+                for i in range(count):
+                    records.append((element._id, i, [self._value(c, location, element._id, i) for c in range(len(self._components))]))
+        with open(filename1, "w") as f:
+            f.write(f"Entity = {self._entity}\n")
+            f.write(f"Components = {', '.join(self._components)}\n")
+            f.write(f"Location Type = {location}\n")
+            f.write(f"Loadset = {self._loadsetID}\n")
+            f.write(f"Body File = {os.path.basename(filename2)}\n")
+            f.write(f"Error File = {os.path.basename(filename3)}\n")
+        dtype = np.dtype([("id", "<i4"), ("index", "<i4"), ("values", "<f8", (len(self._components),))])
+        body = np.zeros(len(records), dtype=dtype)
+        for i, (id, index, values) in enumerate(records):
+            body[i] = (id, index, values)
+        body.tofile(filename2)
+        open(filename3, "w").close()
+
+
+class FakePrintResultsWizard(FakeAttribute):
+    _interface = "IFPrintResultsWizard"
+
+    def __init__(self, modeller, type:str, name:str, id:int, values:dict=None):
+        super().__init__(modeller, type, name, id, values)
+        self._values.update(entity=None, components=[], location="Nodal", loadcasesOption="Active", loadcases=[], showCoordinates=False)
+
+    def _set(self, name:str, value) -> 'FakePrintResultsWizard':
+        self._values[name] = value
+        return self
+
+    def setResultsType(self, type):
+        return self._set("type", type)
+
+    def setResultsOrder(self, order):
+        return self._set("order", order)
+
+    def setResultsContent(self, content):
+        return self._set("content", content)
+
+    def setResultsEntity(self, entity):
+        return self._set("entity", entity)
+
+    def setResultsLocation(self, location):
+        return self._set("location", location)
+
+    def setComponents(self, components):
+        return self._set("components", list(components))
+
+    def setExtent(self, selectionType, groupName):
+        return self._set("extent", selectionType)
+
+    def setLoadcasesOption(self, loadcasesOption):
+        return self._set("loadcasesOption", loadcasesOption)
+
+    def setLoadcases(self, lcArrayID, lcArrayResFileID, lcArrayEigenvalueID, lcArrayHarmonicID):
+        return self._set("loadcases", [int(id) for id in lcArrayID])
+
+    def showCoordinates(self, isShow):
+        return self._set("showCoordinates", bool(isShow))
+
+    def showExtremeResults(self, isShow):
+        return self._set("showExtremeResults", isShow)
+
+    def setSlice(self, isSlice):
+        return self._set("slice", isSlice)
+
+    def setAllowDerived(self, allow):
+        return self._set("allowDerived", allow)
+
+    def setDisplayNow(self, displayNow):
+        return self._set("displayNow", displayNow)
+
+    def setSigFig(self, nSigFig, trailingZeros=None):
+        return self._set("sigFig", nSigFig)
+
+    def setDecimalPlaces(self, nDeciPlaces):
+        return self._set("decimalPlaces", nDeciPlaces)
+
+    def setThreshold(self, value):
+        return self._set("threshold", value)
+
+    def setResultsTransformNone(self):
+        self._values["transform"] = "None"
+
+    def setResultsTransformGlobal(self):
+        self._values["transform"] = "Global"
+
+    def setResultsTransformElement(self):
+        self._values["transform"] = "Element"
+
+    def showResults(self, once=None) -> 'FakeGridWindow':
+        return FakeGridWindow(self._modeller, self, bool(once))
+
+class FakeGridWindow(FakeDispatch):
+    _interface = "IFGridWindow"
+
+    def __init__(self, modeller, prw:FakePrintResultsWizard, once:bool):
+        super().__init__(modeller)
+        self._prw = prw
+        self._once = once
+
+    def _loadsets(self) -> list:
+        db = self._modeller._db
+        option = str(self._prw._values["loadcasesOption"]).lower()
+        if option == "active":
+            return [db._loadsets[db._activeLoadsetID]]
+        if option == "all":
+            return sorted(db._loadsets.values(), key=lambda ls: ls._id)
+        return [db._loadsets[id] for id in self._prw._values["loadcases"]]
+
+    def _write_tab(self, f, loadset):
+        # One tab of a tabular PRW: entity and loadcase titles, a header row and a row per results location
+        db = self._modeller._db
+        values = self._prw._values
+        entity, components, location = values["entity"], values["components"], values["location"]
+        coordinates = ["X", "Y", "Z"] if values["showCoordinates"] else []
+        f.write(f"{entity}\nLoadcase: {loadset._id}:{loadset._name}\n")
+        if location.lower() == "nodal":
+            f.write("\t".join(["Node"] + coordinates + components) + "\n")
+            for node in sorted(db._objects["node"].values(), key=lambda o: o._id):
+                xyz = [f"{v:.6E}" for v in node._xyz] if coordinates else []
+                results = [db._results(entity, c, loadset._id, "Nodal", node._id, 0) for c in components]
+                f.write("\t".join([str(node._id)] + xyz + ["N/A" if r == NA_VALUE else f"{r:.6E}" for r in results]) + "\n")
+            return
+        point = {"elementnodal": "Node", "gauss": "Gauss Point", "internal": "Point"}[location.lower()]
+        f.write("\t".join(["Element", point] + coordinates + components) + "\n")
+        for element in sorted(db._objects["element"].values(), key=lambda o: o._id):
+            count = {"elementnodal": len(element._nodes), "gauss": element._nGauss, "internal": element._nInternal}[location.lower()]
+            for i in range(count):
+                pointID = element._nodes[i]._id if location.lower() == "elementnodal" else i + 1
+                xyz = [f"{v:.6E}" for v in np.mean([n._xyz for n in element._nodes], axis=0)] if coordinates else []
+                results = [db._results(entity, c, loadset._id, location, element._id, i) for c in components]
+                f.write("\t".join([str(element._id), str(pointID)] + xyz + ["N/A" if r == NA_VALUE else f"{r:.6E}" for r in results]) + "\n")
+
+    def saveAs(self, fileName, fileType) -> 'FakeGridWindow':
+        with open(fileName, "w") as f:
+            self._write_tab(f, self._loadsets()[0])
+        return self
+
+    def saveAllAs(self, fileName, fileType) -> 'FakeGridWindow':
+        with open(fileName, "w") as f:
+            for loadset in self._loadsets():
+                self._write_tab(f, loadset)
+        return self
+
+    def close(self):
+        if self._once:
+            # Temporary attributes are deleted when their window is closed
+            db = self._modeller._db
+            db._attributes = {key: a for key, a in db._attributes.items() if a is not self._prw}
+
+
+######################################################
+## Database and modeller
+
+class FakeDatabase(FakeDispatch):
+    _interface = "IFDatabase"
+
+    _classes = {"point": FakePoint, "line": FakeLine, "surface": FakeSurface, "volume": FakeVolume, "node": FakeNode, "element": FakeElement}
+
+    def __init__(self, modeller):
+        super().__init__(modeller)
+        self._objects = {name: {} for name in TYPE_CODES}
+        self._nextID = Counter()
+        self._feature_elements = {}
+        self._attributes = {}           # (type, name) -> FakeAttribute
+        self._assignments = []
+        self._loadsets = {}             # ID -> FakeLoadset
+        self._analyses = {"Analysis 1": FakeAnalysis(modeller, "Analysis 1")}
+        self._activeLoadsetID = 1
+        self._resultsFunction = default_results
+        self._batches = []
+        self._meshLock = False
+        self._solved = False
+        self._filename = ""
+
+    # Internal helpers (not counted as LPI calls)
+    def _new(self, typeName:str, *args):
+        self._nextID[typeName] += 1
+        obj = self._classes[typeName](self._modeller, self._nextID[typeName], *args)
+        self._objects[typeName][obj._id] = obj
+        return obj
+
+    def _by_type(self, name:str) -> list:
+        name = _type_name(name)
+        if name in self._objects:
+            return list(self._objects[name].values())
+        return [e for e in self._objects["element"].values() if name in (e._stressType.lower(), e._elementType.lower())]
+
+    def _results(self, entity, component, loadsetID, location, id, index) -> float:
+        return self._resultsFunction(entity, component, loadsetID, location, id, index)
+
+    def _create_lines(self, points:list) -> FakeObjectSet:
+        lines = [self._new("line", p1, p2) for p1, p2 in zip(points[:-1], points[1:])]
+        return FakeObjectSet(self._modeller, lines)
+
+    def _create_surface_from_points(self, points:list) -> FakeObjectSet:
+        lines = [self._new("line", p1, p2) for p1, p2 in zip(points, points[1:] + points[:1])]
+        surface = self._new("surface", lines)
+        return FakeObjectSet(self._modeller, [surface] + lines)
+
+    def _sweep(self, objects:list, attr:FakeAttribute) -> FakeObjectSet:
+        kind = attr._values["kind"]
+        created = []
+        copies = {}
+        def transform(xyz):
+            if kind == "translation":
+                return xyz + np.array(attr._values["vector"], dtype=np.float64)
+            angle = math.radians(attr._values["angle"])
+            origin = np.array(attr._values["origin"], dtype=np.float64)
+            i, j = {"yz": (1, 2), "xz": (2, 0), "xy": (0, 1)}[attr._values["plane"]]
+            r = xyz - origin
+            rotated = r.copy()
+            rotated[i] = r[i] * math.cos(angle) - r[j] * math.sin(angle)
+            rotated[j] = r[i] * math.sin(angle) + r[j] * math.cos(angle)
+            return origin + rotated
+        def copy_of(obj):
+            if obj not in copies:
+                if isinstance(obj, FakePoint):
+                    copies[obj] = self._new("point", transform(obj._xyz))
+                elif isinstance(obj, FakeLine):
+                    copies[obj] = self._new("line", copy_of(obj._points[0]), copy_of(obj._points[1]))
+                else:
+                    copies[obj] = self._new("surface", [copy_of(line) for line in obj._lines])
+                created.append(copies[obj])
+            return copies[obj]
+        swept = {}
+        def sweep_of(obj):
+            if obj not in swept:
+                if isinstance(obj, FakePoint):
+                    swept[obj] = self._new("line", obj, copy_of(obj))
+                elif isinstance(obj, FakeLine):
+                    p1, p2 = obj._points
+                    swept[obj] = self._new("surface", [obj, sweep_of(p2), copy_of(obj), sweep_of(p1)])
+                else:
+                    swept[obj] = self._new("volume", [obj, copy_of(obj)] + [sweep_of(line) for line in obj._lines])
+                created.append(swept[obj])
+            return swept[obj]
+        for obj in objects:
+            if isinstance(obj, (FakePoint, FakeLine, FakeSurface)):
+                sweep_of(obj)
+        return FakeObjectSet(self._modeller, created)
+
+    def _attribute(self, type:str, name:str, cls=FakeAttribute, **values) -> FakeAttribute:
+        self._nextID[type] += 1
+        attr = cls(self._modeller, type, name, self._nextID[type], values)
+        self._attributes[(type, name)] = attr
+        return attr
+
+    def _new_loadset(self, cls, name:str, analysis=None, forceID=None) -> FakeLoadset:
+        id = int(forceID) if forceID else max(self._loadsets, default=0) + 1
+        loadset = cls(self._modeller, id, name, analysis)
+        self._loadsets[id] = loadset
+        return loadset
+
+    def _new_max_min(self, cls, name:str) -> FakeLoadset:
+        maxLoadset = self._new_loadset(cls, f"{name} (Max)")
+        minLoadset = self._new_loadset(cls, f"{name} (Min)")
+        maxLoadset._assoc, minLoadset._assoc = minLoadset, maxLoadset
+        minLoadset._entries = maxLoadset._entries
+        return maxLoadset
+
+    # Fake only (not part of the LPI)
+    def setFakeResults(self, function):
+        """Set the function that returns the results of the fake database.
+        The function arguments are (entity, component, loadsetID, location, id, index)"""
+        self._resultsFunction = function
+
+    def setFakeFilename(self, filename:str):
+        """Set the path returned by getDBFilename, as if the model had been saved there"""
+        self._filename = filename
+
+    # Geometry
+    def createPoint(self, geomData:FakeGeometryData) -> FakeObjectSet:
+        return FakeObjectSet(self._modeller, [self._new("point", xyz) for xyz in geomData._coords])
+
+    def createLine(self, geomData:FakeGeometryData) -> FakeObjectSet:
+        points = [self._new("point", xyz) for xyz in geomData._coords]
+        lines = self._create_lines(points)
+        return lines.add(points)
+
+    def createSurface(self, geomData:FakeGeometryData) -> FakeObjectSet:
+        points = [self._new("point", xyz) for xyz in geomData._coords]
+        return self._create_surface_from_points(points).add(points)
+
+    def getObjects(self, arg1, arg2=None, arg3=None, arg4=None, arg5=None) -> list:
+        return FakeObjectSet(None, self._by_type(arg1)).getObjects(arg1, arg2)
+
+    def getObject(self, arg1, arg2=None, arg3=None, arg4=None, arg5=None):
+        return FakeObjectSet(None, self._by_type(arg1)).getObject(arg1, arg2)
+
+    def count(self, arg1, arg2=None, arg3=None, arg4=None, arg5=None) -> int:
+        return len(self._by_type(arg1))
+
+    def getLargestPointID(self) -> int:
+        return max(self._objects["point"], default=0)
+
+    def getLargestLineID(self) -> int:
+        return max(self._objects["line"], default=0)
+
+    def getLargestSurfaceID(self) -> int:
+        return max(self._objects["surface"], default=0)
+
+    def getLargestNodeID(self) -> int:
+        return max(self._objects["node"], default=0)
+
+    def getLargestElementID(self) -> int:
+        return max(self._objects["element"], default=0)
+
+    # Mesh
+    def createNode(self, x, y, z, data=None) -> FakeNode:
+        return self._new("node", (x, y, z))
+
+    def createElement(self, lusasElementName, nodes, elementData=None, unused=None) -> FakeElement:
+        nodes = [n if isinstance(n, FakeNode) else self._objects["node"][int(n)] for n in nodes]
+        return self._new("element", lusasElementName, nodes)
+
+    def exportSolver(self, data, options=None) -> int:
+        # Only the node coordinates and element topology sections of a solver datafile
+        with open(data, "w") as f:
+            f.write("C Fake LUSAS solver datafile\n")
+            f.write("NODE COORDINATES CARTESIAN\n")
+            for node in sorted(self._objects["node"].values(), key=lambda o: o._id):
+                f.write(f"{node._id:>8d} {node._xyz[0]:>24.16E} {node._xyz[1]:>24.16E} {node._xyz[2]:>24.16E}\n")
+            types = {}
+            for element in sorted(self._objects["element"].values(), key=lambda o: o._id):
+                types.setdefault(element._elementType, []).append(element)
+            for elementType, elements in types.items():
+                f.write(f"{elementType} ELEMENT TOPOLOGY\n")
+                for element in elements:
+                    f.write(f"{element._id:>8d} " + " ".join(f"{node._id:>8d}" for node in element._nodes) + "\n")
+            f.write("END\n")
+        return 0
+
+    def setMeshLock(self, lock):
+        self._meshLock = lock
+
+    def isMeshLocked(self) -> bool:
+        return self._meshLock
+
+    def updateMesh(self):
+        pass
+
+    def resetMesh(self):
+        pass
+
+    # Attributes
+    def createTranslationTransAttr(self, name, vector) -> FakeAttribute:
+        return self._attribute("Transformation", name, kind="translation", vector=list(vector))
+
+    def createXYRotationTransAttr(self, name, angle, origin) -> FakeAttribute:
+        return self._attribute("Transformation", name, kind="rotation", plane="xy", angle=angle, origin=list(origin))
+
+    def createXZRotationTransAttr(self, name, angle, origin) -> FakeAttribute:
+        return self._attribute("Transformation", name, kind="rotation", plane="xz", angle=angle, origin=list(origin))
+
+    def createYZRotationTransAttr(self, name, angle, origin) -> FakeAttribute:
+        return self._attribute("Transformation", name, kind="rotation", plane="yz", angle=angle, origin=list(origin))
+
+    def createParametricSection(self, name) -> FakeAttribute:
+        return self._attribute("Parametric Section", name)
+
+    def createGeometricLine(self, name) -> FakeAttribute:
+        return self._attribute("Line Geometric", name)
+
+    def createGeometricSurface(self, name) -> FakeAttribute:
+        return self._attribute("Surface Geometric", name)
+
+    def createIsotropicMaterial(self, name, E, nu, rho=None, alpha=None, *args) -> FakeAttribute:
+        return self._attribute("Material", name, E=E, nu=nu, rho=rho, alpha=alpha)
+
+    def createMeshLine(self, name, *args) -> FakeAttribute:
+        return self._attribute("Mesh", name)
+
+    def createMeshSurface(self, name, *args) -> FakeAttribute:
+        return self._attribute("Mesh", name)
+
+    def createSupportStructural(self, name, *args) -> FakeAttribute:
+        return self._attribute("Support", name)
+
+    def createLoadingConcentrated(self, name, *args) -> FakeAttribute:
+        return self._attribute("Loading", name)
+
+    def createLoadingGlobalDistributed(self, name, *args) -> FakeAttribute:
+        return self._attribute("Loading", name)
+
+    def createPrintResultsWizard(self, name) -> FakePrintResultsWizard:
+        return self._attribute("Print Results Wizard", name, FakePrintResultsWizard)
+
+    def deleteAttribute(self, attr, *args):
+        self._attributes = {key: a for key, a in self._attributes.items() if a is not attr}
+
+    def existsAttribute(self, type, name) -> bool:
+        return (type, name) in self._attributes
+
+    def getAttribute(self, type, name):
+        return self._attributes[(type, name)]
+
+    def getAttributes(self, type) -> list:
+        return [a for (t, _), a in self._attributes.items() if t == type]
+
+    # Analyses and loadsets
+    def createAnalysisStructural(self, name, *args) -> FakeAnalysis:
+        self._analyses[name] = FakeAnalysis(self._modeller, name)
+        return self._analyses[name]
+
+    def existsAnalysis(self, name) -> bool:
+        return name in self._analyses
+
+    def getAnalysis(self, name) -> FakeAnalysis:
+        return self._analyses[name]
+
+    def getAnalyses(self) -> list:
+        return list(self._analyses.values())
+
+    def createLoadcase(self, name, analysisName=None, forceID=None, keepAnalysisAssignments=None) -> FakeLoadcase:
+        analysis = self._analyses[analysisName] if analysisName else next(iter(self._analyses.values()))
+        return self._new_loadset(FakeLoadcase, name, analysis, forceID)
+
+    def createCombinationBasic(self, name, analysisType=None, forceID=None) -> FakeBasicCombination:
+        return self._new_loadset(FakeBasicCombination, name, None, forceID)
+
+    def createCombinationSmart(self, name, analysisType=None, forceIDMax=None, forceIDMin=None) -> FakeSmartCombination:
+        return self._new_max_min(FakeSmartCombination, name)
+
+    def createEnvelope(self, name, analysisType=None, forceIDMax=None, forceIDMin=None) -> FakeEnvelope:
+        return self._new_max_min(FakeEnvelope, name)
+
+    def _select_loadsets(self, IDs) -> list:
+        if isinstance(IDs, str):
+            kind = IDs.lower()
+            loadsets = sorted(self._loadsets.values(), key=lambda ls: ls._id)
+            types = {"all": None, "loadcase": (0,), "loadcases": (0,), "basic combinations": (2,), "smart combinations": (6,), "envelopes": (3,), "combinations": (2, 6)}
+            if kind not in types:
+                raise Exception(f"Unknown loadset type '{IDs}'")
+            return [ls for ls in loadsets if types[kind] is None or ls._typeCode in types[kind]]
+        return [self._find_loadset(ID) for ID in IDs]
+
+    def _find_loadset(self, ID) -> FakeLoadset:
+        if isinstance(ID, FakeLoadset):
+            return ID
+        if isinstance(ID, str):
+            for loadset in self._loadsets.values():
+                if loadset._name == ID:
+                    return loadset
+            raise Exception(f"Loadset '{ID}' does not exist")
+        return self._loadsets[int(ID)]
+
+    def getLoadsets(self, IDs, resFiles=None, eigens=None, harms=None) -> list:
+        return self._select_loadsets(IDs)
+
+    def countLoadsets(self, IDs, resFiles=None, eigens=None, harms=None) -> int:
+        return len(self._select_loadsets(IDs))
+
+    def getLoadset(self, ID, resFile=None, eigen=None, harm=None) -> FakeLoadset:
+        return self._find_loadset(ID)
+
+    def getLoadsetByName(self, name) -> FakeLoadset:
+        return self._find_loadset(str(name))
+
+    def existsLoadset(self, ID, resFile=None, eigen=None, harm=None) -> bool:
+        if isinstance(ID, str):
+            return any(ls._name == ID for ls in self._loadsets.values())
+        return int(ID) in self._loadsets
+
+    def deleteLoadsets(self, IDs, resFiles=None, eigens=None, harms=None):
+        for loadset in self._select_loadsets(IDs):
+            self._loadsets.pop(loadset._id, None)
+
+    def setActiveLoadset(self, ID, *args):
+        self._activeLoadsetID = ID.getID() if isinstance(ID, FakeLoadset) else int(ID)
+
+    # Results
+    def getResultsComponentSet(self, entity, component, locn, context=None) -> FakeResultsComponentSet:
+        return FakeResultsComponentSet(self._modeller, entity, component, locn, context)
+
+    def openAllResults(self, scanOutputFiles=None, skipOutOfDate=None):
+        pass
+
+    def closeAllResults(self):
+        pass
+
+    # Model file
+    def getDBFilename(self) -> str:
+        return self._filename
+
+    def getDBFilenameNoExtension(self) -> str:
+        return os.path.splitext(self._filename)[0]
+
+    # Command batches
+    def beginCommandBatch(self, label, isUndoable=None) -> bool:
+        self._batches.append(label)
+        # True would mean the batch was rejected
+        return False
+
+    def closeCommandBatch(self):
+        if not self._batches:
+            raise Exception("No command batch is open")
+        self._batches.pop()
+
+class FakeModeller(FakeDispatch):
+    """Stand-in for IFModeller. Use get_fake_modeller() to create one.
+
+    Attributes:
+        latency (float): Delay in seconds added to every LPI method call
+        calls (Counter): Number of calls per "Interface.method"
+    """
+    _interface = "IFModeller"
+
+    def __init__(self, latency:float=0.0):
+        super().__init__(None)
+        self.latency = latency
+        self.calls = Counter()
+        self._db = FakeDatabase(self)
+        self._geometryData = FakeGeometryData(self)
+        self._selection = FakeSelection(self)
+        self._uiEnabled = True
+        self._manualRefresh = False
+        # Count the calls of this object too
+        object.__setattr__(self, "_modeller", self)
+
+    def _record(self, interface:str, method:str):
+        self.calls[f"{interface}.{method}"] += 1
+        if self.latency > 0:
+            # Busy wait, sleeping is not precise enough for sub-millisecond latencies
+            end = time.perf_counter() + self.latency
+            while time.perf_counter() < end:
+                pass
+
+    # Fake only (not part of the LPI, not counted)
+    def callCount(self) -> int:
+        """Total number of LPI calls made"""
+        return sum(self.calls.values())
+
+    def resetCalls(self):
+        """Reset the call counters"""
+        self.calls.clear()
+
+    # LPI
+    def db(self) -> FakeDatabase:
+        return self._db
+
+    def database(self) -> FakeDatabase:
+        return self._db
+
+    def getDatabase(self) -> FakeDatabase:
+        return self._db
+
+    def existsDatabase(self) -> bool:
+        return True
+
+    def geometryData(self) -> FakeGeometryData:
+        return self._geometryData
+
+    def newGeometryData(self) -> FakeGeometryData:
+        return FakeGeometryData(self)
+
+    def newObjectSet(self) -> FakeObjectSet:
+        return FakeObjectSet(self)
+
+    def newAssignment(self) -> FakeAssignment:
+        return FakeAssignment(self)
+
+    def assignment(self) -> FakeAssignment:
+        return FakeAssignment(self)
+
+    def selection(self) -> FakeSelection:
+        return self._selection
+
+    def getSelection(self) -> FakeSelection:
+        return self._selection
+
+    def newResultsContext(self, context) -> FakeResultsContext:
+        return FakeResultsContext(self, context)
+
+    def getMajorVersionNumber(self) -> int:
+        return 22
+
+    def getMinorVersionNumber(self) -> int:
+        return 0
+
+    def enableUI(self, enable):
+        self._uiEnabled = bool(enable)
+
+    def isUIEnabled(self) -> bool:
+        return self._uiEnabled
+
+    def setManualRefresh(self, manual):
+        self._manualRefresh = bool(manual)
+
+    def isManualRefresh(self) -> bool:
+        return self._manualRefresh
+
+    def setVisible(self, visible):
+        pass
+
+    def updateAllViews(self):
+        pass
+
+def get_fake_modeller(latency:float=0.0) -> FakeModeller:
+    """Create an in-memory stand-in for LUSAS Modeller with an empty model
+
+    Args:
+        latency (float, optional): Delay in seconds added to every LPI method call, emulating the COM round trip. Defaults to 0.
+
+    Returns:
+        FakeModeller: The fake modeller (can be used wherever an IFModeller is expected)
+    """
+    return FakeModeller(latency)
@@ -9,7 +9,14 @@
 # The library must be initialised with the a reference to LUSAS Modeller before using these functions.
 
 import math
+import re
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import ExitStack
+import numpy as np
 from shared.LPI import *
+from shared.LPI import IFObjectSet, IFPoint, IFLine, IFSurface, IFVolume, IFLoadcase, IFAnalysis
 
 def initialise(modeller:'IFModeller'):
     global lusas
@@ -36,6 +43,185 @@ def create_point(x:float, y:float, z:float) -> 'IFPoint':
     # Note that createPoint returns and IFObjectSet from which we can get the point.
     return lusas.database().createPoint(geom_data).getObject("Point")
 
+def parse_id_string(ids:str) -> list[int]:
+    """Parse the IDs returned by IFObjectSet.getAsString (e.g. "1T50I2;100" is the odd IDs from 1 to 49 and 100)
+
+    Args:
+        ids (str): IDs in the form of a string
+
+    Returns:
+        list[int]: IDs in ascending order
+    """
+    result = []
+    for token in re.split(r"[;,\s]+", ids.strip()):
+        if not token:
+            continue
+        match = re.fullmatch(r"(\d+)(?:T(\d+)(?:I(\d+))?)?", token, re.IGNORECASE)
+        if match is None:
+            raise Exception(f"Cannot parse '{token}' in the ID string '{ids}'")
+        first, last, step = match.groups()
+        if last is None:
+            result.append(int(first))
+        else:
+            result.extend(range(int(first), int(last) + 1, int(step) if step else 1))
+    return sorted(result)
+
+def create_points(coords, idsOnly:bool=False) -> list['IFPoint']:
+    """Helper function to create many points from coordinates with a single createPoint call
+
+    Args:
+        coords (array_like): Coordinates of shape (N, 3)
+        idsOnly (bool, optional): Return the point IDs instead of the point objects, which avoids getting N objects from LUSAS. Defaults to False.
+
+    Returns:
+        list[IFPoint]: Points in the order of the coordinates, or an np.ndarray of their IDs if idsOnly is True
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    if coords.ndim != 2 or coords.shape[1] != 3:
+        raise Exception(f"Point coordinates must be an array of shape (N, 3), got {coords.shape}")
+    if len(coords) == 0:
+        return np.empty(0, dtype=np.int64) if idsOnly else []
+
+    geom_data = lusas.geometryData().setAllDefaults()
+    geom_data.setLowerOrderGeometryType("coordinates")
+    for x, y, z in coords.tolist():
+        geom_data.addCoords(x, y, z)
+    objSet = lusas.database().createPoint(geom_data)
+
+    # The new points are numbered in the order of the coordinates and the object set returns them sorted by ID
+    if idsOnly:
+        result = np.array(parse_id_string(objSet.getAsString("Point")), dtype=np.int64)
+    else:
+        result = objSet.getObjects("Point")
+    if len(result) != len(coords):
+        raise Exception(f"{len(coords)} coordinates created {len(result)} points, coincident points may have been merged")
+    return result
+
+class PointRegistry:
+    """Registry of created points for reusing a point when a new one is requested within a tolerance of it.
+    Points are looked up in a spatial hash of cells of the tolerance size, so no coordinates are read from LUSAS,
+    and the points that do not exist yet are created in bulk with create_points.
+
+    Example:
+        registry = PointRegistry(tolerance=1e-4)
+        p1, p2 = registry.get_points([[0, 0, 0], [5, 0, 0]])
+        p3 = registry.get_point(5, 0, 0)    # p2
+
+    Attributes:
+        tolerance (float): Distance within which points are considered coincident
+        created (int): Number of points created
+        hits (int): Number of requested points that already existed
+    """
+
+    _NEIGHBOURS = [(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)]
+
+    def __init__(self, tolerance:float=1e-6):
+        """
+        Args:
+            tolerance (float, optional): Distance within which points are considered coincident. Defaults to 1e-6.
+        """
+        if tolerance <= 0:
+            raise Exception("The tolerance must be positive")
+        self.tolerance = tolerance
+        self.created = 0
+        self.hits = 0
+        self._cells = {}      # cell -> indices of the points in the cell
+        self._coords = []
+        self._points = []
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, xyz:tuple) -> tuple[int, int, int]:
+        return (math.floor(xyz[0] / self.tolerance), math.floor(xyz[1] / self.tolerance), math.floor(xyz[2] / self.tolerance))
+
+    def _find(self, xyz:tuple) -> int:
+        # A point within the tolerance is in the same cell or in a neighbouring one
+        ci, cj, ck = self._cell(xyz)
+        tol2 = self.tolerance * self.tolerance
+        for di, dj, dk in self._NEIGHBOURS:
+            for index in self._cells.get((ci + di, cj + dj, ck + dk), ()):
+                x, y, z = self._coords[index]
+                if (x - xyz[0])**2 + (y - xyz[1])**2 + (z - xyz[2])**2 <= tol2:
+                    return index
+        return -1
+
+    def _insert(self, xyz:tuple, point) -> int:
+        index = len(self._coords)
+        self._coords.append(xyz)
+        self._points.append(point)
+        self._cells.setdefault(self._cell(xyz), []).append(index)
+        return index
+
+    def register(self, points:list['IFPoint'], coords=None):
+        """Add existing points to the registry
+
+        Args:
+            points (list[IFPoint]): Existing points
+            coords (array_like, optional): Coordinates of the points of shape (N, 3). Defaults to None (read from LUSAS).
+        """
+        if coords is None:
+            coords = [(p.getX(), p.getY(), p.getZ()) for p in points]
+        for point, xyz in zip(points, np.asarray(coords, dtype=np.float64).tolist()):
+            if self._find(tuple(xyz)) < 0:
+                self._insert(tuple(xyz), point)
+
+    def get_points(self, coords) -> list['IFPoint']:
+        """Get the points at coordinates, creating the ones that do not exist yet with a single createPoint call
+
+        Args:
+            coords (array_like): Coordinates of shape (N, 3)
+
+        Returns:
+            list[IFPoint]: Points in the order of the coordinates
+        """
+        coords = np.asarray(coords, dtype=np.float64)
+        if coords.ndim != 2 or coords.shape[1] != 3:
+            raise Exception(f"Point coordinates must be an array of shape (N, 3), got {coords.shape}")
+
+        indices = []
+        newIndices = []
+        for xyz in map(tuple, coords.tolist()):
+            index = self._find(xyz)
+            if index < 0:
+                # Coincident coordinates within the request also share a point
+                index = self._insert(xyz, None)
+                newIndices.append(index)
+            else:
+                self.hits += 1
+            indices.append(index)
+
+        if newIndices:
+            try:
+                created = create_points([self._coords[i] for i in newIndices])
+            except Exception:
+                self._remove(newIndices)
+                raise
+            for index, point in zip(newIndices, created):
+                self._points[index] = point
+            self.created += len(newIndices)
+        return [self._points[i] for i in indices]
+
+    def get_point(self, x:float, y:float, z:float) -> 'IFPoint':
+        """Get the point at coordinates, creating it if it does not exist yet
+
+        Args:
+            x (float): Global X coordinate
+            y (float): Global Y coordinate
+            z (float): Global Z coordinate
+
+        Returns:
+            IFPoint: Point in the IFDatabase
+        """
+        return self.get_points([[x, y, z]])[0]
+
+    def _remove(self, indices:list[int]):
+        # Remove points that could not be created (always the last ones inserted)
+        for index in sorted(indices, reverse=True):
+            self._cells[self._cell(self._coords[index])].remove(index)
+            del self._coords[index]
+            del self._points[index]
+
 def create_line_by_coordinates(x1:float, y1:float, z1:float, x2:float, y2:float, z2:float,) -> 'IFLine':
     """Helper function to create a line from coordinates
 
@@ -104,6 +290,137 @@ def create_line(p1:list[float], p2:list[float]) -> 'IFLine':
     # Create the line, get the line objects from the returned object set
     return lusas.database().createLine(geom_data).getObject("Line")
 
+def _chain_segments(starts:list, ends:list) -> list[list[int]]:
+    """Group segments into chains where each segment starts at the end of the previous one
+
+    Args:
+        starts (list): Hashable key of the start of each segment
+        ends (list): Hashable key of the end of each segment
+
+    Returns:
+        list[list[int]]: Segment indices of each chain. A chain does not visit the same key twice.
+    """
+    following = {}
+    for i, start in enumerate(starts):
+        following.setdefault(start, []).append(i)
+    endKeys = set(ends)
+    used = [False] * len(starts)
+
+    # Start the chains from the segments no other segment leads to, then from the remaining ones (closed loops)
+    heads = [i for i in range(len(starts)) if starts[i] not in endKeys]
+    chains = []
+    for i in heads + list(range(len(starts))):
+        if used[i]:
+            continue
+        chain = [i]
+        used[i] = True
+        visited = {starts[i], ends[i]}
+        while True:
+            candidates = following.get(ends[chain[-1]], ())
+            following_segment = next((j for j in candidates if not used[j] and ends[j] not in visited), None)
+            if following_segment is None:
+                break
+            chain.append(following_segment)
+            used[following_segment] = True
+            visited.add(ends[following_segment])
+        chains.append(chain)
+    return chains
+
+def create_polyline(vertices) -> list['IFLine']:
+    """Helper function to create straight lines through consecutive vertices with a single createLine call
+
+    Args:
+        vertices (array_like): Coordinates of the vertices of shape (M, 3)
+
+    Returns:
+        list[IFLine]: The M-1 lines in the order of the vertices
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    if vertices.ndim != 2 or vertices.shape[1] != 3 or len(vertices) < 2:
+        raise Exception(f"Polyline vertices must be an array of shape (M, 3) with M >= 2, got {vertices.shape}")
+
+    geom_data = lusas.geometryData().setAllDefaults()
+    geom_data.setCreateMethod("straight")
+    geom_data.setLowerOrderGeometryType("coordinates")
+    for x, y, z in vertices.tolist():
+        geom_data.addCoords(x, y, z)
+    # The new lines are numbered along the polyline and the object set returns them sorted by ID
+    lines = lusas.database().createLine(geom_data).getObjects("Line")
+    if len(lines) != len(vertices) - 1:
+        raise Exception(f"{len(vertices)} vertices created {len(lines)} lines, coincident vertices are not supported")
+    return lines
+
+def create_lines(segments, decimals:int=9) -> list['IFLine']:
+    """Helper function to create many straight lines from coordinates with as few createLine calls as possible.
+    Segments that start where another one ends are joined into polylines that are created with a single call each.
+
+    Args:
+        segments (array_like): Start and end coordinates of each line of shape (N, 2, 3)
+        decimals (int, optional): Number of decimals to which the coordinates must match to join two segments. Defaults to 9.
+
+    Returns:
+        list[IFLine]: Lines in the order of the segments
+    """
+    segments = np.asarray(segments, dtype=np.float64)
+    if segments.ndim != 3 or segments.shape[1:] != (2, 3):
+        raise Exception(f"Line segments must be an array of shape (N, 2, 3), got {segments.shape}")
+
+    keys = [tuple(map(tuple, segment)) for segment in np.round(segments, decimals).tolist()]
+    chains = _chain_segments([key[0] for key in keys], [key[1] for key in keys])
+
+    lines = [None] * len(segments)
+    for chain in chains:
+        vertices = np.vstack([segments[chain[0], 0], segments[chain, 1]])
+        for i, line in zip(chain, create_polyline(vertices)):
+            lines[i] = line
+    return lines
+
+def create_lines_from_points(pairs:list[tuple['IFPoint', 'IFPoint']]) -> list['IFLine']:
+    """Helper function to create many straight lines between existing points with as few createLine calls as possible.
+    Pairs that start at the end point of another pair are joined into polylines that are created with a single call each.
+
+    Args:
+        pairs (list[tuple[IFPoint, IFPoint]]): Start and end point of each line
+
+    Returns:
+        list[IFLine]: Lines in the order of the pairs
+    """
+    points = {}
+    indices = []
+    for p1, p2 in pairs:
+        i1 = points.setdefault(p1.getID(), (len(points), p1))[0]
+        i2 = points.setdefault(p2.getID(), (len(points), p2))[0]
+        indices.append((i1, i2))
+    return _create_lines_between([p for _, p in points.values()], indices)
+
+def _create_lines_between(pnts:list['IFPoint'], pairs:list[tuple[int, int]]) -> list['IFLine']:
+    """Create straight lines between points given by their indices, one createLine call per chain of lines
+
+    Args:
+        pnts (list[IFPoint]): Points
+        pairs (list[tuple[int, int]]): Indices of the start and end point of each line
+
+    Returns:
+        list[IFLine]: Lines in the order of the pairs
+    """
+    chains = _chain_segments([pair[0] for pair in pairs], [pair[1] for pair in pairs])
+
+    geom_data = lusas.geometryData().setAllDefaults()
+    geom_data.setCreateMethod("straight").setLowerOrderGeometryType("points")
+    # Lines are created between consecutive points in the order they are added to the object set
+    geom_data.useSelectionOrder(True)
+
+    lines = [None] * len(pairs)
+    for chain in chains:
+        obs = lusas.newObjectSet()
+        obs.add([pnts[pairs[chain[0]][0]]] + [pnts[pairs[i][1]] for i in chain])
+        created = obs.createLine(geom_data).getObjects("Line")
+        if len(created) != len(chain):
+            raise Exception(f"{len(chain) + 1} points created {len(created)} lines")
+        for i, line in zip(chain, created):
+            lines[i] = line
+    return lines
+
 def create_surface_by_coordinates(x:list[float], y:list[float], z:list[float]) -> IFSurface:
     """Helper function to create a surface from coordinates
 
@@ -123,6 +440,52 @@ def create_surface_by_coordinates(x:list[float], y:list[float], z:list[float]) -
     surf : IFSurface = lusas.db().createSurface(geometry_data).getObjects("Surface")[0]
     return surf
 
+def create_surfaces(points, quads=None) -> np.ndarray:
+    """Helper function to create many coons surfaces that share their points and lines.
+    The points are created with a single createPoint call and the lines with a createLine call per row/column of edges,
+    so each surface only needs a createSurface call from its 4 existing lines.
+
+    Args:
+        points (array_like): Structured grid of points of shape (ny, nx, 3), or point coordinates of shape (P, 3) if quads is given
+        quads (array_like, optional): Point indices of the 4 corners of each surface of shape (Q, 4), in order around the surface. Defaults to None (surfaces between the grid points).
+
+    Returns:
+        np.ndarray: Surfaces of shape (ny-1, nx-1) aligned with the grid cells, or of shape (Q,) in the order of the quads
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if quads is None:
+        if points.ndim != 3 or points.shape[2] != 3 or points.shape[0] < 2 or points.shape[1] < 2:
+            raise Exception(f"Grid points must be an array of shape (ny, nx, 3) with ny, nx >= 2, got {points.shape}")
+        ny, nx = points.shape[:2]
+        index = np.arange(ny * nx).reshape(ny, nx)
+        quads = np.stack([index[:-1, :-1], index[:-1, 1:], index[1:, 1:], index[1:, :-1]], axis=-1).reshape(-1, 4)
+        shape = (ny - 1, nx - 1)
+        points = points.reshape(-1, 3)
+    else:
+        quads = np.asarray(quads, dtype=np.int64)
+        if quads.ndim != 2 or quads.shape[1] != 4:
+            raise Exception(f"Quads must be an array of shape (Q, 4), got {quads.shape}")
+        shape = (len(quads),)
+
+    pnts = create_points(points)
+
+    # Lines of the unique edges, shared by neighbouring surfaces
+    edges = {}
+    for quad in quads.tolist():
+        for a, b in zip(quad, quad[1:] + quad[:1]):
+            edges.setdefault((min(a, b), max(a, b)), (a, b))
+    keys = list(edges)
+    lines = dict(zip(keys, _create_lines_between(pnts, list(edges.values()))))
+
+    geom_data = lusas.geometryData().setAllDefaults()
+    geom_data.setCreateMethod("coons")
+    geom_data.setLowerOrderGeometryType("lines")
+    surfaces = np.empty(len(quads), dtype=object)
+    for i, quad in enumerate(quads.tolist()):
+        quadLines = [lines[(min(a, b), max(a, b))] for a, b in zip(quad, quad[1:] + quad[:1])]
+        surfaces[i] = lusas.newObjectSet().add(quadLines).createSurface(geom_data).getObject("Surface")
+    return surfaces.reshape(shape)
+
 def create_volume_by_surfaces(surfaces:list[IFSurface]) -> IFVolume:
     """Helper function to create a volume from surfaces
 
@@ -143,64 +506,67 @@ def create_volume_by_surfaces(surfaces:list[IFSurface]) -> IFVolume:
     vlm : IFVolume = surfsObj.createVolume(geometry_data).getObjects("Volume")[0]
     return vlm
 
-def sweep_points(pnts:list[IFPoint], vector: list[float]) -> list[IFLine]:
+def sweep_points(pnts:list[IFPoint], vector: list[float], pool:'TransformationPool'=None) -> list[IFLine]:
     """
     Sweeps the given points in the specified direction to create lines.
 
     Args:
         pnts (list): List of points to be swept
         vector (list): Direction vector for the sweep
+        pool (TransformationPool, optional): Pool reusing the transformation attribute across sweeps. Defaults to None.
 
     Returns:
         list: List of lines created by sweeping the points
     """
     try:
         myObj = lusas.newObjectSet().add(pnts)
-        lines : list[IFLine] = sweep_Ext(myObj, vector, "Line").getObjects("Lines")
+        lines : list[IFLine] = sweep_Ext(myObj, vector, "Line", pool).getObjects("Lines")
     except Exception as e:
         print(f"Error sweeping points: {str(e)}")
         return []
     return lines
 
-def sweep_lines(lines:list[IFLine], vector: list[float]) -> list[IFSurface]:
+def sweep_lines(lines:list[IFLine], vector: list[float], pool:'TransformationPool'=None) -> list[IFSurface]:
     """
     Sweeps the given lines in the specified direction to create surfaces.
 
     Args:
         lines (list): List of lines to be swept
         vector (list): Direction vector for the sweep
+        pool (TransformationPool, optional): Pool reusing the transformation attribute across sweeps. Defaults to None.
 
     Returns:
         list: List of surfaces created by sweeping the lines
     """
     try:
         myObj = lusas.newObjectSet().add(lines)
-        surfs : list[IFSurface] = sweep_Ext(myObj, vector, "Surface").getObjects("Surfaces")
+        surfs : list[IFSurface] = sweep_Ext(myObj, vector, "Surface", pool).getObjects("Surfaces")
     except Exception as e:
         print(f"Error sweeping lines: {str(e)}")
         return []
     return surfs
 
-def sweep_surfaces(surfs:list[IFSurface], vector: list[float]) -> list[IFVolume]:
+def sweep_surfaces(surfs:list[IFSurface], vector: list[float], pool:'TransformationPool'=None) -> list[IFVolume]:
     """
     Sweeps the given surfaces in the specified direction to create volumes.
 
     Args:
         surfs (list): List of surfaces to be swept
         vector (list): Direction vector for the sweep
+        pool (TransformationPool, optional): Pool reusing the transformation attribute across sweeps. Defaults to None.
 
     Returns:
         list: List of volumes created by sweeping the surfaces
     """
     try:
         myObj = lusas.newObjectSet().add(surfs)
-        vlms : list[IFVolume] = sweep_Ext(myObj, vector, "Volume").getObjects("Volumes")
+        vlms : list[IFVolume] = sweep_Ext(myObj, vector, "Volume", pool).getObjects("Volumes")
     except Exception as e:
         print(f"Error sweeping surfaces: {str(e)}")
         return []
     return vlms
 
-def sweep_Ext(trgtObjSet:IFObjectSet, vector: list[float], hofType:str):
+def sweep_Ext(trgtObjSet:IFObjectSet, vector: list[float], hofType:str, pool:'TransformationPool'=None):
     """
     Sweeps the given object set in the specified direction to create a new object set.
 
@@ -208,28 +574,36 @@ def sweep_Ext(trgtObjSet:IFObjectSet, vector: list[float], hofType:str):
         trgtObjSet (IFObjectSet): The object set to be swept
         vector (list): Direction vector for the sweep
         hofType (str): Type of the object to be created ("Point", "Line", "Surface", "Volume")
+        pool (TransformationPool, optional): Pool reusing the transformation attribute across sweeps. Defaults to None (a temporary attribute is created and deleted).
 
     Returns:
         IFObjectSet: The new object set created by sweeping the original object set
     """
+    if pool is not None:
+        return trgtObjSet.sweep(pool.translation(vector, hofType)[1])
+
+    attr, geomData = _create_translation_sweep("Temp_SweepTranslation", vector, hofType, "straight")
+    objSet = trgtObjSet.sweep(geomData)
+    lusas.db().deleteAttribute(attr)
+
+    return objSet
+
+def _create_translation_sweep(title:str, vector:list[float], hofType:str, sweepType:str) -> tuple['IFTransformationAttr', 'IFGeometryData']:
     types = ["Point", "Line", "Surface", "Volume"]
     MaximumDimension = types.index(hofType)
 
-    attr = lusas.db().createTranslationTransAttr("Temp_SweepTranslation", vector)
-    attr.setSweepType("straight")
+    attr = lusas.db().createTranslationTransAttr(title, list(vector))
+    attr.setSweepType(sweepType)
     attr.setHofType(hofType)
 
     geomData = lusas.newGeometryData()
     geomData.setMaximumDimension(MaximumDimension)
     geomData.setTransformation(attr)
-    geomData.sweptArcType("straight")
+    geomData.sweptArcType(sweepType)
 
-    objSet = trgtObjSet.sweep(geomData)
-    lusas.db().deleteAttribute(attr)
+    return attr, geomData
 
-    return objSet
-
-def sweep_points_rotationally(pnts:list[IFPoint], degrees : float, origin: list[float] = [0, 0, 0], aboutAxis : str = "z") -> list[IFLine]:
+def sweep_points_rotationally(pnts:list[IFPoint], degrees : float, origin: list[float] = [0, 0, 0], aboutAxis : str = "z", pool:'TransformationPool'=None) -> list[IFLine]:
     """
     Sweeps the given points in the specified degrees to create lines.
     
@@ -238,19 +612,20 @@ def sweep_points_rotationally(pnts:list[IFPoint], degrees : float, origin: list[
         degrees (float): Degrees for the sweep
         origin (list): Origin point for the sweep
         aboutAxis (str): Axis of rotation ("x", "y", "z")
+        pool (TransformationPool, optional): Pool reusing the transformation attribute across sweeps. Defaults to None.
 
     Returns:
         list: List of lines created by sweeping the points
     """
     try:
         myObj = lusas.newObjectSet().add(pnts)
-        lines : list[IFLine] = sweep_rotationally_Ext(myObj, origin, "Line", degrees, aboutAxis).getObjects("Lines")
+        lines : list[IFLine] = sweep_rotationally_Ext(myObj, origin, "Line", degrees, aboutAxis, pool).getObjects("Lines")
     except Exception as e:
         print(f"Error sweeping points: {str(e)}")
         return []
     return lines
 
-def sweep_lines_rotationally(lines:list[IFLine], degrees : float, origin: list[float] = [0, 0, 0], aboutAxis : str = "z") -> list[IFSurface]:
+def sweep_lines_rotationally(lines:list[IFLine], degrees : float, origin: list[float] = [0, 0, 0], aboutAxis : str = "z", pool:'TransformationPool'=None) -> list[IFSurface]:
     """
     Sweeps the given lines in the specified degrees to create surfaces.
 
@@ -259,19 +634,20 @@ def sweep_lines_rotationally(lines:list[IFLine], degrees : float, origin: list[f
         degrees (float): Degrees for the sweep
         origin (list): Origin point for the sweep
         aboutAxis (str): Axis of rotation ("x", "y", "z")
+        pool (TransformationPool, optional): Pool reusing the transformation attribute across sweeps. Defaults to None.
 
     Returns:
         list: List of surfaces created by sweeping the lines
     """
     try:
         myObj = lusas.newObjectSet().add(lines)
-        surfs : list[IFSurface] = sweep_rotationally_Ext(myObj, origin, "Surface", degrees, aboutAxis).getObjects("Surfaces")
+        surfs : list[IFSurface] = sweep_rotationally_Ext(myObj, origin, "Surface", degrees, aboutAxis, pool).getObjects("Surfaces")
     except Exception as e:
         print(f"Error sweeping lines: {str(e)}")
         return []
     return surfs
 
-def sweep_surfaces_rotationally(surfs:list[IFSurface], degrees : float, origin: list[float] = [0, 0, 0], aboutAxis : str = "z") -> list[IFVolume]:
+def sweep_surfaces_rotationally(surfs:list[IFSurface], degrees : float, origin: list[float] = [0, 0, 0], aboutAxis : str = "z", pool:'TransformationPool'=None) -> list[IFVolume]:
     """
     Sweeps the given surfaces in the specified degrees to create volumes.
 
@@ -280,19 +656,20 @@ def sweep_surfaces_rotationally(surfs:list[IFSurface], degrees : float, origin:
         degrees (float): Degrees for the sweep
         origin (list): Origin point for the sweep
         aboutAxis (str): Axis of rotation ("x", "y", "z")
+        pool (TransformationPool, optional): Pool reusing the transformation attribute across sweeps. Defaults to None.
 
     Returns:
         list: List of volumes created by sweeping the surfaces
     """
     try:
         myObj = lusas.newObjectSet().add(surfs)
-        vlms : list[IFVolume] = sweep_rotationally_Ext(myObj, origin, "Volume", degrees, aboutAxis).getObjects("Volumes")
+        vlms : list[IFVolume] = sweep_rotationally_Ext(myObj, origin, "Volume", degrees, aboutAxis, pool).getObjects("Volumes")
     except Exception as e:
         print(f"Error sweeping surfaces: {str(e)}")
         return []
     return vlms
 
-def sweep_rotationally_Ext(trgtObjSet:IFObjectSet, origin:list, hofType:str, degree:float, aboutAxis:str=None):
+def sweep_rotationally_Ext(trgtObjSet:IFObjectSet, origin:list, hofType:str, degree:float, aboutAxis:str=None, pool:'TransformationPool'=None):
     """
     Sweeps the given object set in a rotational manner to create a new object set.
 
@@ -302,37 +679,357 @@ def sweep_rotationally_Ext(trgtObjSet:IFObjectSet, origin:list, hofType:str, deg
         hofType (str): Type of the object to be created ("Point", "Line", "Surface", "Volume")
         degree (float): Degrees for the sweep
         aboutAxis (str): Axis of rotation ("x", "y", "z")
+        pool (TransformationPool, optional): Pool reusing the transformation attribute across sweeps. Defaults to None (a temporary attribute is created and deleted).
 
     Returns:
         IFObjectSet: The new object set created by sweeping the original object set
     """
+    if pool is not None:
+        return trgtObjSet.sweep(pool.rotation(degree, origin, aboutAxis, hofType)[1])
+
+    attr, geomData = _create_rotation_sweep("Temp_SweepRotation", degree, origin, aboutAxis, hofType, "minorArc")
+    objSet = trgtObjSet.sweep(geomData)
+    lusas.db().deleteAttribute(attr)
+
+    return objSet
+
+def _create_rotation_sweep(title:str, degree:float, origin:list[float], aboutAxis:str, hofType:str, sweepType:str) -> tuple['IFTransformationAttr', 'IFGeometryData']:
     types = ["Point", "Line", "Surface", "Volume"]
     MaximumDimension = types.index(hofType)
 
     if aboutAxis is None:
         aboutAxis = "z"
 
-    title = "Temp_SweepRotation"
     if aboutAxis.lower() == "x":
-        attr = lusas.db().createYZRotationTransAttr(title, degree, origin)
+        attr = lusas.db().createYZRotationTransAttr(title, degree, list(origin))
     elif aboutAxis.lower() == "y":
-        attr = lusas.db().createXZRotationTransAttr(title, degree, origin)
+        attr = lusas.db().createXZRotationTransAttr(title, degree, list(origin))
     else:
-        attr = lusas.db().createXYRotationTransAttr(title, degree, origin)
+        attr = lusas.db().createXYRotationTransAttr(title, degree, list(origin))
 
-    attr.setSweepType("minorArc")
+    attr.setSweepType(sweepType)
     attr.setHofType(hofType)
 
     geomData = lusas.newGeometryData()
     geomData.setMaximumDimension(MaximumDimension)
     geomData.setTransformation(attr)
-    geomData.sweptArcType("minorArc")
+    geomData.sweptArcType(sweepType)
 
-    objSet = trgtObjSet.sweep(geomData)
-    lusas.db().deleteAttribute(attr)
+    return attr, geomData
 
-    return objSet
+class TransformationPool:
+    """Pool of the transformation attributes used for sweeping, so that sweeps with the same transformation reuse one attribute.
+    The attributes are deleted by clear(), or at the end of a with block:
 
+        with TransformationPool() as pool:
+            for lines in groups:
+                sweep_lines(lines, [0, 0, 1], pool=pool)
+
+    Attributes:
+        created (int): Number of attributes created
+        hits (int): Number of times an existing attribute was reused
+    """
+
+    def __init__(self, decimals:int=9):
+        """
+        Args:
+            decimals (int, optional): Number of decimals to which vectors, angles and origins must match to reuse an attribute. Defaults to 9.
+        """
+        self.decimals = decimals
+        self.created = 0
+        self.hits = 0
+        self._entries = {}    # (kind, vector or angle, origin, axis, sweep type, hof type) -> (attribute, geometry data)
+
+    def __enter__(self) -> 'TransformationPool':
+        return self
+
+    def __exit__(self, *exc):
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _round(self, values) -> tuple:
+        return tuple(round(float(v), self.decimals) + 0.0 for v in values)
+
+    def _get(self, key:tuple, create) -> tuple['IFTransformationAttr', 'IFGeometryData']:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.created += 1
+            entry = self._entries[key] = create(f"Temp_SweepPool {self.created}")
+        else:
+            self.hits += 1
+        return entry
+
+    def translation(self, vector:list[float], hofType:str, sweepType:str="straight") -> tuple['IFTransformationAttr', 'IFGeometryData']:
+        """Get the translation attribute and the geometry data to sweep with it
+
+        Args:
+            vector (list): Direction vector for the sweep
+            hofType (str): Type of the object to be created ("Point", "Line", "Surface", "Volume")
+            sweepType (str, optional): Sweep type of the attribute. Defaults to "straight".
+
+        Returns:
+            tuple[IFTransformationAttr, IFGeometryData]: Attribute and geometry data, shared by all sweeps with the same transformation
+        """
+        key = ("translation", self._round(vector), None, None, sweepType, hofType)
+        return self._get(key, lambda title: _create_translation_sweep(title, vector, hofType, sweepType))
+
+    def rotation(self, degrees:float, origin:list[float]=[0, 0, 0], aboutAxis:str="z", hofType:str="Line", sweepType:str="minorArc") -> tuple['IFTransformationAttr', 'IFGeometryData']:
+        """Get the rotation attribute and the geometry data to sweep with it
+
+        Args:
+            degrees (float): Degrees for the sweep
+            origin (list): Origin point for the sweep
+            aboutAxis (str): Axis of rotation ("x", "y", "z")
+            hofType (str): Type of the object to be created ("Point", "Line", "Surface", "Volume")
+            sweepType (str, optional): Sweep type of the attribute. Defaults to "minorArc".
+
+        Returns:
+            tuple[IFTransformationAttr, IFGeometryData]: Attribute and geometry data, shared by all sweeps with the same transformation
+        """
+        aboutAxis = (aboutAxis or "z").lower()
+        key = ("rotation", self._round([degrees]), self._round(origin), aboutAxis, sweepType, hofType)
+        return self._get(key, lambda title: _create_rotation_sweep(title, degrees, origin, aboutAxis, hofType, sweepType))
+
+    def sweep_grouped(self, sweeps:list[tuple[list['IFDatabaseMember'], tuple]]) -> list['IFObjectSet']:
+        """Sweep objects grouped by transformation, with a single IFObjectSet.sweep call for all the objects sharing a transformation
+
+        Args:
+            sweeps (list[tuple[list[IFDatabaseMember], tuple]]): Objects to sweep and their transformation as returned by translation() or rotation()
+
+        Returns:
+            list[IFObjectSet]: Objects created by each group sweep, in the order the transformations first appear
+        """
+        groups = {}
+        for objects, transformation in sweeps:
+            groups.setdefault(id(transformation), (transformation, []))[1].append(objects)
+        results = []
+        for (attr, geomData), objectLists in groups.values():
+            objSet = lusas.newObjectSet()
+            for objects in objectLists:
+                objSet.add(objects)
+            results.append(objSet.sweep(geomData))
+        return results
+
+    def clear(self):
+        """Delete all attributes of the pool"""
+        for attr, _ in self._entries.values():
+            lusas.db().deleteAttribute(attr)
+        self._entries.clear()
+
+
+class FastMode:
+    """Context manager speeding up the interaction with LUSAS Modeller for a block of commands.
+    On entry the user interface is disabled, views are set to manual refresh, the mesh is locked and a command batch is started.
+    On exit, even if an exception is raised, the command batch is closed, the mesh is updated once and the previous state is restored.
+
+    Example:
+        with FastMode("Create deck"):
+            ...
+        print(list(FastMode.timings))
+
+    Attributes:
+        timings (deque[tuple[str, float]]): Label and duration in seconds of the last MAX_TIMINGS completed blocks (shared by all instances, see reset_timings)
+        elapsed (float): Duration in seconds of the block
+        meshTime (float): Duration in seconds of the deferred mesh update
+    """
+
+    MAX_TIMINGS = 1000
+    timings = deque(maxlen=MAX_TIMINGS)
+    _depth = 0
+
+    @classmethod
+    def reset_timings(cls):
+        """Clear the timings of the completed blocks"""
+        cls.timings.clear()
+
+    def __init__(self, label:str="Python script", undoable:str="undoable", disableUI:bool=True, manualRefresh:bool=True, lockMesh:bool=True, commandBatch:bool=True):
+        """
+        Args:
+            label (str, optional): Label of the command batch (undo/redo) and of the timing. Defaults to "Python script".
+            undoable (str, optional): Undo option of IFDatabase.beginCommandBatch. Defaults to "undoable".
+            disableUI (bool, optional): Disable the user interface. Defaults to True.
+            manualRefresh (bool, optional): Only refresh the views when requested. Defaults to True.
+            lockMesh (bool, optional): Lock the mesh and update it once at the end of the block. Defaults to True.
+            commandBatch (bool, optional): Group the commands in a command batch. Not started within another FastMode block. Defaults to True.
+        """
+        self.label = label
+        self.undoable = undoable
+        self.disableUI = disableUI
+        self.manualRefresh = manualRefresh
+        self.lockMesh = lockMesh
+        self.commandBatch = commandBatch
+        self.elapsed = 0.0
+        self.meshTime = 0.0
+        self._stack = None
+
+    def __enter__(self) -> 'FastMode':
+        self._start = time.perf_counter()
+        db = lusas.db()
+        with ExitStack() as stack:
+            # The UI and refresh switches are only available from v22.0
+            if lusas.getMajorVersionNumber() >= 22:
+                if self.disableUI:
+                    stack.callback(lusas.enableUI, lusas.isUIEnabled())
+                    lusas.enableUI(False)
+                if self.manualRefresh:
+                    stack.callback(lusas.setManualRefresh, lusas.isManualRefresh())
+                    lusas.setManualRefresh(True)
+
+            if self.commandBatch and FastMode._depth == 0:
+                stack.callback(db.closeCommandBatch)
+                if db.beginCommandBatch(self.label, self.undoable):
+                    raise Exception(f"The command batch '{self.label}' was rejected")
+
+            if self.lockMesh:
+                stack.callback(self._unlock_mesh, db, db.isMeshLocked())
+                db.setMeshLock(True)
+
+            FastMode._depth += 1
+            stack.callback(self._leave)
+            self._stack = stack.pop_all()
+        return self
+
+    def _unlock_mesh(self, db:'IFDatabase', wasLocked:bool):
+        start = time.perf_counter()
+        if not wasLocked:
+            # Unlocking processes all the changes made while locked (no separate updateMesh call is needed)
+            db.setMeshLock(False)
+        self.meshTime = time.perf_counter() - start
+
+    def _leave(self):
+        FastMode._depth -= 1
+
+    def __exit__(self, *exc):
+        try:
+            self._stack.__exit__(*exc)
+        finally:
+            self._stack = None
+            self.elapsed = time.perf_counter() - self._start
+            FastMode.timings.append((self.label, self.elapsed))
+        return False
+
+class AssignmentPlanner:
+    """Collects attribute assignments and makes them with a single IFAttribute.assignTo call per attribute and assignment options.
+    No calls are made per feature: each attribute and loadset object is identified once (by its type and ID, as pywin32 returns
+    a new Python object each time an LPI object is fetched) and the features are only passed on to LUSAS when the plan is flushed.
+    Where features are assigned more than one attribute of the same type in a batch (found with object sets, a few calls per
+    group), the assignments of that type are made in the order they were added so later assignments still replace earlier ones.
+
+    Example:
+        with AssignmentPlanner() as planner:
+            for surface, thk in surfaces:
+                planner.add(attributes.geometric_surface(thk), surface)
+            planner.add(load, surface, loadset=lc, factor=1.5)
+        print(planner.calls, planner.saved)
+
+    Attributes:
+        added (int): Number of assignments added (one per feature)
+        calls (int): Number of LPI calls made by the planner, including those identifying attributes and finding overlaps
+        saved (int): Number of calls saved compared to assigning each feature individually
+    """
+
+    def __init__(self):
+        self.added = 0
+        self.calls = 0
+        self._keys = {}       # id(object) -> (object, key), the object is kept so that its id is not reused
+        self._groups = {}     # (attribute type, attribute ID, loadset, factor, assignment) -> [attribute, options, features]
+        self._runs = []       # [group key, features] in the order the assignments were added
+
+    def __enter__(self) -> 'AssignmentPlanner':
+        return self
+
+    def __exit__(self, excType, *exc):
+        if excType is None:
+            self.flush()
+        return False
+
+    def __len__(self) -> int:
+        return sum(len(group[2]) for group in self._groups.values())
+
+    @property
+    def saved(self) -> int:
+        return self.added - self.calls
+
+    def _key(self, obj, *methods) -> tuple:
+        entry = self._keys.get(id(obj))
+        if entry is None:
+            entry = self._keys[id(obj)] = (obj, tuple(getattr(obj, method)() for method in methods))
+            self.calls += len(methods)
+        return entry[1]
+
+    def add(self, attribute:'IFAttribute', features, loadset=None, factor:float=None, assignment:'IFAssignment'=None):
+        """Plan the assignment of an attribute
+
+        Args:
+            attribute (IFAttribute): Attribute to assign
+            features (IFDatabaseMember | list[IFDatabaseMember]): Feature or features to assign to
+            loadset (IFLoadset | int | str, optional): Loadset of the assignment (loading attributes). Defaults to None.
+            factor (float, optional): Load factor of the assignment. Defaults to None.
+            assignment (IFAssignment, optional): Assignment data used as is, it must not be modified before the flush. Defaults to None.
+        """
+        features = list(features) if isinstance(features, (list, tuple)) else [features]
+        if not features:
+            return
+        self.added += len(features)
+        loadsetKey = loadset if loadset is None or isinstance(loadset, (int, str)) else self._key(loadset, "getID")[0]
+        key = self._key(attribute, "getAttributeType", "getID") + (loadsetKey, factor, id(assignment))
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = [attribute, (loadset, factor, assignment), []]
+        group[2].extend(features)
+        if self._runs and self._runs[-1][0] == key:
+            self._runs[-1][1].extend(features)
+        else:
+            self._runs.append([key, features])
+
+    def _overlap(self, groups:list) -> bool:
+        # Features shared by the groups reduce the count of their union below the sum of their counts
+        union = lusas.newObjectSet()
+        total = 0
+        for _, _, features in groups:
+            total += lusas.newObjectSet().add(features).count("all")
+            union.add(features)
+            self.calls += 4
+        self.calls += 2
+        return union.count("all") < total
+
+    def _assign(self, group:list, features:list, assignments:dict):
+        attribute, (loadset, factor, assignment), _ = group
+        if assignment is None and (loadset is not None or factor is not None):
+            assignment = assignments.get((id(loadset), factor))
+            if assignment is None:
+                assignment = assignments[(id(loadset), factor)] = lusas.assignment().setAllDefaults()
+                self.calls += 2
+                if loadset is not None:
+                    assignment.setLoadset(loadset)
+                    self.calls += 1
+                if factor is not None:
+                    assignment.setLoadFactor(factor)
+                    self.calls += 1
+        if assignment is None:
+            attribute.assignTo(features)
+        else:
+            attribute.assignTo(features, assignment)
+        self.calls += 1
+
+    def flush(self):
+        """Make the planned assignments"""
+        groups, runs = self._groups, self._runs
+        self._groups, self._runs = {}, []
+        byType = {}
+        for key in groups:
+            byType.setdefault(key[0], []).append(key)
+        assignments = {}
+        for attributeType, keys in byType.items():
+            if len(keys) > 1 and self._overlap([groups[key] for key in keys]):
+                for key, features in runs:
+                    if key[0] == attributeType:
+                        self._assign(groups[key], features, assignments)
+            else:
+                for key in keys:
+                    self._assign(groups[key], groups[key][2], assignments)
 
 def delete_all_database_contents(db:'IFDatabase'):
     """Delete all contents of the database
@@ -355,17 +1052,20 @@ def delete_all_database_contents(db:'IFDatabase'):
 
     db.createAnalysisStructural("Analysis 1")
 
-def get_Analysis_Loadcases(analysis : IFAnalysis) -> list[IFLoadcase]:
+def get_Analysis_Loadcases(analysis : IFAnalysis, index:'LoadsetIndex'=None) -> list[IFLoadcase]:
     """
     Get all loadcases of an analysis. In v22.0, this can be acquired directly from the analysis object as analysis.getLoadcases().
 
     Args:
         analysis (IFAnalysis): Analysis object
+        index (LoadsetIndex, optional): Loadset index (see shared/Loadsets.py) answering the query without calls to LUSAS for each loadcase. Defaults to None.
 
     Returns:
         list[IFLoadcase]: List of loadcases in the analysis
     """
     analysisName = analysis.getName()
+    if index is not None:
+        return index.analysis_loadcases(analysisName)
     allLoadcases : list['IFLoadcase'] = lusas.db().getLoadsets("Loadcase")
     loadcases : list['IFLoadcase'] = list(filter(lambda lc: lc.getAnalysis().getName() == analysisName, allLoadcases))
     # or
@@ -428,6 +1128,183 @@ def create_rectangular_section(db:'IFDatabase', name:str, breadth:float, depth:f
 
     return db.createGeometricLine(name).setFromLibrary("Utilities", "", name, 0, 0, 0)
 
+# Attributes created (and deleted) by AttributeFactory to find the type name of each kind of attribute
+_ATTRIBUTE_PROBES = {
+    "geometric surface": lambda db, name: db.createGeometricSurface(name),
+    "geometric line": lambda db, name: db.createGeometricLine(name),
+    "parametric section": lambda db, name: db.createParametricSection(name),
+    "isotropic material": lambda db, name: db.createIsotropicMaterial(name, 1.0, 0.0, 0.0),
+}
+
+class AttributeFactory:
+    """Factory of attributes that returns the existing attribute when one with the same defining values was already created,
+    e.g. a geometric surface of the same thickness and eccentricity, a section of the same type and dimensions
+    or a material with the same properties.
+    An attribute keeps the name it was first created with, names given for later requests of the same values are ignored.
+    Default names are built from the values to the precision they are matched to, with a " (2)", " (3)"... suffix if the
+    name is already used by another attribute of the same type. An exception is raised if a given name is already used,
+    so that an attribute assigned to other features is never redefined. Sections check their name against both the
+    geometric line attributes and the parametric section utilities, as both are created with it.
+    Names are checked with IFDatabase.existsAttribute using the type names returned by IFAttribute.getAttributeType, which
+    are found once per kind of attribute by creating and deleting a probe attribute with a unique name.
+
+    Example:
+        attributes = AttributeFactory()
+        attributes.geometric_surface(12.0, name="Web (12.0mm)").assignTo(surface)
+        attributes.isotropic_material(200_000, 0.3, 7.8e-9, name="Steel").assignTo(surface)
+        print(attributes.hits, attributes.created)
+
+    Attributes:
+        created (int): Number of attributes created
+        hits (int): Number of requests answered by an existing attribute
+        hitCounts (Counter): Number of hits by attribute kind
+    """
+
+    def __init__(self, digits:int=9):
+        """
+        Args:
+            digits (int, optional): Number of significant digits to which the defining values must match to reuse an attribute. Defaults to 9.
+        """
+        self.digits = digits
+        self.created = 0
+        self.hits = 0
+        self.hitCounts = Counter()
+        self._attributes = {}     # (kind, defining values) -> attribute
+        self._names = set()       # (attribute type, name) of the attributes created
+        self._types = {}          # kind -> attribute type returned by getAttributeType
+
+    def __len__(self) -> int:
+        return len(self._attributes)
+
+    def _round(self, value):
+        if isinstance(value, (int, float)):
+            return float(f"{float(value):.{self.digits}g}") + 0.0
+        if isinstance(value, (list, tuple)):
+            return tuple(self._round(v) for v in value)
+        return value
+
+    def _format(self, value:float) -> str:
+        # Exact text of a defining value as matched (e.g. 12.0000001 and 12.0000002 have different names)
+        return f"{self._round(value):.{self.digits}g}"
+
+    def _type(self, kind:str) -> str:
+        attributeType = self._types.get(kind)
+        if attributeType is None:
+            # The name is unique so that the probe never redefines an existing attribute
+            db = lusas.db()
+            probe = _ATTRIBUTE_PROBES[kind](db, f"AttributeFactory probe {uuid.uuid4().hex}")
+            attributeType = self._types[kind] = probe.getAttributeType()
+            db.deleteAttribute(probe)
+        return attributeType
+
+    def _exists(self, kinds:tuple, name:str) -> bool:
+        for kind in kinds:
+            attributeType = self._type(kind)
+            if (attributeType, name) in self._names or lusas.db().existsAttribute(attributeType, name):
+                return True
+        return False
+
+    def _get(self, kinds:tuple, values:tuple, name:str, defaultName:str, create):
+        # kinds are the kinds of the attributes created with the name, the first one is returned
+        key = (kinds[0], self._round(values))
+        attr = self._attributes.get(key)
+        if attr is not None:
+            self.hits += 1
+            self.hitCounts[kinds[0]] += 1
+            return attr
+
+        if name:
+            if self._exists(kinds, name):
+                raise Exception(f"A {' or '.join(kinds)} attribute named '{name}' already exists, creating it would redefine the attribute of the features it is assigned to")
+        else:
+            name, count = defaultName, 1
+            while self._exists(kinds, name):
+                count += 1
+                name = f"{defaultName} ({count})"
+        attr = self._attributes[key] = create(name)
+        self._names.update((self._types[kind], name) for kind in kinds)
+        self.created += 1
+        return attr
+
+    def geometric_surface(self, thickness:float, eccentricity:float=0.0, name:str=None) -> 'IFGeometricSurface':
+        """Get a geometric surface attribute
+
+        Args:
+            thickness (float): Thickness
+            eccentricity (float, optional): Eccentricity in the local Z direction. Defaults to 0.0.
+            name (str, optional): Name of the attribute if created. Defaults to "Thickness <thickness>".
+
+        Returns:
+            IFGeometricSurface: Reference to the geometric attribute
+        """
+        defaultName = f"Thickness {self._format(thickness)}" + (f" Ecc {self._format(eccentricity)}" if eccentricity else "")
+        return self._get(("geometric surface",), (thickness, eccentricity), name, defaultName,
+                         lambda name: lusas.db().createGeometricSurface(name).setSurface(thickness, eccentricity))
+
+    def parametric_section(self, sectionType:str, dimensionNames:list[str], dimensions:list[float], name:str=None) -> 'IFGeometricLine':
+        """Get a geometric line attribute based on a parametric section
+
+        Args:
+            sectionType (str): Parametric section type (e.g. "Rectangular Solid")
+            dimensionNames (list[str]): Names of the dimensions (e.g. ['B', 'D'])
+            dimensions (list[float]): Values of the dimensions
+            name (str, optional): Name of the attribute if created. Defaults to "<sectionType> <dimensions>".
+
+        Returns:
+            IFGeometricLine: Reference to the geometric attribute
+        """
+        defaultName = f"{sectionType} " + "x".join(self._format(d) for d in dimensions)
+        def create(name):
+            db = lusas.db()
+            db.createParametricSection(name).setType(sectionType).setDimensions(list(dimensionNames), list(dimensions))
+            return db.createGeometricLine(name).setFromLibrary("Utilities", "", name, 0, 0, 0)
+        return self._get(("geometric line", "parametric section"), (sectionType, tuple(dimensionNames), tuple(dimensions)), name, defaultName, create)
+
+    def circular_section(self, dia:float, name:str=None) -> 'IFGeometricLine':
+        """Get a geometric line attribute based on a parametric circular section, see create_circular_section
+
+        Args:
+            dia (float): Diameter
+            name (str, optional): Name of the attribute if created. Defaults to "Circular Solid <dia>".
+
+        Returns:
+            IFGeometricLine: Reference to the geometric attribute
+        """
+        return self.parametric_section("Circular Solid", ['D'], [dia], name)
+
+    def rectangular_section(self, breadth:float, depth:float, name:str=None) -> 'IFGeometricLine':
+        """Get a geometric line attribute based on a parametric rectangular section, see create_rectangular_section
+
+        Args:
+            breadth (float): Breadth of the section
+            depth (float): Depth of the section
+            name (str, optional): Name of the attribute if created. Defaults to "Rectangular Solid <breadth>x<depth>".
+
+        Returns:
+            IFGeometricLine: Reference to the geometric attribute
+        """
+        return self.parametric_section("Rectangular Solid", ['B', 'D'], [breadth, depth], name)
+
+    def isotropic_material(self, E:float, nu:float, density:float, alpha:float=None, name:str=None) -> 'IFMaterialIsotropic':
+        """Get an isotropic material attribute
+
+        Args:
+            E (float): Young's modulus
+            nu (float): Poisson's ratio
+            density (float): Density
+            alpha (float, optional): Coefficient of thermal expansion. Defaults to None.
+            name (str, optional): Name of the attribute if created. Defaults to "Isotropic E=<E> nu=<nu> rho=<density>" (and alpha=<alpha>).
+
+        Returns:
+            IFMaterialIsotropic: Reference to the material attribute
+        """
+        defaultName = f"Isotropic E={self._format(E)} nu={self._format(nu)} rho={self._format(density)}" + (f" alpha={self._format(alpha)}" if alpha is not None else "")
+        def create(name):
+            if alpha is None:
+                return lusas.db().createIsotropicMaterial(name, E, nu, density)
+            return lusas.db().createIsotropicMaterial(name, E, nu, density, alpha)
+        return self._get(("isotropic material",), (E, nu, density, alpha), name, defaultName, create)
+
 def isNan(value: float) -> bool:
     """Check if a value is NaN (Not a Number) accounting for LUSAS Modeller NA value equal to 2.2250738585072014e-308.
 
@@ -0,0 +1,464 @@
+# LUSAS API (LPI) EXAMPLES
+# (https://github.com/LUSAS-Software/LUSAS-API-Examples/)
+#
+# Description:
+# This file contains an index of the loadsets of a model for scripts that look up loadsets repeatedly.
+# The loadsets are read once and the analysis of each loadcase, the IDs, names, type codes and associated (Max/Min) loadsets
+# are kept in dictionaries, so that lookups do not make any calls to LUSAS Modeller.
+# Loadsets created through the index are added to it as they are created, otherwise call refresh() after modifying loadsets.
+# The index also allocates unique loadset names locally (e.g. "Wind - 1" if "Wind" exists) and creates loadcase tables (optionally in one command batch).
+# Loadsets can be found by name prefix, glob pattern or regular expression (e.g. to find the members of an envelope).
+#
+# Example:
+#   index = LoadsetIndex(lusas)
+#   loadcases = index.analysis_loadcases("Analysis 1")
+#   lc = index.create_loadcase("Wind", "Analysis 1")
+#   print(index.id("Wind"), index.type_code(lc.getID()))
+
+import re
+from bisect import bisect_left
+from fnmatch import fnmatchcase
+from shared.LPI import *
+
+# Type codes of IFLoadset.getTypeCode
+LOADCASE = 0
+BASIC_COMBINATION = 2
+ENVELOPE = 3
+SMART_COMBINATION = 6
+
+class NameAllocator:
+    """Allocates unique names by appending " - 1", " - 2", etc. to names that are already used.
+    The next suffix of each name is remembered, so allocating many similar names takes constant time per name.
+    """
+
+    def __init__(self, names=()):
+        """
+        Args:
+            names (iterable, optional): Names already used. Defaults to none.
+        """
+        self._used = set(names)
+        self._nextSuffix = {}     # name -> next suffix to try
+
+    def __contains__(self, name:str) -> bool:
+        return name in self._used
+
+    def __len__(self) -> int:
+        return len(self._used)
+
+    def add(self, name:str):
+        """Mark a name as used
+
+        Args:
+            name (str): Name
+        """
+        self._used.add(name)
+
+    def discard(self, name:str):
+        """Mark a name as no longer used
+
+        Args:
+            name (str): Name
+        """
+        self._used.discard(name)
+
+    def allocate(self, name:str) -> str:
+        """Get a unique name and mark it as used
+
+        Args:
+            name (str): Requested name
+
+        Returns:
+            str: The requested name if not used, otherwise the name with the first unused " - i" suffix
+        """
+        unique = name
+        if unique in self._used:
+            i = self._nextSuffix.get(name, 1)
+            while f"{name} - {i}" in self._used:
+                i += 1
+            unique = f"{name} - {i}"
+            self._nextSuffix[name] = i + 1
+        self._used.add(unique)
+        return unique
+
+class NameMatcher:
+    """Sorted index of names answering prefix, glob and regular expression queries.
+    Prefix queries (and glob patterns starting with literal characters) only visit the matching range of the sorted names.
+    """
+
+    def __init__(self, names=None):
+        """
+        Args:
+            names (dict | list[tuple[str, int]], optional): IDs by name, or (name, ID) pairs when several IDs have the same name. Defaults to none.
+        """
+        items = sorted(names.items() if isinstance(names, dict) else (names or []))
+        self._names = [name for name, _ in items]
+        self._ids = [id for _, id in items]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name:str, id:int):
+        """Add a name
+
+        Args:
+            name (str): Name
+            id (int): ID of the name
+        """
+        i = bisect_left(self._names, name)
+        self._names.insert(i, name)
+        self._ids.insert(i, id)
+
+    def _range(self, prefix:str) -> range:
+        start = bisect_left(self._names, prefix)
+        end = start
+        while end < len(self._names) and self._names[end].startswith(prefix):
+            end += 1
+        return range(start, end)
+
+    def prefix(self, prefix:str) -> list[int]:
+        """Find the names starting with a prefix
+
+        Args:
+            prefix (str): Prefix (case sensitive)
+
+        Returns:
+            list[int]: IDs of the matching names in ascending order
+        """
+        return sorted({self._ids[i] for i in self._range(prefix)})
+
+    def glob(self, pattern:str) -> list[int]:
+        """Find the names matching a glob pattern (e.g. "Wind*" or "LC ? - [12]")
+
+        Args:
+            pattern (str): Glob pattern (case sensitive)
+
+        Returns:
+            list[int]: IDs of the matching names in ascending order
+        """
+        literal = re.match(r"[^*?\[]*", pattern).group(0)
+        return sorted({self._ids[i] for i in self._range(literal) if fnmatchcase(self._names[i], pattern)})
+
+    def regex(self, pattern:str, flags:int=0) -> list[int]:
+        """Find the names matching a regular expression from their start (re.match)
+
+        Args:
+            pattern (str): Regular expression
+            flags (int, optional): Regular expression flags. Defaults to 0.
+
+        Returns:
+            list[int]: IDs of the matching names in ascending order
+        """
+        expression = re.compile(pattern, flags)
+        return sorted({id for name, id in zip(self._names, self._ids) if expression.match(name)})
+
+class LoadsetIndex:
+    """Index of the loadsets of a model
+
+    Attributes:
+        loadsets (dict): Loadset objects by ID
+        names (dict): Loadset IDs by name (the last loadset read or created if several loadsets have the same name)
+        typeCodes (dict): Type codes by loadset ID
+        analyses (dict): Loadcase IDs by analysis name, in ID order
+        assocIDs (dict): ID of the associated loadset by loadset ID (the Min loadset of a Max loadset and vice versa)
+        allocator (NameAllocator): Names of the loadsets, used to allocate unique names
+    """
+
+    def __init__(self, modeller:'IFModeller'):
+        """
+        Args:
+            modeller (IFModeller): Reference to LUSAS Modeller
+        """
+        self.lusas = modeller
+        self.refresh()
+
+    def refresh(self):
+        """Read all loadsets from the model"""
+        self.loadsets = {}
+        self.names = {}
+        self.typeCodes = {}
+        self.analyses = {}
+        self.assocIDs = {}
+        self._analysisOf = {}
+        self._nameOf = {}         # loadset ID -> name (several loadsets can have the same name)
+        self.allocator = NameAllocator()
+        self._matchers = {}       # type code (None for all) -> NameMatcher
+        self._aliases = set()     # names of Max/Min pairs without the " (Max)" suffix
+        for loadset in self.lusas.db().getLoadsets("all"):
+            self._register(loadset)
+
+    def _register(self, loadset:'IFLoadset', name:str=None, typeCode:int=None, analysisName:str=None) -> int:
+        # The name, type code and analysis are read from LUSAS unless already known (e.g. when the loadset was just created)
+        id = loadset.getID()
+        if id in self.loadsets:
+            self._unregister(id)
+        if typeCode is None:
+            typeCode = loadset.getTypeCode()
+        if name is None:
+            name = loadset.getName()
+        self.loadsets[id] = loadset
+        self.names[name] = id
+        self._nameOf[id] = name
+        self.allocator.add(name)
+        self.typeCodes[id] = typeCode
+        for matcherType, matcher in self._matchers.items():
+            if matcherType is None or matcherType == typeCode:
+                matcher.add(name, id)
+        if typeCode == LOADCASE:
+            if analysisName is None:
+                analysisName = loadset.getAnalysis().getName()
+            self._analysisOf[id] = analysisName
+            loadcases = self.analyses.setdefault(analysisName, [])
+            loadcases.append(id)
+            if len(loadcases) > 1 and loadcases[-2] > id:
+                loadcases.sort()
+        elif typeCode in (ENVELOPE, SMART_COMBINATION):
+            # The pair can also be referred to by its name without the " (Max)" suffix
+            if name.endswith(" (Max)") and name[:-len(" (Max)")] not in self.names:
+                self.names[name[:-len(" (Max)")]] = id
+                self.allocator.add(name[:-len(" (Max)")])
+                self._aliases.add(name[:-len(" (Max)")])
+            assoc = loadset.getAssocLoadset()
+            if assoc is not None:
+                self.assocIDs[id] = assoc.getID()
+        return id
+
+    def _unregister(self, id:int):
+        self._matchers.clear()
+        self.loadsets.pop(id)
+        self.typeCodes.pop(id)
+        self.assocIDs.pop(id, None)
+        name = self._nameOf.pop(id)
+        others = [other for other, otherName in self._nameOf.items() if otherName == name]
+        if others:
+            # Other loadsets still have the name
+            self.names[name] = others[-1]
+        else:
+            self.names.pop(name, None)
+            self.allocator.discard(name)
+        for alias in [alias for alias, other in self.names.items() if other == id]:
+            del self.names[alias]
+            self.allocator.discard(alias)
+            self._aliases.discard(alias)
+        analysisName = self._analysisOf.pop(id, None)
+        if analysisName is not None:
+            self.analyses[analysisName].remove(id)
+
+    def __len__(self) -> int:
+        return len(self.loadsets)
+
+    def __contains__(self, loadset) -> bool:
+        return (loadset in self.names) if isinstance(loadset, str) else (int(loadset) in self.loadsets)
+
+    def id(self, name:str) -> int:
+        """Get the ID of a loadset
+
+        Args:
+            name (str): Loadset name
+
+        Returns:
+            int: Loadset ID
+        """
+        id = self.names.get(name)
+        if id is None:
+            raise Exception(f"Loadset '{name}' does not exist")
+        return id
+
+    def loadset(self, loadset) -> 'IFLoadset':
+        """Get a loadset object
+
+        Args:
+            loadset (int | str): Loadset ID or name
+
+        Returns:
+            IFLoadset: Loadset
+        """
+        id = self.id(loadset) if isinstance(loadset, str) else int(loadset)
+        if id not in self.loadsets:
+            raise Exception(f"Loadset {id} does not exist")
+        return self.loadsets[id]
+
+    def type_code(self, loadset) -> int:
+        """Get the type code of a loadset (e.g. 0 loadcase, 2 basic combination, 3 envelope, 6 smart combination)
+
+        Args:
+            loadset (int | str): Loadset ID or name
+
+        Returns:
+            int: Type code
+        """
+        return self.typeCodes[self.id(loadset) if isinstance(loadset, str) else int(loadset)]
+
+    def assoc_loadset(self, loadset) -> 'IFLoadset':
+        """Get the associated loadset of an envelope or smart combination (the Min loadset of a Max loadset and vice versa)
+
+        Args:
+            loadset (int | str): Loadset ID or name
+
+        Returns:
+            IFLoadset: Associated loadset or None
+        """
+        id = self.assocIDs.get(self.id(loadset) if isinstance(loadset, str) else int(loadset))
+        return self.loadsets.get(id) if id is not None else None
+
+    def ids_of_type(self, typeCode:int) -> list[int]:
+        """Get the IDs of the loadsets of a type
+
+        Args:
+            typeCode (int): Type code (e.g. LOADCASE, BASIC_COMBINATION, ENVELOPE, SMART_COMBINATION)
+
+        Returns:
+            list[int]: Loadset IDs in ascending order
+        """
+        return sorted(id for id, code in self.typeCodes.items() if code == typeCode)
+
+    def find(self, pattern:str, match:str="prefix", typeCode:int=None) -> list[int]:
+        """Find loadsets by name
+
+        Args:
+            pattern (str): Name prefix, glob pattern or regular expression
+            match (str, optional): "prefix", "glob" or "regex". Defaults to "prefix".
+            typeCode (int, optional): Only find loadsets of this type (e.g. LOADCASE). Defaults to None (all loadsets).
+
+        Returns:
+            list[int]: IDs of the matching loadsets in ascending order (all of the loadsets with a matching name)
+        """
+        matcher = self._matchers.get(typeCode)
+        if matcher is None:
+            names = [(name, id) for id, name in self._nameOf.items() if typeCode is None or self.typeCodes[id] == typeCode]
+            matcher = self._matchers[typeCode] = NameMatcher(names)
+        if match == "prefix":
+            return matcher.prefix(pattern)
+        elif match == "glob":
+            return matcher.glob(pattern)
+        elif match == "regex":
+            return matcher.regex(pattern)
+        raise Exception(f"Unknown match '{match}', expected 'prefix', 'glob' or 'regex'")
+
+    def analysis_loadcases(self, analysisName:str) -> list['IFLoadcase']:
+        """Get the loadcases of an analysis
+
+        Args:
+            analysisName (str): Analysis name
+
+        Returns:
+            list[IFLoadcase]: Loadcases in ID order
+        """
+        return [self.loadsets[id] for id in self.analyses.get(analysisName, [])]
+
+    def unique_name(self, name:str) -> str:
+        """Allocate a loadset name that is not used, see NameAllocator.allocate
+
+        Args:
+            name (str): Requested name
+
+        Returns:
+            str: Unique name
+        """
+        return self.allocator.allocate(name)
+
+    def _pair_name(self, name:str, unique:bool) -> str:
+        # A Max/Min pair uses the names "<name> (Max)" and "<name> (Min)"
+        if not unique:
+            return name
+        while True:
+            unique = self.allocator.allocate(name)
+            if f"{unique} (Max)" not in self.allocator and f"{unique} (Min)" not in self.allocator:
+                return unique
+
+    def create_loadcase(self, name:str, analysisName:str=None, forceID:int=None, unique:bool=False) -> 'IFLoadcase':
+        """Create a loadcase and add it to the index
+
+        Args:
+            name (str): Loadcase name
+            analysisName (str, optional): Name of the analysis. Defaults to None (LUSAS default).
+            forceID (int, optional): ID of the loadcase. Defaults to None (next available ID).
+            unique (bool, optional): Append a suffix to the name if it is already used. Defaults to False.
+
+        Returns:
+            IFLoadcase: Created loadcase
+        """
+        if unique:
+            name = self.unique_name(name)
+        loadcase = self.lusas.db().createLoadcase(name, analysisName, forceID)
+        self._register(loadcase, name, LOADCASE, analysisName)
+        return loadcase
+
+    def create_basic_combination(self, name:str, forceID:int=None, unique:bool=False) -> 'IFBasicCombination':
+        """Create a basic combination and add it to the index
+
+        Args:
+            name (str): Combination name
+            forceID (int, optional): ID of the combination. Defaults to None (next available ID).
+            unique (bool, optional): Append a suffix to the name if it is already used. Defaults to False.
+
+        Returns:
+            IFBasicCombination: Created combination
+        """
+        if unique:
+            name = self.unique_name(name)
+        combination = self.lusas.db().createCombinationBasic(name, None, forceID)
+        self._register(combination, name, BASIC_COMBINATION)
+        return combination
+
+    def create_smart_combination(self, name:str, unique:bool=False) -> 'IFSmartCombination':
+        """Create a smart combination (Max/Min pair) and add both loadsets to the index
+
+        Args:
+            name (str): Combination name
+            unique (bool, optional): Append a suffix to the name if it is already used. Defaults to False.
+
+        Returns:
+            IFSmartCombination: Created combination as returned by IFDatabase.createCombinationSmart
+        """
+        return self._register_pair(self.lusas.db().createCombinationSmart(self._pair_name(name, unique)))
+
+    def create_envelope(self, name:str, unique:bool=False) -> 'IFEnvelope':
+        """Create an envelope (Max/Min pair) and add both loadsets to the index
+
+        Args:
+            name (str): Envelope name
+            unique (bool, optional): Append a suffix to the name if it is already used. Defaults to False.
+
+        Returns:
+            IFEnvelope: Created envelope as returned by IFDatabase.createEnvelope
+        """
+        return self._register_pair(self.lusas.db().createEnvelope(self._pair_name(name, unique)))
+
+    def _register_pair(self, loadset:'IFLoadset') -> 'IFLoadset':
+        self._register(loadset)
+        assoc = loadset.getAssocLoadset()
+        if assoc is not None:
+            self._register(assoc)
+        return loadset
+
+    def create_loadcases(self, definitions:list[tuple], label:str="Create Loadcases", batch:bool=True) -> list['IFLoadcase']:
+        """Create a table of loadcases with unique names, creating the analyses that do not exist
+
+        Args:
+            definitions (list[tuple]): (name, analysis name, add gravity) of each loadcase. The analysis name may be None (LUSAS default).
+            label (str, optional): Label of the command batch (undo/redo). Defaults to "Create Loadcases".
+            batch (bool, optional): Create the loadcases in a single undoable command batch. Defaults to True.
+
+        Returns:
+            list[IFLoadcase]: Created loadcases in the order of the definitions
+        """
+        db = self.lusas.db()
+        if batch and db.beginCommandBatch(label, "undoable"):
+            db.closeCommandBatch()
+            raise Exception(f"The command batch '{label}' was rejected")
+        try:
+            analyses = set()
+            loadcases = []
+            for name, analysisName, gravity in definitions:
+                if analysisName is not None and analysisName not in analyses:
+                    if not db.existsAnalysis(analysisName):
+                        db.createAnalysisStructural(analysisName, False)
+                    analyses.add(analysisName)
+                loadcase = self.create_loadcase(name, analysisName, unique=True)
+                if gravity:
+                    loadcase.addGravity(True)
+                loadcases.append(loadcase)
+        finally:
+            if batch:
+                db.closeCommandBatch()
+        return loadcases
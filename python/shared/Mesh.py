@@ -0,0 +1,337 @@
+# LUSAS API (LPI) EXAMPLES
+# (https://github.com/LUSAS-Software/LUSAS-API-Examples/)
+#
+# Description:
+# This file contains a snapshot of the finite element mesh as NumPy arrays: node coordinates, element connectivity
+# in compressed sparse row (CSR) form, element type and stress type codes, and ID to row lookups.
+# By default the snapshot is read through the node and element objects (method="objects").
+# EXPERIMENTAL: method="datafile" tabulates the model with a single IFDatabase.exportSolver call and parses the
+# NODE COORDINATES and ELEMENT TOPOLOGY sections of the solver datafile in bulk, instead of calling getX/getY/getZ per
+# node and getNodes per element. The section layout it reads is the one written by the fake LPI and has not been checked
+# against a datafile exported by LUSAS Modeller, so it is only used when asked for explicitly.
+# The snapshot can be cached as an .npz file next to the .mdl file and is re-read when the model is saved after the
+# cache was written or when the numbers or largest IDs of the nodes and elements change.
+#
+# Example:
+#   mesh = get_mesh_snapshot(lusas)
+#   xyz = mesh.coords[mesh.element_nodes(mesh.element_row(10))]
+
+import os
+import re
+import tempfile
+import numpy as np
+from shared.LPI import *
+from shared.Helpers import parse_id_string
+
+class MeshSnapshot:
+    """Finite element mesh as arrays. Nodes and elements are held in ascending ID order.
+
+    Attributes:
+        nodeIDs (np.ndarray): ID of each node, shape (n_nodes,)
+        coords (np.ndarray): Coordinates of each node, shape (n_nodes, 3)
+        elementIDs (np.ndarray): ID of each element, shape (n_elements,)
+        offsets (np.ndarray): Start of the nodes of each element in connectivity, shape (n_elements + 1,)
+        connectivity (np.ndarray): Node rows of the elements in element topology order, shape (offsets[-1],)
+        elementTypes (np.ndarray): Index in elementTypeNames of each element
+        elementTypeNames (list[str]): Element type names (e.g. "QTS4")
+        stressTypes (np.ndarray): Index in stressTypeNames of each element
+        stressTypeNames (list[str]): Stress types of the element types (e.g. "Thick Shell")
+        info (dict[str, int]): Additional values saved with the snapshot
+        nodeRows (np.ndarray): Row of each node ID (-1 for unused IDs), shape (largest node ID + 1,)
+        elementRows (np.ndarray): Row of each element ID (-1 for unused IDs), shape (largest element ID + 1,)
+    """
+
+    def __init__(self, nodeIDs, coords, elementIDs, offsets, connectivity, elementTypes, elementTypeNames:list[str], stressTypes, stressTypeNames:list[str]):
+        self.nodeIDs = np.asarray(nodeIDs, dtype=np.int64)
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        self.elementIDs = np.asarray(elementIDs, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.connectivity = np.asarray(connectivity, dtype=np.int64)
+        self.elementTypes = np.asarray(elementTypes, dtype=np.int32)
+        self.elementTypeNames = list(elementTypeNames)
+        self.stressTypes = np.asarray(stressTypes, dtype=np.int32)
+        self.stressTypeNames = list(stressTypeNames)
+        self.nodeRows = _row_lookup(self.nodeIDs)
+        self.elementRows = _row_lookup(self.elementIDs)
+        self.info = {}
+
+    @property
+    def nodeCount(self) -> int:
+        return len(self.nodeIDs)
+
+    @property
+    def elementCount(self) -> int:
+        return len(self.elementIDs)
+
+    def node_row(self, ids):
+        """Rows of nodes given their IDs (-1 where a node does not exist)"""
+        return _lookup(self.nodeRows, ids)
+
+    def element_row(self, ids):
+        """Rows of elements given their IDs (-1 where an element does not exist)"""
+        return _lookup(self.elementRows, ids)
+
+    def element_nodes(self, row:int) -> np.ndarray:
+        """Node rows of an element in element topology order
+
+        Args:
+            row (int): Row of the element
+
+        Returns:
+            np.ndarray: Node rows, use nodeIDs[...] for the node IDs or coords[...] for their coordinates
+        """
+        return self.connectivity[self.offsets[row]:self.offsets[row+1]]
+
+    def elements_of_type(self, name:str) -> np.ndarray:
+        """Rows of the elements of an element type (e.g. "QTS4") or stress type (e.g. "Thick Shell")"""
+        if name in self.elementTypeNames:
+            return np.flatnonzero(self.elementTypes == self.elementTypeNames.index(name))
+        if name in self.stressTypeNames:
+            return np.flatnonzero(self.stressTypes == self.stressTypeNames.index(name))
+        return np.empty(0, dtype=np.int64)
+
+    def save(self, filename:str, **info):
+        """Save the snapshot as an uncompressed .npz file
+
+        Args:
+            filename (str): Path of the .npz file
+            **info (int): Additional integers stored with the arrays (e.g. the values used to validate a cache)
+        """
+        np.savez(filename, nodeIDs=self.nodeIDs, coords=self.coords, elementIDs=self.elementIDs, offsets=self.offsets,
+                 connectivity=self.connectivity, elementTypes=self.elementTypes, elementTypeNames=np.array(self.elementTypeNames, dtype=str),
+                 stressTypes=self.stressTypes, stressTypeNames=np.array(self.stressTypeNames, dtype=str),
+                 **{f"info_{key}": np.int64(value) for key, value in info.items()})
+
+    @classmethod
+    def load(cls, filename:str) -> 'MeshSnapshot':
+        """Load a snapshot saved with save(). The additional values are available as the info attribute."""
+        with np.load(filename) as data:
+            mesh = cls(data["nodeIDs"], data["coords"], data["elementIDs"], data["offsets"], data["connectivity"],
+                       data["elementTypes"], data["elementTypeNames"].tolist(), data["stressTypes"], data["stressTypeNames"].tolist())
+            mesh.info = {key[5:]: int(data[key]) for key in data.files if key.startswith("info_")}
+        return mesh
+
+def _row_lookup(ids:np.ndarray) -> np.ndarray:
+    rows = np.full(int(ids.max()) + 1 if len(ids) else 0, -1, dtype=np.int64)
+    rows[ids] = np.arange(len(ids))
+    return rows
+
+def _lookup(rows:np.ndarray, ids):
+    ids = np.asarray(ids, dtype=np.int64)
+    found = (ids >= 0) & (ids < len(rows))
+    result = np.where(found, rows[np.where(found, ids, 0)] if len(rows) else -1, -1)
+    return int(result) if result.ndim == 0 else result
+
+######################################################
+## Solver datafile
+
+# Lines of numbers (integers and reals in fixed or exponent form)
+_NUMERIC_LINE = re.compile(r"^\s*[-+]?(\d|\.\d)")
+
+def read_solver_datafile(filename:str) -> tuple:
+    """Read the nodes and elements of a LUSAS solver datafile (EXPERIMENTAL, the layout has not been checked against LUSAS Modeller).
+    Only the NODE COORDINATES and "<element type> ELEMENT TOPOLOGY" sections are read, other sections are skipped.
+
+    Args:
+        filename (str): Path of the datafile
+
+    Returns:
+        tuple: Node IDs (N,), node coordinates (N, 3), and a list of (element type, element IDs (E,), node IDs (E, nodes per element)) per topology section
+    """
+    sections = []     # [(section name, [numeric lines])]
+    with open(filename, "r") as f:
+        for line in f:
+            if _NUMERIC_LINE.match(line):
+                if sections:
+                    sections[-1][1].append(line)
+            elif line.strip() and not re.match(r"^\s*C(\s|$)", line, re.IGNORECASE):
+                sections.append((" ".join(line.split()).upper(), []))
+
+    nodeIDs, coords, topologies = [], [], []
+    for name, lines in sections:
+        if not lines:
+            continue
+        if name.startswith("NODE COORDINATES"):
+            values = _section_array(name, lines)
+            # Two dimensional models have no Z coordinates
+            xyz = np.zeros((len(values), 3))
+            xyz[:, :min(values.shape[1]-1, 3)] = values[:, 1:4]
+            nodeIDs.append(values[:, 0].astype(np.int64))
+            coords.append(xyz)
+        elif name.endswith("ELEMENT TOPOLOGY"):
+            values = _section_array(name, lines).astype(np.int64)
+            topologies.append((name.split()[0], values[:, 0], values[:, 1:]))
+
+    nodeIDs = np.concatenate(nodeIDs) if nodeIDs else np.empty(0, dtype=np.int64)
+    coords = np.concatenate(coords) if coords else np.empty((0, 3))
+    return nodeIDs, coords, topologies
+
+def _section_array(name:str, lines:list[str]) -> np.ndarray:
+    # All lines of a section have the same number of values, read them with a single conversion
+    width = len(lines[0].split())
+    values = np.array(" ".join(lines).split(), dtype=np.float64)
+    if len(values) != width * len(lines) or width < 2:
+        raise Exception(f"Cannot read the {name} section of the datafile, the lines do not have the same number of values")
+    return values.reshape(len(lines), width)
+
+def _stress_types(db:'IFDatabase', elementTypeNames:list[str], elementIDs:np.ndarray, elementTypes:np.ndarray) -> list[str]:
+    # One element of each type is enough to get the stress type of the type
+    return [db.getObject("Element", int(elementIDs[np.argmax(elementTypes == i)])).getStressType() for i in range(len(elementTypeNames))]
+
+def _check_datafile_mesh(db:'IFDatabase', nodeIDs:np.ndarray, elementIDs:np.ndarray):
+    # Only one ID per line is read, so generated or continued records would be read as other nodes/elements.
+    # The IDs read must be unique and match the numbers and largest IDs of the nodes and elements of the model.
+    state = _mesh_state(db)
+    for kind, ids in (("node", nodeIDs), ("element", elementIDs)):
+        count, largest = state[f"{kind}Count"], state[f"largest{kind.capitalize()}ID"]
+        if len(ids) != count or (count > 0 and ids[-1] != largest) or np.any(ids[1:] == ids[:-1]):
+            raise Exception(f"The datafile has {len(ids)} {kind}s (largest ID {ids[-1] if len(ids) else 0}) but the model has {count} "
+                            f"(largest ID {largest}), it may contain generated or continued records. Read the mesh with method='objects'")
+
+def _read_datafile_mesh(db:'IFDatabase', datafile:str=None) -> MeshSnapshot:
+    if datafile is None:
+        with tempfile.TemporaryDirectory() as folder:
+            return _read_datafile_mesh(db, os.path.join(folder, "mesh.dat"))
+
+    returnCode = db.exportSolver(datafile)
+    if returnCode != 0:
+        raise Exception(f"The model could not be tabulated as a solver datafile (return code {returnCode})")
+    nodeIDs, coords, topologies = read_solver_datafile(datafile)
+
+    order = np.argsort(nodeIDs, kind="stable")
+    nodeIDs, coords = nodeIDs[order], coords[order]
+    nodeRows = _row_lookup(nodeIDs)
+
+    elementTypeNames = []
+    elementIDs, elementTypes, counts, nodes = [], [], [], []
+    for name, ids, topology in topologies:
+        if name not in elementTypeNames:
+            elementTypeNames.append(name)
+        elementIDs.append(ids)
+        elementTypes.append(np.full(len(ids), elementTypeNames.index(name), dtype=np.int32))
+        counts.append(np.full(len(ids), topology.shape[1]))
+        nodes.append(topology)
+    if not elementIDs:
+        _check_datafile_mesh(db, nodeIDs, np.empty(0, dtype=np.int64))
+        return MeshSnapshot(nodeIDs, coords, [], [0], [], [], [], [], [])
+
+    elementIDs = np.concatenate(elementIDs)
+    elementTypes = np.concatenate(elementTypes)
+    counts = np.concatenate(counts)
+    # Sort the elements by ID, keeping the node IDs of each element together
+    order = np.argsort(elementIDs, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    flat = np.concatenate([n.ravel() for n in nodes])
+    offsets = np.concatenate([[0], np.cumsum(counts[order])])
+    gather = np.repeat(starts[order] - offsets[:-1], counts[order]) + np.arange(offsets[-1])
+    connectivity = _lookup(nodeRows, flat[gather])
+    if np.any(connectivity < 0):
+        raise Exception("The element topology of the datafile refers to nodes that are not in its NODE COORDINATES")
+
+    elementIDs, elementTypes = elementIDs[order], elementTypes[order]
+    _check_datafile_mesh(db, nodeIDs, elementIDs)
+    stressTypeNames = []
+    stressTypes = np.zeros(len(elementIDs), dtype=np.int32)
+    for i, stressType in enumerate(_stress_types(db, elementTypeNames, elementIDs, elementTypes)):
+        if stressType not in stressTypeNames:
+            stressTypeNames.append(stressType)
+        stressTypes[elementTypes == i] = stressTypeNames.index(stressType)
+    return MeshSnapshot(nodeIDs, coords, elementIDs, offsets, connectivity, elementTypes, elementTypeNames, stressTypes, stressTypeNames)
+
+######################################################
+## Node and element objects
+
+def _read_object_mesh(modeller:'IFModeller') -> MeshSnapshot:
+    # IDs are read as one string and the objects are returned in ascending ID order, so getID is not needed
+    db = modeller.db()
+    allObjects = modeller.newObjectSet().add("Node").add("Element")
+    nodeIDs = np.array(parse_id_string(allObjects.getAsString("Node")), dtype=np.int64)
+    elementIDs = np.array(parse_id_string(allObjects.getAsString("Element")), dtype=np.int64)
+    nodes = db.getObjects("Node")
+    elements = db.getObjects("Element")
+    if len(nodes) != len(nodeIDs) or len(elements) != len(elementIDs):
+        raise Exception("The numbers of nodes and elements do not match their IDs")
+
+    coords = np.array([(node.getX(), node.getY(), node.getZ()) for node in nodes], dtype=np.float64).reshape(-1, 3)
+    nodeRows = _row_lookup(nodeIDs)
+
+    elementTypeNames, stressTypeNames, typeStress = [], [], []
+    elementTypes = np.zeros(len(elements), dtype=np.int32)
+    offsets = np.zeros(len(elements) + 1, dtype=np.int64)
+    connectivity = []
+    for i, element in enumerate(elements):
+        name = element.getElementType()
+        if name not in elementTypeNames:
+            # The stress type is read once per element type
+            elementTypeNames.append(name)
+            stressType = element.getStressType()
+            if stressType not in stressTypeNames:
+                stressTypeNames.append(stressType)
+            typeStress.append(stressTypeNames.index(stressType))
+        elementTypes[i] = elementTypeNames.index(name)
+        ids = [node.getID() for node in element.getNodes()]
+        connectivity.extend(ids)
+        offsets[i+1] = offsets[i] + len(ids)
+    stressTypes = np.array(typeStress, dtype=np.int32)[elementTypes] if typeStress else elementTypes
+    return MeshSnapshot(nodeIDs, coords, elementIDs, offsets, _lookup(nodeRows, connectivity), elementTypes, elementTypeNames, stressTypes, stressTypeNames)
+
+######################################################
+## Snapshot and cache
+
+def read_mesh(modeller:'IFModeller', method:str="objects", datafile:str=None) -> MeshSnapshot:
+    """Read a snapshot of the mesh of the model
+
+    Args:
+        modeller (IFModeller): Reference to LUSAS Modeller
+        method (str, optional): "objects" to read the nodes and elements through their objects, or "datafile" (experimental)
+                                to tabulate the model as a solver datafile with one call and read it. Defaults to "objects".
+        datafile (str, optional): Path of the datafile to write and keep. Defaults to None (a temporary file).
+
+    Returns:
+        MeshSnapshot: Mesh of the model
+    """
+    if method == "datafile":
+        return _read_datafile_mesh(modeller.db(), datafile)
+    elif method == "objects":
+        return _read_object_mesh(modeller)
+    raise Exception(f"Unknown method '{method}', expected 'datafile' or 'objects'")
+
+def _mesh_state(db:'IFDatabase') -> dict[str, int]:
+    # Values that change when the mesh is regenerated, compared with the values stored in the cache
+    return {"nodeCount": db.count("Node"), "elementCount": db.count("Element"),
+            "largestNodeID": db.getLargestNodeID(), "largestElementID": db.getLargestElementID()}
+
+def get_mesh_snapshot(modeller:'IFModeller', cacheFile:str=None, refresh:bool=False, method:str="objects") -> MeshSnapshot:
+    """Get a snapshot of the mesh, cached as "<model name>.mesh.npz" next to the .mdl file.
+    The cache is used when it was written after the model was last saved and the numbers and largest IDs of the nodes
+    and elements are unchanged. Changes to a saved model that keep these (e.g. moving nodes) require refresh=True.
+
+    Args:
+        modeller (IFModeller): Reference to LUSAS Modeller
+        cacheFile (str, optional): Path of the .npz cache. Defaults to None (next to the .mdl file, or no cache if the model has not been saved).
+        refresh (bool, optional): Read the mesh from the model even if the cache is valid. Defaults to False.
+        method (str, optional): "objects" or "datafile" (experimental), see read_mesh. Defaults to "objects".
+
+    Returns:
+        MeshSnapshot: Mesh of the model
+    """
+    db = modeller.db()
+    modelFile = db.getDBFilename()
+    if cacheFile is None and modelFile:
+        cacheFile = f"{db.getDBFilenameNoExtension()}.mesh.npz"
+
+    state = _mesh_state(db)
+    if cacheFile and not refresh and os.path.exists(cacheFile):
+        if not (modelFile and os.path.exists(modelFile)) or os.path.getmtime(cacheFile) >= os.path.getmtime(modelFile):
+            mesh = MeshSnapshot.load(cacheFile)
+            if mesh.info == state:
+                return mesh
+
+    mesh = read_mesh(modeller, method)
+    if mesh.nodeCount != state["nodeCount"] or mesh.elementCount != state["elementCount"]:
+        raise Exception(f"The mesh read has {mesh.nodeCount} nodes and {mesh.elementCount} elements but the model has "
+                        f"{state['nodeCount']} nodes and {state['elementCount']} elements, read the mesh with method='objects'")
+    mesh.info = state
+    if cacheFile:
+        mesh.save(cacheFile, **state)
+    return mesh
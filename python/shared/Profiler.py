@@ -0,0 +1,255 @@
+# LUSAS API (LPI) EXAMPLES
+# (https://github.com/LUSAS-Software/LUSAS-API-Examples/)
+#
+# Description:
+# This file contains a profiler of the calls made from Python to LUSAS Modeller through the LPI.
+# The modeller is wrapped in a proxy that wraps every LPI object it returns, so that each call to any LPI object is timed.
+# For each method ("IFInterface.method") the number of calls and the total, minimum and maximum time are recorded,
+# together with the script lines the calls are made from. Time percentiles are estimated from a fixed size random sample
+# of the call durations, so the memory used does not grow with the number of calls.
+# Recording the Python stack of each call (for collapsed stack export) is opt-in as it is much slower than the call timing.
+# The results can be printed, exported as JSON or exported as collapsed stacks (e.g. for flamegraph.pl or speedscope).
+#
+# Profiling is opt-in. The proxy is returned by get_lusas_modeller(profile=True) or when the LUSAS_LPI_PROFILE environment
+# variable is set. Otherwise get_lusas_modeller returns the modeller itself and there is no overhead.
+#
+# Example:
+#   lusas = get_lusas_modeller(profile=True)
+#   Profiler.profiler.recordStacks = True  # only needed for save_collapsed
+#   ...
+#   Profiler.profiler.print_summary()
+#   Profiler.profiler.save_json("lpi_profile.json")
+#   Profiler.profiler.save_collapsed("lpi_profile.folded")
+
+import json
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from functools import lru_cache
+import numpy as np
+
+# Folder of the shared modules, frames within it are skipped when finding the calling script line
+_SHARED_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Maximum depth of the Python stacks recorded for collapsed stack export
+MAX_STACK_DEPTH = 32
+
+# Number of call durations sampled per method for the percentiles
+SAMPLE_SIZE = 1000
+
+class MethodStats:
+    """Running statistics of the calls of one LPI method
+
+    Attributes:
+        calls (int): Number of calls
+        total (float): Total time in seconds
+        min (float): Shortest call in seconds
+        max (float): Longest call in seconds
+        sample (list[float]): Uniform random sample of at most SAMPLE_SIZE call durations (reservoir sampling)
+    """
+
+    __slots__ = ("calls", "total", "min", "max", "sample")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.sample = []
+
+    def add(self, duration:float):
+        self.calls += 1
+        self.total += duration
+        if duration < self.min:
+            self.min = duration
+        if duration > self.max:
+            self.max = duration
+        if len(self.sample) < SAMPLE_SIZE:
+            self.sample.append(duration)
+        else:
+            i = random.randrange(self.calls)
+            if i < SAMPLE_SIZE:
+                self.sample[i] = duration
+
+class Profiler:
+    """Statistics of the LPI calls made through profiled objects
+
+    Attributes:
+        stats (dict[str, MethodStats]): Call statistics by "IFInterface.method"
+        lines (dict): Number of calls by "IFInterface.method" and calling "script:line"
+        stacks (Counter): Total time in seconds by collapsed stack (Python frames followed by the LPI method)
+    """
+
+    def __init__(self, recordStacks:bool=False):
+        """
+        Args:
+            recordStacks (bool, optional): Record the Python stack of each call for collapsed stack export (slow). Defaults to False.
+        """
+        self.recordStacks = recordStacks
+        self.reset()
+
+    def reset(self):
+        """Clear all recorded calls"""
+        self.stats = defaultdict(MethodStats)
+        self.lines = defaultdict(Counter)
+        self.stacks = Counter()
+
+    def _record(self, method:str, duration:float):
+        self.stats[method].add(duration)
+
+        caller = sys._getframe(2)
+
+        # Find the first frame outside the shared modules (the calling script line)
+        frame = caller
+        while frame is not None and os.path.dirname(os.path.abspath(frame.f_code.co_filename)) == _SHARED_DIR:
+            frame = frame.f_back
+        if frame is not None:
+            self.lines[method][f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno}"] += 1
+
+        if self.recordStacks:
+            frames = []
+            frame = caller
+            while frame is not None and len(frames) < MAX_STACK_DEPTH:
+                frames.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(frames)) + ";" + method] += duration
+
+    def summary(self) -> list[dict]:
+        """Statistics of each LPI method sorted by total time
+
+        Returns:
+            list[dict]: For each method, the number of calls, total/mean/min/max time, 50th/90th/99th time percentiles
+                        (estimated from the sampled calls) in seconds and the calling lines
+        """
+        rows = []
+        for method, stats in self.stats.items():
+            p50, p90, p99 = np.percentile(stats.sample, [50, 90, 99])
+            rows.append({
+                "method": method,
+                "calls": stats.calls,
+                "total": stats.total,
+                "mean": stats.total / stats.calls,
+                "min": stats.min,
+                "max": stats.max,
+                "p50": float(p50),
+                "p90": float(p90),
+                "p99": float(p99),
+                "lines": dict(self.lines[method].most_common()),
+            })
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+    def print_summary(self, top:int=20):
+        """Print the methods with the largest total time
+
+        Args:
+            top (int, optional): Number of methods to print. Defaults to 20.
+        """
+        rows = self.summary()
+        print(f"{'Method':<50} {'Calls':>9} {'Total (s)':>10} {'p50 (ms)':>9} {'p90 (ms)':>9} {'p99 (ms)':>9}  Top line")
+        for row in rows[:top]:
+            topLine = next(iter(row["lines"]), "")
+            print(f"{row['method']:<50} {row['calls']:>9} {row['total']:>10.3f} {row['p50']*1e3:>9.3f} {row['p90']*1e3:>9.3f} {row['p99']*1e3:>9.3f}  {topLine}")
+
+    def save_json(self, filename:str):
+        """Save the summary statistics as JSON
+
+        Args:
+            filename (str): Path of the JSON file
+        """
+        with open(filename, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def save_collapsed(self, filename:str):
+        """Save the recorded stacks in collapsed format ("frame;frame;method microseconds" per line).
+        Stacks are only recorded by a profiler created with recordStacks=True.
+
+        Args:
+            filename (str): Path of the text file
+        """
+        with open(filename, "w") as f:
+            for stack, duration in self.stacks.items():
+                f.write(f"{stack} {int(round(duration * 1e6))}\n")
+
+# Default profiler used by get_lusas_modeller(profile=True)
+profiler = Profiler()
+
+@lru_cache(maxsize=None)
+def _return_interface(interface:str, method:str) -> str:
+    # Use the return annotations of the LPI documentation module to name the returned object
+    # (imported on the first profiled call, as it is large and slow to import)
+    import shared.LPI_22_0 as LPI_types
+    cls = getattr(LPI_types, interface, None)
+    function = getattr(cls, method, None)
+    annotation = getattr(function, "__annotations__", {}).get("return", "")
+    if not isinstance(annotation, str):
+        annotation = getattr(annotation, "__name__", "")
+    match = re.search(r"(IF\w+)", annotation)
+    return match.group(1) if match else "IFDispatch"
+
+def _unwrap(value):
+    if isinstance(value, ProfiledObject):
+        return object.__getattribute__(value, "_target")
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(v) for v in value)
+    return value
+
+def _wrap(value, interface:str, profiler:Profiler):
+    if value is None or isinstance(value, (bool, int, float, str, bytes, np.generic)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return type(value)(_wrap(v, interface, profiler) for v in value)
+    return ProfiledObject(value, interface, profiler)
+
+class ProfiledObject:
+    """Proxy of an LPI object that times every method call and wraps the returned LPI objects"""
+
+    __slots__ = ("_target", "_interface", "_profiler")
+
+    def __init__(self, target, interface:str, profiler:Profiler):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_interface", interface)
+        object.__setattr__(self, "_profiler", profiler)
+
+    def __getattr__(self, name:str):
+        target = object.__getattribute__(self, "_target")
+        attr = getattr(target, name)
+        if not callable(attr):
+            return attr
+        interface = object.__getattribute__(self, "_interface")
+        profiler = object.__getattribute__(self, "_profiler")
+        method = f"{interface}.{name}"
+        def call(*args, **kwargs):
+            args = _unwrap(args)
+            kwargs = {k: _unwrap(v) for k, v in kwargs.items()}
+            start = time.perf_counter()
+            result = attr(*args, **kwargs)
+            profiler._record(method, time.perf_counter() - start)
+            return _wrap(result, _return_interface(interface, name), profiler)
+        return call
+
+    def __setattr__(self, name:str, value):
+        setattr(object.__getattribute__(self, "_target"), name, _unwrap(value))
+
+    def __eq__(self, other):
+        return object.__getattribute__(self, "_target") == _unwrap(other)
+
+    def __hash__(self):
+        return hash(object.__getattribute__(self, "_target"))
+
+    def __repr__(self):
+        return f"<Profiled {object.__getattribute__(self, '_interface')} {object.__getattribute__(self, '_target')!r}>"
+
+def profile_modeller(modeller:'IFModeller', profiler:Profiler=None) -> 'IFModeller':
+    """Wrap LUSAS Modeller in a profiling proxy
+
+    Args:
+        modeller (IFModeller): Reference to LUSAS Modeller
+        profiler (Profiler, optional): Profiler recording the calls. Defaults to the module profiler.
+
+    Returns:
+        IFModeller: Proxy that can be used in place of the modeller
+    """
+    return ProfiledObject(modeller, "IFModeller", profiler if profiler is not None else globals()["profiler"])
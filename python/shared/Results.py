@@ -0,0 +1,596 @@
+# LUSAS API (LPI) EXAMPLES
+# (https://github.com/LUSAS-Software/LUSAS-API-Examples/)
+#
+# Description:
+# This file contains helper functions for extracting analysis results from LUSAS into NumPy arrays using Python
+# Results are read through results component sets and results contexts and returned as NumPy arrays
+# so that they can be post-processed without further calls to LUSAS Modeller.
+# The LUSAS Modeller N/A value (2.2250738585072014e-308) is replaced by NaN in the returned arrays.
+# The library must be initialised with a reference to LUSAS Modeller before using these functions.
+
+import os
+import json
+import re
+import numpy as np
+from shared.LPI import *
+
+# Value returned by LUSAS Modeller when a result is not available (smallest 64bit double precision value)
+NA_VALUE = 2.2250738585072014e-308
+
+def initialise(modeller:'IFModeller'):
+    global lusas
+    lusas = modeller
+
+def get_loadset_id(loadset) -> int:
+    """Get the ID of a loadset given either the loadset object or its ID
+
+    Args:
+        loadset (IFLoadset | int): Loadset object or loadset ID
+
+    Returns:
+        int: Loadset ID
+    """
+    if isinstance(loadset, (int, np.integer)):
+        return int(loadset)
+    return loadset.getID()
+
+def na_to_nan(values:np.ndarray) -> np.ndarray:
+    """Replace the LUSAS Modeller N/A value with NaN in a single vectorised pass (in place)
+
+    Args:
+        values (np.ndarray): Floating point array of results
+
+    Returns:
+        np.ndarray: The same array with N/A values replaced by NaN
+    """
+    values[values == NA_VALUE] = np.nan
+    return values
+
+def create_results_context(objSet:'IFObjectSet', loadset) -> 'IFResultsContext':
+    """Create a results context limited to the given objects and loadset, independent of the current view
+
+    Args:
+        objSet (IFObjectSet): Objects (features, elements or nodes) for which results will be calculated
+        loadset (IFLoadset | int): Loadset object or ID to set as active in the context
+
+    Returns:
+        IFResultsContext: The new results context
+    """
+    context = lusas.newResultsContext(None)
+    context.getCalcResultsSet().add(objSet)
+    context.setActiveLoadset(get_loadset_id(loadset))
+    return context
+
+def get_nodal_results(objSet:'IFObjectSet', entity:str, components:list[str], loadset, units:'IFUnitSet'=None) -> tuple[np.ndarray, np.ndarray]:
+    """Extract nodal results of several components for all nodes of an object set
+
+    This is not a bulk extractor: the results are queried one node and component at a time, with one getID call per node
+    and one getContinuousResults call per node and component, as in the loop of IFNode.getResults calls it replaces.
+    It only saves the entity lookup and context of each query by creating a single results context for the loadset and
+    acquiring one results component set per component.
+
+    Args:
+        objSet (IFObjectSet): Object set containing the nodes, elements or geometric features of interest
+        entity (str): Results entity (e.g. "Displacement", "Reaction")
+        components (list[str]): Results components (e.g. ["DX", "DY", "DZ"])
+        loadset (IFLoadset | int): Loadset object or ID for which results are required
+        units (IFUnitSet, optional): Units of the results. Defaults to None (database units).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Results array of shape (n_nodes, n_components) and the node IDs of each row
+    """
+    # Collect the nodes of any elements or features in the object set
+    nodeSet = lusas.newObjectSet().add(objSet).addLOF("Element").addLOF("Node")
+    nodes : list[IFNode] = nodeSet.getObjects("Node")
+
+    context = create_results_context(nodeSet, loadset)
+
+    # Component numbers should not be requested within the node loop (slow conversion)
+    componentSets = []
+    for component in components:
+        rcs = lusas.db().getResultsComponentSet(entity, component, "Nodal", context)
+        componentSets.append((rcs, rcs.getComponentNumber(component)))
+
+    nodeIDs = np.empty(len(nodes), dtype=np.int64)
+    values = np.empty((len(nodes), len(components)), dtype=np.float64)
+    for i, node in enumerate(nodes):
+        nodeIDs[i] = node.getID()
+        for j, (rcs, componentNumber) in enumerate(componentSets):
+            values[i, j] = rcs.getContinuousResults(componentNumber, node, units, None)
+
+    # Release the results held by LUSAS
+    componentSets = None
+    context = None
+
+    return na_to_nan(values), nodeIDs
+
+
+######################################################
+## Results component set dump files (EXPERIMENTAL)
+# IFResultsComponentSet.dumpToFile writes a whole component set to disk in a single call:
+#  - a text "header" file containing the inputs of the set (entity, components, loadcase, location etc.)
+#  - a "body" file containing the actual data (binary when requested)
+#  - an "error" file containing any errors applicable to the data
+# The functions below read these files back without further calls to LUSAS Modeller.
+# The binary body is memory-mapped, so no results are copied into memory until they are used.
+#
+# EXPERIMENTAL: the LPI reference only documents the three file names. The header grammar and the binary record layout
+# read below are assumptions that have NOT been checked against a dump written by LUSAS Modeller. Only the fake LPI
+# (shared/FakeLPI.py) writes this format, so reading its files back does not show that the reader is correct.
+# No default path of these modules uses these functions; they are only used when asked for explicitly (e.g.
+# get_element_results(method="dump")). The assumed format is:
+#  - header: "key = value" lines including "Entity", "Components" (comma separated) and "Location Type"
+#  - body: consecutive records of ID (int32), location index (int32) and one float64 per component, grouped by ID.
+#    The ID is the node ID for "Nodal" results and the element ID for all other locations, while the location index is
+#    the local node, Gauss point or internal point number within the element (0 for "Nodal" results).
+# Check the files of a real dump before relying on these functions and pass recordDtype/bodyOffset to read_results_dump
+# if they differ. The body is validated when read (size, record count and ID grouping), so that a wrong layout raises an
+# exception instead of returning memory-mapped garbage.
+
+def dump_results_component_set(rcs:'IFResultsComponentSet', headerFile:str, locationType:str) -> str:
+    """Write a results component set to disk using a binary body file (EXPERIMENTAL, see the notes above)
+
+    The body and error files are written next to the header file with the ".bin" and ".err" extensions.
+
+    Args:
+        rcs (IFResultsComponentSet): Results component set to write
+        headerFile (str): Path of the header file to write
+        locationType (str): "Nodal", "ElementNodal", "Gauss" or "Internal"
+
+    Returns:
+        str: Path of the header file
+    """
+    base = os.path.splitext(headerFile)[0]
+    rcs.dumpToFile(headerFile, f"{base}.bin", f"{base}.err", locationType, "binary")
+    return headerFile
+
+def read_results_header(headerFile:str) -> dict[str, str]:
+    """Parse the text header written by IFResultsComponentSet.dumpToFile (EXPERIMENTAL, the grammar is assumed)
+
+    Each non-empty line is read as a "key = value" or "key: value" pair.
+    Keys are returned in lower case with spaces and underscores removed (e.g. "Location Type" becomes "locationtype").
+
+    Args:
+        headerFile (str): Path of the header file
+
+    Returns:
+        dict[str, str]: Header values by key
+    """
+    header = {}
+    with open(headerFile, "r") as f:
+        for line in f:
+            match = re.match(r"\s*([^=:]+?)\s*[=:]\s*(.*?)\s*$", line)
+            if match:
+                key = re.sub(r"[\s_]", "", match.group(1)).lower()
+                header[key] = match.group(2)
+    return header
+
+class ResultsDump:
+    """Zero-copy view of the results written by IFResultsComponentSet.dumpToFile (EXPERIMENTAL, the layout is assumed)
+
+    Attributes:
+        header (dict): Parsed header values
+        entity (str): Results entity
+        components (list[str]): Results components, one per column of values
+        locationType (str): "Nodal", "ElementNodal", "Gauss" or "Internal"
+        records (np.memmap): Memory-mapped body records
+        ids (np.ndarray): Node/element ID of each record (view of records)
+        indices (np.ndarray): Location index within the element of each record (view of records)
+        values (np.ndarray): Results of shape (n_records, n_components) (view of records)
+        keys (np.ndarray): Unique node/element IDs in file order
+        offsets (np.ndarray): Start record of each key, with a final entry equal to the number of records
+        errors (list[str]): Lines of the error file (if any)
+    """
+
+    def __init__(self, header:dict, records:np.memmap, errors:list[str]):
+        self.header = header
+        self.entity = header.get("entity", "")
+        self.components = re.split(r"[,;\s]+", header.get("components", "").strip()) if header.get("components") else []
+        self.locationType = header.get("locationtype", header.get("location", ""))
+        self.records = records
+        self.ids = records["id"]
+        self.indices = records["index"]
+        self.values = records["values"]
+        self.errors = errors
+
+        # Records of the same node/element are contiguous, find where each group starts
+        if len(self.ids) > 0:
+            starts = np.flatnonzero(self.ids[1:] != self.ids[:-1]) + 1
+            self.offsets = np.concatenate(([0], starts, [len(self.ids)])).astype(np.int64)
+        else:
+            self.offsets = np.zeros(1, dtype=np.int64)
+        self.keys = np.asarray(self.ids[self.offsets[:-1]])
+        self._rows = {int(key): i for i, key in enumerate(self.keys)}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, id:int) -> bool:
+        return int(id) in self._rows
+
+    def get(self, id:int) -> np.ndarray:
+        """Results of a node/element as a view of shape (n_locations, n_components)
+
+        Args:
+            id (int): Node ID for "Nodal" results, element ID otherwise
+
+        Returns:
+            np.ndarray: Results view (N/A values are not replaced as the data is read-only, see valid_mask)
+        """
+        row = self._rows[int(id)]
+        return self.values[self.offsets[row]:self.offsets[row + 1]]
+
+    def __getitem__(self, id:int) -> np.ndarray:
+        return self.get(id)
+
+    def component(self, component:str) -> np.ndarray:
+        """All values of a single component as a view of shape (n_records,)
+
+        Args:
+            component (str): Component name
+
+        Returns:
+            np.ndarray: Results view
+        """
+        return self.values[:, self.components.index(component)]
+
+    def valid_mask(self) -> np.ndarray:
+        """Boolean array with the same shape as values, False where LUSAS returned the N/A value
+
+        Returns:
+            np.ndarray: Mask of valid values
+        """
+        return self.values != NA_VALUE
+
+def read_results_dump(headerFile:str, bodyFile:str=None, errorFile:str=None, recordDtype:np.dtype=None, bodyOffset:int=0) -> ResultsDump:
+    """Read the files written by IFResultsComponentSet.dumpToFile, memory-mapping the binary body (EXPERIMENTAL)
+
+    The record layout and header keys are assumptions that have not been checked against LUSAS Modeller, see the notes above.
+
+    Args:
+        headerFile (str): Path of the header file
+        bodyFile (str, optional): Path of the binary body file. Defaults to the file named in the header or the header path with a ".bin" extension.
+        errorFile (str, optional): Path of the error file. Defaults to the file named in the header or the header path with a ".err" extension.
+        recordDtype (np.dtype, optional): Structured dtype of a body record with "id", "index" and "values" fields. Defaults to int32, int32, float64 per component.
+        bodyOffset (int, optional): Size in bytes of any header at the start of the body file. Defaults to 0.
+
+    Returns:
+        ResultsDump: Zero-copy view of the results
+    """
+    header = read_results_header(headerFile)
+    base = os.path.splitext(headerFile)[0]
+    folder = os.path.dirname(headerFile)
+    if bodyFile is None:
+        bodyFile = header.get("bodyfile", header.get("body", f"{base}.bin"))
+        bodyFile = os.path.join(folder, bodyFile) if not os.path.isabs(bodyFile) else bodyFile
+    if errorFile is None:
+        errorFile = header.get("errorfile", header.get("error", f"{base}.err"))
+        errorFile = os.path.join(folder, errorFile) if not os.path.isabs(errorFile) else errorFile
+
+    components = header.get("components", "").strip()
+    nNamed = len(re.split(r"[,;\s]+", components)) if components else 0
+    if recordDtype is None:
+        nComponents = int(header.get("numbercomponents", header.get("ncomponents", nNamed or 1)))
+        if nNamed and nComponents != nNamed:
+            raise Exception(f"The header {headerFile} gives {nComponents} components but names {nNamed}")
+        recordDtype = results_record_dtype(nComponents)
+    recordDtype = np.dtype(recordDtype)
+
+    # The body must be a whole number of records, otherwise the record layout is not the one assumed
+    size = os.path.getsize(bodyFile) - bodyOffset
+    if size < 0 or size % recordDtype.itemsize != 0:
+        raise Exception(f"The size of {bodyFile} ({size} bytes after the offset) is not a multiple of the record size "
+                        f"({recordDtype.itemsize} bytes), the dump does not have the expected layout")
+    nRecords = size // recordDtype.itemsize
+    for key in ("numberrecords", "nrecords", "records", "numberresults"):
+        if key in header and int(header[key]) != nRecords:
+            raise Exception(f"The header {headerFile} gives {header[key]} records but the body contains {nRecords}")
+
+    # An empty file cannot be memory-mapped
+    if nRecords == 0:
+        records = np.zeros(0, dtype=recordDtype)
+    else:
+        records = np.memmap(bodyFile, dtype=recordDtype, mode="r", offset=bodyOffset, shape=(nRecords,))
+        _check_records(records, bodyFile)
+
+    errors = []
+    if os.path.exists(errorFile):
+        with open(errorFile, "r") as f:
+            errors = [line.rstrip("\n") for line in f if line.strip()]
+
+    return ResultsDump(header, records, errors)
+
+def _check_records(records:np.ndarray, bodyFile:str):
+    # Records read with the wrong layout give invalid IDs/location indices or IDs that are not grouped together
+    ids = records["id"]
+    indices = records["index"]
+    if ids.min() <= 0 or indices.min() < 0:
+        raise Exception(f"{bodyFile} contains invalid IDs or location indices, the dump does not have the expected layout")
+    starts = np.flatnonzero(ids[1:] != ids[:-1]) + 1
+    keys = ids[np.concatenate(([0], starts))]
+    if len(np.unique(keys)) != len(keys):
+        raise Exception(f"The records of {bodyFile} are not grouped by ID, the dump does not have the expected layout")
+
+def results_record_dtype(nComponents:int) -> np.dtype:
+    """Assumed structured dtype of a dumped results record (EXPERIMENTAL, not checked against LUSAS Modeller)
+
+    Args:
+        nComponents (int): Number of components in each record
+
+    Returns:
+        np.dtype: Record dtype with "id", "index" and "values" fields
+    """
+    return np.dtype([("id", "<i4"), ("index", "<i4"), ("values", "<f8", (nComponents,))])
+
+
+######################################################
+## Multi-loadset results cube
+# Results of many loadsets are written to a (loadset x node/element x component) array on disk, one loadset at a time.
+# The array is a memory-mapped .npy file so that only one loadset of results is held in memory at any time.
+# A progress file is written after each loadset, so that an interrupted extraction (e.g. an error or a restart of
+# LUSAS Modeller) resumes from the first incomplete loadset when the function is called again with the same inputs.
+
+def extract_results_cube(objSet:'IFObjectSet', entity:str, components:list[str], loadsets:list, directory:str, extractor=None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Extract results of several loadsets into a memory-mapped cube on disk, resuming any previous incomplete extraction
+
+    The following files are written in the directory:
+     - cube.npy : Results of shape (n_loadsets, n_ids, n_components), NaN for loadsets not yet extracted
+     - ids.npy : Node/element ID of each row of the results
+     - progress.json : Inputs of the extraction and the IDs of the loadsets already extracted
+
+    Args:
+        objSet (IFObjectSet): Object set passed to the extractor
+        entity (str): Results entity (e.g. "Displacement")
+        components (list[str]): Results components (e.g. ["DX", "DY", "DZ"])
+        loadsets (list): Loadset objects or IDs to extract
+        directory (str): Folder in which the cube is stored
+        extractor (function, optional): Function with the signature of get_nodal_results returning the results and IDs of one loadset. Defaults to get_nodal_results.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Memory-mapped results cube, IDs of each row and loadset IDs of each layer
+    """
+    if extractor is None:
+        extractor = get_nodal_results
+
+    os.makedirs(directory, exist_ok=True)
+    cubeFile = os.path.join(directory, "cube.npy")
+    idsFile = os.path.join(directory, "ids.npy")
+    progressFile = os.path.join(directory, "progress.json")
+
+    loadsetIDs = np.array([get_loadset_id(ls) for ls in loadsets], dtype=np.int64)
+    inputs = {"entity": entity, "components": list(components), "loadsets": loadsetIDs.tolist()}
+
+    # Resume a previous extraction with the same inputs
+    cube, ids, completed = None, None, []
+    if os.path.exists(progressFile):
+        with open(progressFile, "r") as f:
+            progress = json.load(f)
+        if {key: progress.get(key) for key in inputs} != inputs:
+            raise Exception(f"The results cube in {directory} was extracted with different inputs, please use a different directory")
+        completed = progress["completed"]
+        if len(completed) > 0:
+            cube = np.lib.format.open_memmap(cubeFile, mode="r+")
+            ids = np.load(idsFile)
+
+    for i, loadsetID in enumerate(loadsetIDs):
+        if int(loadsetID) in completed:
+            continue
+
+        values, rowIDs = extractor(objSet, entity, components, int(loadsetID))
+
+        if cube is None:
+            # First loadset defines the rows of the cube
+            ids = rowIDs
+            np.save(idsFile, ids)
+            cube = np.lib.format.open_memmap(cubeFile, mode="w+", dtype=np.float64, shape=(len(loadsetIDs), len(ids), len(components)))
+            cube[:] = np.nan
+        elif not np.array_equal(rowIDs, ids):
+            # Align the rows with the first loadset
+            order = np.argsort(rowIDs)
+            rows = order[np.minimum(np.searchsorted(rowIDs, ids, sorter=order), len(rowIDs) - 1)]
+            if not np.array_equal(rowIDs[rows], ids):
+                raise Exception(f"The results of loadset {loadsetID} are not available for the same nodes/elements as the first loadset")
+            values = values[rows]
+
+        cube[i] = values
+        cube.flush()
+        values = None
+
+        # Checkpoint (replace the progress file in a single operation so that it is never left incomplete)
+        completed.append(int(loadsetID))
+        with open(progressFile + ".tmp", "w") as f:
+            json.dump({**inputs, "completed": completed}, f)
+        os.replace(progressFile + ".tmp", progressFile)
+
+    if cube is None:
+        cube = np.lib.format.open_memmap(cubeFile, mode="r+") if os.path.exists(cubeFile) else np.full((len(loadsetIDs), 0, len(components)), np.nan)
+        ids = np.load(idsFile) if os.path.exists(idsFile) else np.empty(0, dtype=np.int64)
+
+    return cube, ids, loadsetIDs
+
+
+######################################################
+## Element results by stress type
+# Beams, shells and solids have different results entities and locations, so looping over elements and checking
+# getStressType()/getDomainDimension() of each one is slow. Instead the elements of a selection are partitioned once per
+# stress type with IFObjectSet.keep, and each partition is read with one results context and one results component set
+# per component, using the results array methods of IFResultsComponentSet (one call per element and component).
+# The results of each type are returned as a ragged array: the values of all its elements stacked in one array, with
+# the offsets of the first row of each element (beams have results at each internal point, shells and solids at each Gauss point).
+
+# Default results entity, components and location of each element stress type
+ELEMENT_RESULTS = {
+    "Thick 3D Beam": ("Force/Moment - Thick 3D Beam", ["Fx", "Fy", "Fz", "Mx", "My", "Mz"], "Internal"),
+    "3D Beam": ("Force/Moment - 3D Beam", ["Fx", "Fy", "Fz", "Mx", "My", "Mz"], "Internal"),
+    "Thick 2D Beam": ("Force/Moment - Thick 2D Beam", ["Fx", "Fy", "Mz"], "Internal"),
+    "2D Beam": ("Force/Moment - 2D Beam", ["Fx", "Fy", "Mz"], "Internal"),
+    "Thick Shell": ("Force/Moment - Thick Shell", ["Nx", "Ny", "Nxy", "Mx", "My", "Mxy"], "Gauss"),
+    "Thin Shell": ("Force/Moment - Thin Shell", ["Nx", "Ny", "Nxy", "Mx", "My", "Mxy"], "Gauss"),
+    "Solid": ("Stress", ["SX", "SY", "SZ", "SXY", "SYZ", "SZX"], "Gauss"),
+}
+
+class ElementResults:
+    """Results of all elements of one stress type as a ragged array
+
+    Attributes:
+        stressType (str): Element stress type (e.g. "Thick 3D Beam")
+        entity (str): Results entity
+        components (list[str]): Results components, one per column of values
+        location (str): "Internal", "Gauss" or "ElementNodal"
+        elementIDs (np.ndarray): ID of each element
+        offsets (np.ndarray): First row of each element in values, with a final entry equal to the number of rows
+        indices (np.ndarray): Internal point, Gauss point or element node index of each row
+        values (np.ndarray): Results of shape (n_rows, n_components), NaN where not available
+    """
+
+    def __init__(self, stressType:str, entity:str, components:list[str], location:str, elementIDs, offsets, indices, values):
+        self.stressType = stressType
+        self.entity = entity
+        self.components = components
+        self.location = location
+        self.elementIDs = np.asarray(elementIDs, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.float64)
+        self._rows = {int(id): i for i, id in enumerate(self.elementIDs)}
+
+    def __len__(self) -> int:
+        return len(self.elementIDs)
+
+    def __contains__(self, id:int) -> bool:
+        return int(id) in self._rows
+
+    def get(self, id:int) -> np.ndarray:
+        """Results of an element as a view of shape (n_locations, n_components)
+
+        Args:
+            id (int): Element ID
+
+        Returns:
+            np.ndarray: Results view
+        """
+        row = self._rows[int(id)]
+        return self.values[self.offsets[row]:self.offsets[row + 1]]
+
+    def __getitem__(self, id:int) -> np.ndarray:
+        return self.get(id)
+
+    def counts(self) -> np.ndarray:
+        """Number of result locations of each element"""
+        return np.diff(self.offsets)
+
+    def element_rows(self) -> np.ndarray:
+        """Index into elementIDs of each row of values (e.g. for np.maximum.reduceat or grouping by element)"""
+        return np.repeat(np.arange(len(self.elementIDs)), self.counts())
+
+# Results array method of IFResultsComponentSet for each element location
+_RCS_ARRAY = {"gauss": "getGaussResultsArray", "internal": "getInternalResultsArray", "elementnodal": "getElementNodalResultsArray"}
+
+def _read_partition_dump(part:'IFObjectSet', stressType:str, entity:str, components:list[str], location:str, loadset, directory:str) -> ElementResults:
+    context = create_results_context(part, loadset)
+    rcs = lusas.db().getResultsComponentSet(entity, components[0], location, context)
+    for component in components[1:]:
+        rcs.getComponentNumber(component)
+
+    name = re.sub(r"[^\w]+", "_", stressType)
+    headerFile = dump_results_component_set(rcs, os.path.join(directory, f"{name}.txt"), location)
+    rcs = None
+    context = None
+
+    dump = read_results_dump(headerFile)
+    missing = [c for c in components if c not in dump.components]
+    if missing:
+        raise Exception(f"The results dump of {stressType} elements ({headerFile}) does not contain the components {missing}, it contains {dump.components}")
+    columns = [dump.components.index(c) for c in components]
+    # Copy out of the memory-mapped body so that the dump files can be deleted
+    values = na_to_nan(np.array(dump.values[:, columns], dtype=np.float64))
+    results = ElementResults(stressType, entity, list(components), location, dump.keys, dump.offsets, np.array(dump.indices), values)
+    dump = None
+    return results
+
+def _read_partition_arrays(part:'IFObjectSet', stressType:str, entity:str, components:list[str], location:str, loadset) -> ElementResults:
+    # One results array call per element and component
+    elements : list[IFElement] = part.getObjects("Element")
+    elementIDs = np.empty(len(elements), dtype=np.int64)
+    context = create_results_context(part, loadset)
+    componentSets = []
+    for component in components:
+        rcs = lusas.db().getResultsComponentSet(entity, component, location, context)
+        componentSets.append((getattr(rcs, _RCS_ARRAY[location.lower()]), rcs.getComponentNumber(component)))
+
+    rows, counts = [], np.zeros(len(elements), dtype=np.int64)
+    for i, element in enumerate(elements):
+        elementIDs[i] = element.getID()
+        arrays = [np.asarray(getArray(componentNumber, element, None), dtype=np.float64) for getArray, componentNumber in componentSets]
+        counts[i] = len(arrays[0])
+        rows.append(np.column_stack(arrays) if counts[i] else np.empty((0, len(components))))
+    componentSets = None
+    context = None
+
+    offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    values = na_to_nan(np.concatenate(rows)) if rows else np.empty((0, len(components)))
+    indices = np.arange(offsets[-1]) - np.repeat(offsets[:-1], counts)
+    return ElementResults(stressType, entity, list(components), location, elementIDs, offsets, indices, values)
+
+def get_element_results(objSet:'IFObjectSet', loadset, types:dict=None, shellLocation:str="Gauss", directory:str=None, method:str="arrays") -> dict[str, ElementResults]:
+    """Extract element results of a selection, partitioned by element stress type
+
+    The elements of the object set are partitioned with one IFObjectSet.keep call per stress type, and each partition is
+    read with one results context. Beam results are read at internal points, shell results at Gauss points (or element nodes)
+    and solid results at Gauss points.
+    By default (method="arrays") the documented results array methods of the results component sets are used, with one
+    getID call per element and one results array call per element and component. method="dump" is EXPERIMENTAL: each
+    partition is written with a single results component set dump, relying on the file layout assumed by read_results_dump,
+    which has not been checked against LUSAS Modeller.
+
+    Args:
+        objSet (IFObjectSet): Object set containing the elements or geometric features of interest
+        loadset (IFLoadset | int): Loadset object or ID for which results are required
+        types (dict, optional): Stress types to extract, each mapped to a list of components (using the default entity and location)
+                                or to an (entity, components, location) tuple. Defaults to None (all types in ELEMENT_RESULTS).
+        shellLocation (str, optional): Location of shell results using the default location, "Gauss" or "ElementNodal". Defaults to "Gauss".
+        directory (str, optional): Folder for the dump files (method="dump" only). Defaults to None (temporary folder deleted afterwards).
+        method (str, optional): "arrays" or "dump" (experimental). Defaults to "arrays".
+
+    Returns:
+        dict[str, ElementResults]: Results of each stress type present in the object set
+    """
+    if shellLocation not in ("Gauss", "ElementNodal"):
+        raise Exception(f"Unknown shell results location '{shellLocation}', expected 'Gauss' or 'ElementNodal'")
+    if method not in ("dump", "arrays"):
+        raise Exception(f"Unknown method '{method}', expected 'dump' or 'arrays'")
+    if types is None:
+        types = {stressType: defaults[1] for stressType, defaults in ELEMENT_RESULTS.items()}
+
+    # Expand the selection to elements once, each partition is a copy filtered by stress type
+    elements = lusas.newObjectSet().add(objSet).addLOF("Element")
+
+    partitions = []
+    for stressType, definition in types.items():
+        if isinstance(definition, tuple):
+            entity, components, location = definition
+        else:
+            if stressType not in ELEMENT_RESULTS:
+                raise Exception(f"No default results entity for stress type '{stressType}', provide an (entity, components, location) tuple")
+            entity, _, location = ELEMENT_RESULTS[stressType]
+            components = definition
+            if location == "Gauss" and "Shell" in stressType:
+                location = shellLocation
+        part = lusas.newObjectSet().add(elements).keep(stressType)
+        if part.count("Element") > 0:
+            partitions.append((part, stressType, entity, list(components), location))
+
+    results = {}
+    if method == "arrays":
+        for part, *definition in partitions:
+            results[definition[0]] = _read_partition_arrays(part, *definition, loadset)
+    elif directory is None:
+        import tempfile
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as folder:
+            for part, *definition in partitions:
+                results[definition[0]] = _read_partition_dump(part, *definition, loadset, folder)
+    else:
+        os.makedirs(directory, exist_ok=True)
+        for part, *definition in partitions:
+            results[definition[0]] = _read_partition_dump(part, *definition, loadset, directory)
+    return results